@@ -1,127 +1,132 @@
 import streamlit as st
 import pandas as pd
-from io import StringIO
-import random
-from datetime import datetime, timedelta
+import os
+from datetime import date
+from descargas import leer_al_descargar, seccion_descarga
+from editor import CambiosTabla, editor_paginado
+from exportacion import ESCRITORES, firma_tabla, limpiar_generados, nombre_seguro, nueva_ruta_generada
+from generadores import TIPOS_DATO, generar_archivo, generar_datos, nueva_semilla
+from importacion import FORMATOS_IMPORTACION, MOTORES, columnas_archivo, formato_archivo, leer_archivo
 
 st.set_page_config(page_title="Editor de CSV", page_icon="📊", layout="wide")
 
-# ==============================
-# FUNCIONES DE GENERACIÓN
-# ==============================
-def generar_nombres(n):
-    nombres = ["Juan", "María", "Carlos", "Ana", "Pedro", "Laura", "Diego", "Sofía", 
-               "Miguel", "Lucía", "Fernando", "Valentina", "Roberto", "Camila", "Jorge",
-               "Isabella", "Luis", "Martina", "Antonio", "Victoria"]
-    apellidos = ["García", "Rodríguez", "Martínez", "López", "González", "Pérez", 
-                 "Sánchez", "Ramírez", "Torres", "Flores", "Rivera", "Gómez", "Díaz",
-                 "Cruz", "Morales", "Reyes", "Jiménez", "Hernández", "Ruiz", "Vargas"]
-    return [f"{random.choice(nombres)} {random.choice(apellidos)}" for _ in range(n)]
-
-def generar_emails(n):
-    dominios = ["gmail.com", "hotmail.com", "yahoo.com", "outlook.com", "empresa.com"]
-    nombres = ["user", "contact", "info", "admin", "support", "juan", "maria", "carlos"]
-    return [f"{random.choice(nombres)}{random.randint(1, 999)}@{random.choice(dominios)}" for _ in range(n)]
-
-def generar_telefonos(n):
-    return [f"+54 9 11 {random.randint(1000, 9999)}-{random.randint(1000, 9999)}" for _ in range(n)]
-
-def generar_fechas(n, inicio="2020-01-01", fin="2024-12-31"):
-    start = datetime.strptime(inicio, "%Y-%m-%d")
-    end = datetime.strptime(fin, "%Y-%m-%d")
-    delta = end - start
-    return [(start + timedelta(days=random.randint(0, delta.days))).strftime("%Y-%m-%d") for _ in range(n)]
-
-def generar_numeros(n, minimo=1, maximo=100, decimales=False):
-    if decimales:
-        return [round(random.uniform(minimo, maximo), 2) for _ in range(n)]
-    return [random.randint(minimo, maximo) for _ in range(n)]
-
-def generar_ciudades(n):
-    ciudades = ["Buenos Aires", "Córdoba", "Rosario", "Mendoza", "La Plata", "San Miguel de Tucumán",
-                "Mar del Plata", "Salta", "Santa Fe", "San Juan", "Resistencia", "Neuquén",
-                "Posadas", "Bahía Blanca", "Paraná", "San Salvador de Jujuy"]
-    return [random.choice(ciudades) for _ in range(n)]
-
-def generar_productos(n):
-    productos = ["Laptop", "Mouse", "Teclado", "Monitor", "Auriculares", "Webcam", "Micrófono",
-                 "Tablet", "Smartphone", "Impresora", "Scanner", "Router", "Disco Duro", "USB",
-                 "Cable HDMI", "Adaptador", "Cargador", "Batería", "Mousepad", "Soporte"]
-    return [random.choice(productos) for _ in range(n)]
-
-def generar_booleanos(n):
-    return [random.choice([True, False]) for _ in range(n)]
-
-def generar_lorem(n):
-    palabras = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit",
-                "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore", "et", "dolore",
-                "magna", "aliqua"]
-    return [" ".join(random.choices(palabras, k=random.randint(3, 8))).capitalize() + "." for _ in range(n)]
+# Límite de filas para generar en memoria (vista previa y edición) y directo a archivo;
+# para más filas está la CLI (cli.py), que no tiene límite
+MAX_FILAS_MEMORIA = 1_000_000
+MAX_FILAS_ARCHIVO = 10_000_000
+
+
+def controles_opciones(tipo, clave, columnas_previas):
+    """Dibuja los controles de las opciones que declara el tipo de dato y devuelve sus valores"""
+    valores = {}
+    if not tipo.opciones:
+        return valores
+    for opcion, columna in zip(tipo.opciones, st.columns(len(tipo.opciones))):
+        # La clave incluye el tipo: al cambiar de tipo cada opción arranca con su valor predeterminado
+        clave_opcion = f"{clave}_{tipo.nombre}_{opcion.nombre}"
+        with columna:
+            if opcion.control == 'entero':
+                valores[opcion.nombre] = int(st.number_input(opcion.etiqueta, value=opcion.valor, step=1, key=clave_opcion))
+            elif opcion.control == 'decimal':
+                valores[opcion.nombre] = st.number_input(opcion.etiqueta, value=opcion.valor, key=clave_opcion)
+            elif opcion.control == 'fecha':
+                valores[opcion.nombre] = st.date_input(opcion.etiqueta, value=date.fromisoformat(opcion.valor),
+                                                       key=clave_opcion).isoformat()
+            elif opcion.control == 'columna':
+                valores[opcion.nombre] = st.selectbox(opcion.etiqueta, columnas_previas, key=clave_opcion,
+                                                      help="Solo se puede referenciar una columna anterior")
+            else:
+                valores[opcion.nombre] = st.text_input(opcion.etiqueta, value=opcion.valor, key=clave_opcion)
+    return valores
 
 
 # ==============================
 # INTERFAZ PRINCIPAL
 # ==============================
 st.title("📊 Editor de Archivos CSV")
-st.markdown("Sube tu archivo CSV, créalo desde cero o genera datos aleatorios, edítalos y descárgalos en CSV o JSON.")
+st.markdown("Sube tu archivo CSV, JSON, Parquet, Feather o Excel, créalo desde cero o genera datos aleatorios, "
+            "edítalos y descárgalos en CSV, JSON, Parquet, Feather o Excel.")
 
-tab1, tab2, tab3 = st.tabs(["📂 Importar CSV", "➕ Crear Nueva Tabla", "🎲 Generar Datos Aleatorios"])
+tab1, tab2, tab3 = st.tabs(["📂 Importar Archivo", "➕ Crear Nueva Tabla", "🎲 Generar Datos Aleatorios"])
 
 
 # -------------------------------
-# TAB 1 - IMPORTAR CSV
+# TAB 1 - IMPORTAR ARCHIVO
 # -------------------------------
 with tab1:
-    uploaded_file = st.file_uploader("Selecciona un archivo CSV", type=['csv'])
+    uploaded_file = st.file_uploader("Selecciona un archivo CSV, JSON, Parquet, Feather o Excel",
+                                     type=[extension.lstrip('.') for extension in FORMATOS_IMPORTACION])
+
+    with st.expander("⚙️ Opciones de importación", expanded=False):
+        col_optimizar, col_motor = st.columns(2)
+        with col_optimizar:
+            optimizar_tipos = st.checkbox(
+                "Optimizar tipos", value=True,
+                help="Enteros y decimales más chicos, fechas y categorías para textos repetidos: usa mucha menos memoria"
+            )
+        with col_motor:
+            motor_csv = st.selectbox("Motor de lectura (CSV)", MOTORES, index=len(MOTORES) - 1,
+                                     help="pyarrow lee en varios hilos y suele ser más rápido")
 
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
-            
+            formato_importado = formato_archivo(uploaded_file.name)
+            # Solo se leen las columnas elegidas; el encabezado se lee una vez por archivo
+            if st.session_state.get('import_columnas_archivo', (None,))[0] != uploaded_file.file_id:
+                st.session_state['import_columnas_archivo'] = (
+                    uploaded_file.file_id, columnas_archivo(uploaded_file, formato_importado)
+                )
+            todas_las_columnas = st.session_state['import_columnas_archivo'][1]
+            columnas_elegidas = st.multiselect(
+                "Columnas a importar", todas_las_columnas, default=todas_las_columnas,
+                key=f"import_columnas_{uploaded_file.file_id}",
+                help="Las columnas que no se eligen no se leen: en Parquet y Feather ni siquiera se cargan del archivo"
+            )
+            if not columnas_elegidas:
+                raise ValueError("elige al menos una columna para importar")
+
+            # El archivo se lee una sola vez por archivo y opciones, no en cada rerun
+            clave_importacion = (uploaded_file.file_id, tuple(columnas_elegidas), optimizar_tipos, motor_csv)
+            if st.session_state.get('import_clave') != clave_importacion:
+                progreso = st.progress(0.0, text="Leyendo archivo...")
+                columnas = None if columnas_elegidas == todas_las_columnas else columnas_elegidas
+                df, memoria = leer_archivo(
+                    uploaded_file, formato_importado, columnas, optimizar_tipos, motor_csv,
+                    al_avanzar=lambda fraccion: progreso.progress(fraccion, text=f"Leyendo archivo... {fraccion:.0%}")
+                )
+                progreso.empty()
+                st.session_state['import_clave'] = clave_importacion
+                st.session_state['import_df'] = df
+                st.session_state['import_cambios'] = CambiosTabla(df)
+                st.session_state['import_firma'] = firma_tabla(df)
+                st.session_state['import_memoria'] = memoria
+            df = st.session_state['import_df']
+            memoria = st.session_state['import_memoria']
+
             st.success(f"✅ Archivo cargado: {uploaded_file.name}")
-            st.info(f"Filas: {len(df)} | Columnas: {len(df.columns)}")
+            st.info(f"Filas: {len(df)} | Columnas: {len(df.columns)} | "
+                    f"Memoria: {memoria['sin_optimizar'] / 1024 ** 2:,.1f} MB sin optimizar (estimada) → "
+                    f"{memoria['final'] / 1024 ** 2:,.1f} MB")
 
             st.subheader("Edita los datos:")
-            edited_df = st.data_editor(df, use_container_width=True, num_rows="dynamic", key="data_editor_import")
+            cambios = st.session_state['import_cambios']
+            editor_paginado(df, cambios, "data_editor_import")
 
             st.subheader("Descargar archivo modificado:")
-
-            # DESCARGA CSV Y JSON
-            col_csv, col_json = st.columns(2)
-
-            with col_csv:
-                csv_buffer = StringIO()
-                edited_df.to_csv(csv_buffer, index=False)
-                st.download_button(
-                    label="⬇️ Descargar CSV modificado",
-                    data=csv_buffer.getvalue(),
-                    file_name=f"editado_{uploaded_file.name}",
-                    mime="text/csv",
-                    type="primary",
-                    key="download_csv_tab1"
-                )
-
-            with col_json:
-                json_data = edited_df.to_json(orient="records", indent=4, force_ascii=False)
-                st.download_button(
-                    label="⬇️ Descargar JSON modificado",
-                    data=json_data,
-                    file_name=f"editado_{uploaded_file.name.replace('.csv', '.json')}",
-                    mime="application/json",
-                    type="secondary",
-                    key="download_json_tab1"
-                )
+            # La tabla editada se arma y se serializa solo al pedir la descarga
+            seccion_descarga(df, cambios, st.session_state['import_firma'],
+                             f"editado_{os.path.splitext(uploaded_file.name)[0]}", "download_tab1")
 
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Filas totales", len(edited_df))
+                st.metric("Filas totales", cambios.total_filas(df))
             with col2:
-                st.metric("Columnas totales", len(edited_df.columns))
+                st.metric("Columnas totales", len(df.columns))
 
         except Exception as e:
             st.error(f"❌ Error al procesar el archivo: {str(e)}")
     else:
-        st.info("👆 Sube un archivo CSV para comenzar")
+        st.info("👆 Sube un archivo CSV, JSON, Parquet, Feather o Excel para comenzar")
 
 
 # -------------------------------
@@ -146,53 +151,30 @@ with tab2:
     if st.button("🆕 Crear Tabla", type="primary"):
         new_df = pd.DataFrame({col: [""] * num_rows for col in col_names})
         st.session_state['created_df'] = new_df
+        st.session_state['created_cambios'] = CambiosTabla(new_df)
+        st.session_state['created_firma'] = firma_tabla(new_df)
         st.success("✅ Tabla creada exitosamente!")
         st.rerun()
 
     if 'created_df' in st.session_state:
         st.subheader("Edita tu tabla:")
-        edited_new_df = st.data_editor(
-            st.session_state['created_df'],
-            use_container_width=True,
-            num_rows="dynamic",
-            key="data_editor_new"
-        )
-        st.session_state['created_df'] = edited_new_df
+        cambios_new = st.session_state['created_cambios']
+        editor_paginado(st.session_state['created_df'], cambios_new, "data_editor_new")
 
         st.subheader("Descargar tabla creada:")
-        col_csv, col_json = st.columns(2)
-
-        with col_csv:
-            csv_buffer_new = StringIO()
-            edited_new_df.to_csv(csv_buffer_new, index=False)
-            st.download_button(
-                label="⬇️ Descargar CSV",
-                data=csv_buffer_new.getvalue(),
-                file_name="tabla_nueva.csv",
-                mime="text/csv",
-                type="primary",
-                key="download_csv_tab2"
-            )
-
-        with col_json:
-            json_data_new = edited_new_df.to_json(orient="records", indent=4, force_ascii=False)
-            st.download_button(
-                label="⬇️ Descargar JSON",
-                data=json_data_new,
-                file_name="tabla_nueva.json",
-                mime="application/json",
-                type="secondary",
-                key="download_json_tab2"
-            )
+        seccion_descarga(st.session_state['created_df'], cambios_new, st.session_state['created_firma'],
+                         "tabla_nueva", "download_tab2")
 
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Filas totales", len(edited_new_df))
+            st.metric("Filas totales", cambios_new.total_filas(st.session_state['created_df']))
         with col2:
-            st.metric("Columnas totales", len(edited_new_df.columns))
+            st.metric("Columnas totales", len(st.session_state['created_df'].columns))
 
         if st.button("🗑️ Borrar y empezar de nuevo"):
             del st.session_state['created_df']
+            del st.session_state['created_cambios']
+            del st.session_state['created_firma']
             st.rerun()
 
 
@@ -201,12 +183,27 @@ with tab2:
 # -------------------------------
 with tab3:
     st.subheader("🎲 Generador de Datos Aleatorios")
+    modo_generacion = st.radio(
+        "Destino de los datos",
+        ["🧮 En memoria (vista previa y edición)", "💾 Directo a archivo (por bloques)"],
+        horizontal=True,
+        help="Directo a archivo genera y escribe por bloques, sin cargar todo en memoria: sirve para millones de filas"
+    )
+    a_archivo = modo_generacion.startswith("💾")
+
     col1, col2 = st.columns(2)
     with col1:
-        num_filas = st.number_input("Número de filas a generar", min_value=1, max_value=10000, value=100)
+        num_filas = st.number_input("Número de filas a generar", min_value=1,
+                                    max_value=MAX_FILAS_ARCHIVO if a_archivo else MAX_FILAS_MEMORIA, value=100)
     with col2:
         num_columnas_random = st.number_input("Número de columnas", min_value=1, max_value=10, value=3)
 
+    col_semilla, col_valor_semilla = st.columns(2)
+    with col_semilla:
+        usar_semilla = st.checkbox("🔁 Usar semilla fija", help="Con la misma semilla y configuración se generan exactamente los mismos datos")
+    with col_valor_semilla:
+        semilla_fija = st.number_input("Semilla", min_value=0, value=42, step=1, disabled=not usar_semilla)
+
     st.markdown("---")
     st.write("**Configura cada columna:**")
 
@@ -218,91 +215,87 @@ with tab3:
             with col_a:
                 nombre_col = st.text_input(f"Nombre", value=f"Columna_{i+1}", key=f"random_col_name_{i}")
             with col_b:
-                tipo_dato = st.selectbox(
-                    f"Tipo de dato",
-                    ["Nombres", "Emails", "Teléfonos", "Fechas", "Números Enteros", 
-                     "Números Decimales", "Ciudades", "Productos", "Booleanos", "Texto Lorem"],
-                    key=f"random_col_type_{i}"
-                )
+                # Los tipos salen del registro de generadores.py
+                tipo_dato = st.selectbox(f"Tipo de dato", list(TIPOS_DATO), key=f"random_col_type_{i}")
 
-            opciones = {}
-            if tipo_dato in ["Números Enteros", "Números Decimales"]:
-                col_min, col_max = st.columns(2)
-                with col_min:
-                    opciones['min'] = st.number_input("Mínimo", value=1, key=f"random_min_{i}")
-                with col_max:
-                    opciones['max'] = st.number_input("Máximo", value=100, key=f"random_max_{i}")
-            elif tipo_dato == "Fechas":
-                col_inicio, col_fin = st.columns(2)
-                with col_inicio:
-                    opciones['inicio'] = st.date_input("Fecha inicio", value=datetime(2020,1,1), key=f"random_inicio_{i}").strftime("%Y-%m-%d")
-                with col_fin:
-                    opciones['fin'] = st.date_input("Fecha fin", value=datetime(2024,12,31), key=f"random_fin_{i}").strftime("%Y-%m-%d")
+            tipo = TIPOS_DATO[tipo_dato]
+            if tipo.ayuda:
+                st.caption(tipo.ayuda)
+            opciones = controles_opciones(tipo, f"random_{i}", [config['nombre'] for config in columnas_config])
 
             columnas_config.append({'nombre': nombre_col, 'tipo': tipo_dato, 'opciones': opciones})
 
     st.markdown("---")
 
-    if st.button("🎲 Generar Datos", type="primary", use_container_width=True):
-        data_random = {}
-        for config in columnas_config:
-            nombre = config['nombre']
-            tipo = config['tipo']
-            opciones = config['opciones']
-            if tipo == "Nombres": data_random[nombre] = generar_nombres(num_filas)
-            elif tipo == "Emails": data_random[nombre] = generar_emails(num_filas)
-            elif tipo == "Teléfonos": data_random[nombre] = generar_telefonos(num_filas)
-            elif tipo == "Fechas": data_random[nombre] = generar_fechas(num_filas, opciones.get('inicio'), opciones.get('fin'))
-            elif tipo == "Números Enteros": data_random[nombre] = generar_numeros(num_filas, opciones.get('min'), opciones.get('max'))
-            elif tipo == "Números Decimales": data_random[nombre] = generar_numeros(num_filas, opciones.get('min'), opciones.get('max'), True)
-            elif tipo == "Ciudades": data_random[nombre] = generar_ciudades(num_filas)
-            elif tipo == "Productos": data_random[nombre] = generar_productos(num_filas)
-            elif tipo == "Booleanos": data_random[nombre] = generar_booleanos(num_filas)
-            elif tipo == "Texto Lorem": data_random[nombre] = generar_lorem(num_filas)
-
-        st.session_state['random_df'] = pd.DataFrame(data_random)
-        st.success(f"✅ Generados {num_filas} registros con {len(columnas_config)} columnas!")
-        st.rerun()
+    if a_archivo:
+        col_formato, col_ruta = st.columns([1, 3])
+        with col_formato:
+            formato_salida = st.selectbox("Formato", list(ESCRITORES), key="formato_streaming")
+            compresion_salida = None
+            if ESCRITORES[formato_salida].compresiones:
+                compresion_salida = st.selectbox("Compresión", ESCRITORES[formato_salida].compresiones,
+                                                 key=f"compresion_streaming_{formato_salida}")
+            procesos = st.number_input("Hilos", min_value=1, max_value=os.cpu_count() or 1, value=1,
+                                       help="Bloques generados en paralelo; el archivo es el mismo con cualquier cantidad")
+        with col_ruta:
+            nombre_archivo = st.text_input("Nombre del archivo", value="datos_aleatorios",
+                                           help="Nombre con el que se descarga; el archivo se genera en una carpeta temporal")
+
+        if st.button("💾 Generar Archivo", type="primary", use_container_width=True):
+            semilla = int(semilla_fija) if usar_semilla else nueva_semilla()
+            progreso = st.progress(0.0, text="Generando...")
+            ruta_archivo = nueva_ruta_generada(formato_salida)
+            try:
+                filas = generar_archivo(
+                    columnas_config, num_filas, ruta_archivo, formato_salida, semilla, procesos=procesos,
+                    al_avanzar=lambda filas: progreso.progress(filas / num_filas, text=f"{filas:,} de {num_filas:,} filas"),
+                    compresion=compresion_salida
+                )
+                limpiar_generados()
+                st.session_state['archivo_generado'] = (ruta_archivo, formato_salida, filas, semilla)
+            except Exception as e:
+                st.error(f"❌ Error al generar el archivo: {str(e)}")
+
+        if 'archivo_generado' in st.session_state:
+            ruta_archivo, formato_generado, filas, semilla = st.session_state['archivo_generado']
+            if os.path.exists(ruta_archivo):
+                tamaño_mb = os.path.getsize(ruta_archivo) / 1024 ** 2
+                st.success(f"✅ Generados {filas:,} registros ({tamaño_mb:,.1f} MB) · semilla {semilla}")
+                st.download_button(
+                    label=f"⬇️ Descargar {formato_generado}",
+                    data=leer_al_descargar(ruta_archivo),
+                    file_name=nombre_seguro(nombre_archivo) + ESCRITORES[formato_generado].extension,
+                    mime=ESCRITORES[formato_generado].mime,
+                    type="primary",
+                    use_container_width=True,
+                    key="descargar_generado"
+                )
+            else:
+                st.warning("⚠️ El archivo generado ya no está disponible: vuelve a generarlo.")
+
+    elif st.button("🎲 Generar Datos", type="primary", use_container_width=True):
+        # Cada columna se genera completa de una vez con NumPy (ver generadores.py)
+        semilla = int(semilla_fija) if usar_semilla else nueva_semilla()
+        try:
+            st.session_state['random_df'] = generar_datos(columnas_config, num_filas, semilla)
+            st.session_state['random_cambios'] = CambiosTabla(st.session_state['random_df'])
+            st.session_state['random_firma'] = firma_tabla(st.session_state['random_df'])
+            st.success(f"✅ Generados {num_filas} registros con {len(columnas_config)} columnas! (semilla {semilla})")
+            st.rerun()
+        except ValueError as e:
+            st.error(f"❌ Error al generar los datos: {str(e)}")
 
     if 'random_df' in st.session_state:
         st.markdown("---")
         st.subheader("Vista previa y descarga:")
 
-        edited_random_df = st.data_editor(
-            st.session_state['random_df'],
-            use_container_width=True,
-            num_rows="dynamic",
-            key="data_editor_random"
-        )
-        st.session_state['random_df'] = edited_random_df
-
-        col_csv, col_json = st.columns(2)
-
-        with col_csv:
-            csv_random = StringIO()
-            edited_random_df.to_csv(csv_random, index=False)
-            st.download_button(
-                label="⬇️ Descargar CSV generado",
-                data=csv_random.getvalue(),
-                file_name="datos_aleatorios.csv",
-                mime="text/csv",
-                type="primary",
-                use_container_width=True,
-                key="download_csv_tab3"
-            )
-
-        with col_json:
-            json_random = edited_random_df.to_json(orient="records", indent=4, force_ascii=False)
-            st.download_button(
-                label="⬇️ Descargar JSON generado",
-                data=json_random,
-                file_name="datos_aleatorios.json",
-                mime="application/json",
-                type="secondary",
-                use_container_width=True,
-                key="download_json_tab3"
-            )
+        cambios_random = st.session_state['random_cambios']
+        editor_paginado(st.session_state['random_df'], cambios_random, "data_editor_random")
+        seccion_descarga(st.session_state['random_df'], cambios_random, st.session_state['random_firma'],
+                         "datos_aleatorios", "download_tab3")
 
         if st.button("🗑️ Limpiar datos", use_container_width=True):
             del st.session_state['random_df']
+            del st.session_state['random_cambios']
+            del st.session_state['random_firma']
             st.rerun()
@@ -0,0 +1,284 @@
+"""Mide la velocidad de generación, importación y exportación de TP1 y guarda los resultados.
+
+Cada caso (un tipo de dato, un formato de importación o de exportación, con una cantidad
+de filas) se mide en un intérprete nuevo: filas por segundo (mejor de varias repeticiones),
+pico de memoria (RSS) y bytes producidos (el archivo escrito, los arrays generados o la
+memoria de la tabla importada). Los resultados se guardan en JSON para comparar corridas,
+por ejemplo antes y después de actualizar pandas.
+
+Uso: python benchmark.py [--filas 1000,100000,1000000,10000000] [--grupos generacion,importacion,exportacion]
+                         [--salida resultados.json] [--comparar anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+FILAS = [1_000, 100_000, 1_000_000, 10_000_000]
+GRUPOS = ['generacion', 'importacion', 'exportacion']
+REPETICIONES = 3
+# Si una repetición tarda más que esto no se repite: ya es una medición estable
+SEGUNDOS_SIN_REPETIR = 10.0
+# Formatos que no tiene sentido medir con muchas filas (Excel es lento y tiene límite de filas)
+MAX_FILAS_FORMATO = {'Excel': 100_000}
+
+# Tabla con la que se miden la importación y la exportación
+COLUMNAS_TABLA = [
+    {'nombre': 'id', 'tipo': 'ID Único', 'opciones': {}},
+    {'nombre': 'cliente', 'tipo': 'Nombres', 'opciones': {}},
+    {'nombre': 'ciudad', 'tipo': 'Ciudades', 'opciones': {}},
+    {'nombre': 'cantidad', 'tipo': 'Números Enteros', 'opciones': {}},
+    {'nombre': 'monto', 'tipo': 'Log-normal', 'opciones': {'media': 3, 'sigma': 0.8}},
+    {'nombre': 'fecha', 'tipo': 'Fechas', 'opciones': {}},
+    {'nombre': 'activo', 'tipo': 'Booleanos', 'opciones': {}},
+]
+SEMILLA = 42
+
+
+# ==============================
+# MEMORIA
+# ==============================
+# En Linux el pico de RSS (VmHWM) se puede reiniciar, así se mide solo la operación y no la
+# preparación de los datos de entrada; en otros sistemas se usa el pico de todo el proceso.
+
+def reiniciar_pico_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def rss_mb(campo='VmHWM'):
+    """Pico de RSS (VmHWM) o RSS actual (VmRSS) del proceso, en MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith(campo + ':'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+# ==============================
+# CASOS (se ejecutan en el proceso hijo)
+# ==============================
+
+def _tabla(filas):
+    from generadores import generar_datos
+    return generar_datos(COLUMNAS_TABLA, filas, SEMILLA)
+
+
+def _ruta_entrada(directorio, formato, filas):
+    from exportacion import ESCRITORES
+    return os.path.join(directorio, f"entrada_{filas}{ESCRITORES[formato].extension}")
+
+
+def preparar_entrada(directorio, formato, filas):
+    """Archivo de entrada para medir la importación (se escribe una vez por formato y tamaño)"""
+    from exportacion import exportar_dataframe
+    ruta = _ruta_entrada(directorio, formato, filas)
+    if not os.path.exists(ruta):
+        exportar_dataframe(_tabla(filas), ruta, formato)
+    return ruta
+
+
+def caso_generacion(tipo, filas, directorio):
+    """Genera `filas` valores del tipo, por bloques como al generar un archivo; devuelve los bytes"""
+    import numpy as np
+    from generadores import TAMAÑO_BLOQUE, TIPOS_DATO, dominio_columna, generar_columna
+
+    referencias = [o.nombre for o in TIPOS_DATO[tipo].opciones if o.control == 'columna']
+    # Las referencias apuntan a una columna de IDs de todo el dataset
+    base = [{'nombre': 'base', 'tipo': 'ID Único', 'opciones': {}}]
+    dominios = {'base': dominio_columna(base, 0, filas, SEMILLA)} if referencias else None
+    opciones = {nombre: 'base' for nombre in referencias}
+
+    def medir():
+        total = 0
+        rng = np.random.default_rng(SEMILLA)
+        for inicio in range(0, filas, TAMAÑO_BLOQUE):
+            n = min(TAMAÑO_BLOQUE, filas - inicio)
+            total += generar_columna(tipo, n, opciones, rng, dominios, inicio).nbytes
+        return total
+    return medir
+
+
+def caso_exportacion(formato, filas, directorio):
+    from exportacion import exportar_dataframe
+    df = _tabla(filas)
+    ruta = os.path.join(directorio, f"salida_{os.getpid()}")
+
+    def medir():
+        exportar_dataframe(df, ruta, formato)
+        tamaño = os.path.getsize(ruta)
+        os.remove(ruta)
+        return tamaño
+    return medir
+
+
+def caso_importacion(caso, filas, directorio):
+    """`caso` es un formato de importación, "CSV (pyarrow)" o "CSV (pd.read_csv)" sin optimizar"""
+    import pandas as pd
+    from importacion import leer_archivo
+
+    formato = caso.split(' (')[0]
+    ruta = _ruta_entrada(directorio, formato, filas)
+
+    def medir():
+        if caso == 'CSV (pd.read_csv)':
+            df = pd.read_csv(ruta)
+        else:
+            with open(ruta, 'rb') as archivo:
+                motor = 'pyarrow' if caso == 'CSV (pyarrow)' else 'pandas'
+                df, _ = leer_archivo(archivo, formato, motor=motor)
+        return int(df.memory_usage(deep=True, index=False).sum())
+    return medir
+
+
+CASOS = {'generacion': caso_generacion, 'exportacion': caso_exportacion, 'importacion': caso_importacion}
+
+
+def ejecutar_caso(grupo, caso, filas, directorio, repeticiones):
+    """Mide un caso en este proceso y devuelve el resultado (se llama en el proceso hijo)"""
+    sys.path.insert(0, DIRECTORIO)
+    medir = CASOS[grupo](caso, filas, directorio)
+    rss_base = rss_mb('VmRSS')
+    reiniciar_pico_rss()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        bytes_salida = medir()
+        tiempos.append(time.perf_counter() - inicio)
+        if tiempos[-1] > SEGUNDOS_SIN_REPETIR:
+            break
+    segundos = min(tiempos)
+    return {
+        'grupo': grupo, 'caso': caso, 'filas': filas,
+        'segundos': round(segundos, 6),
+        'filas_por_s': round(filas / segundos, 1) if segundos else None,
+        'bytes': bytes_salida,
+        'rss_base_mb': round(rss_base, 1),
+        'rss_pico_mb': round(max(rss_mb(), rss_base), 1),
+    }
+
+
+# ==============================
+# ORQUESTACIÓN (proceso principal)
+# ==============================
+
+def casos_de(grupo):
+    sys.path.insert(0, DIRECTORIO)
+    if grupo == 'generacion':
+        from generadores import TIPOS_DATO
+        return list(TIPOS_DATO)
+    if grupo == 'exportacion':
+        from exportacion import ESCRITORES
+        return list(ESCRITORES)
+    from importacion import FORMATOS_IMPORTACION, MOTORES
+    formatos = list(dict.fromkeys(FORMATOS_IMPORTACION.values()))
+    casos = ['CSV (pd.read_csv)'] + (['CSV (pyarrow)'] if 'pyarrow' in MOTORES else [])
+    return casos + formatos
+
+
+def _en_proceso_nuevo(argumentos):
+    salida = subprocess.run([sys.executable, os.path.abspath(__file__)] + argumentos, cwd=DIRECTORIO,
+                            capture_output=True, text=True)
+    if salida.returncode != 0:
+        raise RuntimeError(salida.stderr.strip().splitlines()[-1] if salida.stderr.strip() else "error desconocido")
+    return salida.stdout.strip().splitlines()[-1] if salida.stdout.strip() else ''
+
+
+def medir_todo(grupos, tamaños, repeticiones, directorio):
+    resultados = []
+    for grupo in grupos:
+        for caso in casos_de(grupo):
+            formato = caso.split(' (')[0] if grupo == 'importacion' else caso
+            for filas in tamaños:
+                if filas > MAX_FILAS_FORMATO.get(formato, filas):
+                    continue
+                try:
+                    if grupo == 'importacion':
+                        _en_proceso_nuevo(['--preparar', formato, str(filas), directorio])
+                    resultado = json.loads(_en_proceso_nuevo(
+                        ['--caso', grupo, caso, str(filas), directorio, str(repeticiones)]
+                    ))
+                except RuntimeError as e:
+                    resultado = {'grupo': grupo, 'caso': caso, 'filas': filas, 'error': str(e)}
+                resultados.append(resultado)
+                print(formatear(resultado), flush=True)
+    return resultados
+
+
+def formatear(resultado, anterior=None):
+    texto = f"{resultado['grupo']:<12} {resultado['caso']:<22} {resultado['filas']:>12,}  "
+    if 'error' in resultado:
+        return texto + f"❌ {resultado['error']}"
+    texto += (f"{resultado['filas_por_s']:>14,.0f} filas/s  {resultado['bytes'] / 1024 ** 2:>10,.1f} MB"
+              f"  RSS pico {resultado['rss_pico_mb']:>8,.0f} MB")
+    if anterior and anterior.get('filas_por_s'):
+        texto += f"  ({resultado['filas_por_s'] / anterior['filas_por_s'] - 1:+.0%} vs anterior)"
+    return texto
+
+
+def entorno():
+    import numpy
+    import pandas
+    datos = {'python': platform.python_version(), 'pandas': pandas.__version__, 'numpy': numpy.__version__,
+             'plataforma': platform.platform(), 'cpus': os.cpu_count()}
+    try:
+        import pyarrow
+        datos['pyarrow'] = pyarrow.__version__
+    except ImportError:
+        pass
+    return datos
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--caso':
+        grupo, caso, filas, directorio, repeticiones = sys.argv[2:7]
+        print(json.dumps(ejecutar_caso(grupo, caso, int(filas), directorio, int(repeticiones))))
+        return 0
+    if len(sys.argv) > 1 and sys.argv[1] == '--preparar':
+        sys.path.insert(0, DIRECTORIO)
+        preparar_entrada(sys.argv[4], sys.argv[2], int(sys.argv[3]))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Benchmark de generación, importación y exportación de TP1")
+    parser.add_argument('--filas', default=','.join(map(str, FILAS)), help="tamaños a medir, separados por comas")
+    parser.add_argument('--grupos', default=','.join(GRUPOS), help="grupos a medir, separados por comas")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--salida', default=f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    parser.add_argument('--comparar', help="resultados de una corrida anterior, para mostrar la diferencia")
+    args = parser.parse_args()
+
+    tamaños = [int(filas) for filas in args.filas.split(',')]
+    grupos = args.grupos.split(',')
+    with tempfile.TemporaryDirectory(prefix='tp1_benchmark_') as directorio:
+        resultados = medir_todo(grupos, tamaños, args.repeticiones, directorio)
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump({'fecha': datetime.now().isoformat(timespec='seconds'), 'entorno': entorno(),
+                   'resultados': resultados}, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anteriores = {(r['grupo'], r['caso'], r['filas']): r for r in json.load(f)['resultados']}
+        print(f"\nComparación con {args.comparar}:")
+        for resultado in resultados:
+            print(formatear(resultado, anteriores.get((resultado['grupo'], resultado['caso'], resultado['filas']))))
+    return 1 if any('error' in r for r in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
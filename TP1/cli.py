@@ -0,0 +1,145 @@
+"""Generación y conversión de datos sin la interfaz de Streamlit.
+
+Uso como programa:
+    python cli.py generar columnas.json -n 1000000 -o datos.parquet [--semilla 42] [--procesos 4]
+    python cli.py convertir datos.csv datos.parquet [--columnas a,b] [--compresion zstd]
+    python cli.py tipos
+
+Uso desde Python:
+    from cli import convertir, generar, leer_especificacion
+    generar(leer_especificacion('columnas.json'), 1_000_000, 'datos.parquet', procesos=4)
+
+El archivo de columnas es un JSON con la lista de columnas (o un objeto con la clave
+"columnas"); cada columna tiene nombre, tipo (ver `python cli.py tipos`) y opciones:
+    [{"nombre": "id", "tipo": "ID Único"},
+     {"nombre": "monto", "tipo": "Log-normal", "opciones": {"media": 3, "sigma": 0.8}}]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from exportacion import ESCRITORES, exportar_dataframe
+from generadores import TIPOS_DATO, TAMAÑO_BLOQUE, generar_archivo, nueva_semilla
+from importacion import formato_archivo, leer_archivo
+
+
+def formato_salida(ruta):
+    """Formato de salida según la extensión (la más larga que coincida: .csv.gz es CSV (gzip))"""
+    formatos = [formato for formato, escritor in ESCRITORES.items() if ruta.lower().endswith(escritor.extension)]
+    if not formatos:
+        raise ValueError(f"No se reconoce el formato de salida de {ruta}; indícalo con --formato")
+    return max(formatos, key=lambda formato: len(ESCRITORES[formato].extension))
+
+
+def _validar_compresion(formato, compresion):
+    opciones = ESCRITORES[formato].compresiones
+    if compresion is not None and compresion not in opciones:
+        validas = ', '.join(opciones) if opciones else "ninguna"
+        raise ValueError(f"Compresión {compresion!r} no válida para {formato} (opciones: {validas})")
+
+
+def leer_especificacion(ruta):
+    """Configuración de columnas de un archivo JSON, en el formato que usa la interfaz"""
+    with open(ruta, encoding='utf-8') as f:
+        especificacion = json.load(f)
+    columnas = especificacion['columnas'] if isinstance(especificacion, dict) else especificacion
+    config = []
+    for i, columna in enumerate(columnas):
+        if columna.get('tipo') not in TIPOS_DATO:
+            raise ValueError(f"Columna {i + 1}: tipo de dato desconocido {columna.get('tipo')!r}")
+        config.append({'nombre': columna.get('nombre', f"Columna_{i + 1}"), 'tipo': columna['tipo'],
+                       'opciones': columna.get('opciones', {})})
+    return config
+
+
+def generar(columnas_config, n, salida, formato=None, semilla=None, procesos=1, compresion=None,
+            tamaño_bloque=TAMAÑO_BLOQUE, al_avanzar=None):
+    """Genera n filas directo a un archivo, por bloques. Devuelve la semilla usada"""
+    formato = formato or formato_salida(salida)
+    _validar_compresion(formato, compresion)
+    semilla = nueva_semilla() if semilla is None else semilla
+    generar_archivo(columnas_config, n, salida, formato, semilla, tamaño_bloque, procesos, al_avanzar, compresion)
+    return semilla
+
+
+def convertir(entrada, salida, formato=None, columnas=None, compresion=None, optimizar=False):
+    """Convierte un archivo entre los formatos de importación y los de exportación.
+
+    La tabla se lee completa y se escribe por bloques. Con optimizar=True se compactan los
+    tipos al leer (menos memoria, pero los decimales pasan a float32). Devuelve las filas escritas.
+    """
+    formato = formato or formato_salida(salida)
+    _validar_compresion(formato, compresion)
+    with open(entrada, 'rb') as archivo:
+        df, _ = leer_archivo(archivo, formato_archivo(entrada), columnas, optimizar, motor='pyarrow')
+    return exportar_dataframe(df, salida, formato, compresion=compresion)
+
+
+def _avance(total):
+    """Muestra el avance en stderr, sin llenar la salida de los trabajos en lote"""
+    inicio = time.perf_counter()
+
+    def al_avanzar(filas):
+        segundos = time.perf_counter() - inicio
+        print(f"\r{filas:,} de {total:,} filas ({filas / max(segundos, 1e-9):,.0f} filas/s)", end='', file=sys.stderr)
+        if filas >= total:
+            print(file=sys.stderr)
+    return al_avanzar
+
+
+def _resumen(filas, salida, inicio):
+    tamaño_mb = os.path.getsize(salida) / 1024 ** 2
+    return f"{filas:,} filas → {salida} ({tamaño_mb:,.1f} MB) en {time.perf_counter() - inicio:.1f} s"
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera y convierte datos de TP1 sin la interfaz")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_generar = comandos.add_parser('generar', help="genera filas aleatorias a partir de un archivo de columnas")
+    p_generar.add_argument('columnas', help="archivo JSON con la configuración de columnas")
+    p_generar.add_argument('-n', '--filas', type=int, required=True)
+    p_generar.add_argument('-o', '--salida', required=True)
+    p_generar.add_argument('--semilla', type=int, help="para repetir exactamente la misma generación")
+    p_generar.add_argument('-p', '--procesos', type=int, default=1, help="procesos en paralelo (0: todos los CPU)")
+    p_generar.add_argument('--bloque', type=int, default=TAMAÑO_BLOQUE, help="filas por bloque")
+
+    p_convertir = comandos.add_parser('convertir', help="convierte un archivo a otro formato")
+    p_convertir.add_argument('entrada')
+    p_convertir.add_argument('salida')
+    p_convertir.add_argument('--columnas', help="columnas a conservar, separadas por comas")
+    p_convertir.add_argument('--optimizar', action='store_true',
+                             help="compactar los tipos al leer: usa menos memoria pero los decimales pasan a float32")
+
+    for p in (p_generar, p_convertir):
+        p.add_argument('-f', '--formato', choices=list(ESCRITORES), help="por defecto, según la extensión de salida")
+        p.add_argument('--compresion', help="para Parquet o Feather (ver las opciones de cada formato)")
+
+    comandos.add_parser('tipos', help="lista los tipos de dato y sus opciones")
+
+    args = parser.parse_args(argumentos)
+    inicio = time.perf_counter()
+    try:
+        if args.comando == 'tipos':
+            for nombre, tipo in TIPOS_DATO.items():
+                opciones = ', '.join(f"{o.nombre}={o.valor!r}" for o in tipo.opciones)
+                print(f"{nombre}" + (f" ({opciones})" if opciones else ""))
+        elif args.comando == 'generar':
+            procesos = args.procesos or os.cpu_count() or 1
+            semilla = generar(leer_especificacion(args.columnas), args.filas, args.salida, args.formato,
+                              args.semilla, procesos, args.compresion, args.bloque, _avance(args.filas))
+            print(f"✅ {_resumen(args.filas, args.salida, inicio)} · semilla {semilla}")
+        else:
+            columnas = args.columnas.split(',') if args.columnas else None
+            filas = convertir(args.entrada, args.salida, args.formato, columnas, args.compresion, args.optimizar)
+            print(f"✅ {_resumen(filas, args.salida, inicio)}")
+    except (ValueError, KeyError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import os
+
+import streamlit as st
+
+from exportacion import ESCRITORES, exportar_en_cache, ruta_exportacion
+
+# ==============================
+# DESCARGA BAJO DEMANDA
+# ==============================
+# Antes cada rerun serializaba la tabla completa a CSV y a JSON aunque nadie descargara nada.
+# Ahora se elige un formato y la tabla se exporta recién al pedirlo; el archivo queda en caché
+# con la firma de la tabla base más la del registro de cambios, y se lee del disco recién al
+# hacer clic en descargar.
+
+
+def leer_al_descargar(ruta):
+    """Contenido de `ruta` para st.download_button, leído recién cuando se hace clic.
+
+    Con el archivo abierto, Streamlit lo cargaría entero en memoria en cada rerun.
+    """
+    def leer():
+        with open(ruta, 'rb') as archivo:
+            return archivo.read()
+    return leer
+
+
+def seccion_descarga(base, cambios, firma_base, nombre, clave):
+    """Selector de formato y descarga de la tabla editada (`base` con los cambios aplicados).
+
+    `firma_base` es la firma de la tabla base (ver exportacion.firma_tabla), calculada una
+    sola vez al cargarla; `nombre` es el nombre del archivo sin extensión.
+    """
+    firma = f"{firma_base}:{cambios.firma()}"
+    col_formato, col_compresion, col_boton = st.columns([1, 1, 2])
+    with col_formato:
+        formato = st.selectbox("Formato", list(ESCRITORES), key=f"{clave}_formato")
+    escritor = ESCRITORES[formato]
+    with col_compresion:
+        compresion = st.selectbox("Compresión", escritor.compresiones or ["—"], key=f"{clave}_compresion_{formato}",
+                                  disabled=not escritor.compresiones)
+    compresion = compresion if escritor.compresiones else None
+    ruta = ruta_exportacion(firma, formato, compresion)
+
+    with col_boton:
+        if not os.path.exists(ruta):
+            st.caption(f"{cambios.total_filas(base):,} filas · se exporta solo al pedirlo")
+            if st.button(f"📦 Preparar {formato}", type="primary", use_container_width=True, key=f"{clave}_preparar"):
+                try:
+                    with st.spinner("Exportando..."):
+                        exportar_en_cache(lambda: cambios.aplicar(base), firma, formato, compresion)
+                except ValueError as e:
+                    st.error(f"❌ No se pudo exportar: {str(e)}")
+                else:
+                    # Ya exportado: se vuelve a dibujar la sección con el botón de descarga
+                    st.rerun()
+        if os.path.exists(ruta):
+            st.caption(f"{os.path.getsize(ruta) / 1024 ** 2:,.1f} MB · listo para descargar")
+            st.download_button(
+                label=f"⬇️ Descargar {formato}",
+                data=leer_al_descargar(ruta),
+                file_name=nombre + escritor.extension,
+                mime=escritor.mime,
+                type="primary",
+                use_container_width=True,
+                key=f"{clave}_descargar"
+            )
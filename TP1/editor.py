@@ -0,0 +1,214 @@
+import hashlib
+import math
+import pickle
+
+import pandas as pd
+import streamlit as st
+
+# ==============================
+# EDITOR PAGINADO
+# ==============================
+# En lugar de pasar la tabla completa a st.data_editor se muestra una página (con filtro y
+# orden opcionales) y cada cambio se guarda en un registro disperso. La tabla base no se
+# modifica: los cambios se aplican recién cuando hace falta la tabla completa (al exportar).
+
+FILAS_POR_PAGINA = [50, 100, 500, 1000]
+SIN_FILTRO = "(sin filtro)"
+SIN_ORDEN = "(sin orden)"
+
+
+def _asignar(serie, filas, valores):
+    """Asigna valores en una Series; si no entran en su tipo (un entero más grande, una categoría
+    nueva) se asigna como object y se vuelve a inferir el tipo más adecuado"""
+    try:
+        serie.loc[filas] = valores
+    except (TypeError, ValueError):
+        serie = serie.astype(object)
+        serie.loc[filas] = valores
+        serie = serie.infer_objects()
+    return serie
+
+
+class CambiosTabla:
+    """Registro disperso de los cambios hechos en el editor sobre un DataFrame base.
+
+    Guarda celdas editadas (id de fila, columna, valor nuevo), filas borradas y filas nuevas.
+    Los ids de fila son el índice de la tabla base (enteros sin repetir, no necesariamente
+    0..n-1); las filas nuevas reciben ids a partir del mayor de la base más uno.
+    """
+
+    def __init__(self, base):
+        self.celdas = {}
+        self.borradas = set()
+        self.nuevas = {}
+        self.proximo_id = int(base.index.max()) + 1 if len(base) else 0
+        # Cambia con cada modificación: sirve para renovar el widget y como parte del hash
+        self.version = 0
+
+    def __len__(self):
+        return sum(map(len, self.celdas.values())) + len(self.borradas) + len(self.nuevas)
+
+    def editar(self, fila, columna, valor):
+        if fila in self.nuevas:
+            self.nuevas[fila][columna] = valor
+        else:
+            self.celdas.setdefault(fila, {})[columna] = valor
+
+    def borrar(self, fila):
+        if fila in self.nuevas:
+            del self.nuevas[fila]
+        else:
+            self.borradas.add(fila)
+            self.celdas.pop(fila, None)
+
+    def agregar(self, valores):
+        fila = self.proximo_id
+        self.nuevas[fila] = dict(valores)
+        self.proximo_id += 1
+        return fila
+
+    def firma(self):
+        """Hash del contenido del registro; junto con la firma de la base identifica la tabla editada"""
+        contenido = (
+            sorted((fila, sorted(celdas.items(), key=lambda item: str(item[0]))) for fila, celdas in self.celdas.items()),
+            sorted(self.borradas),
+            sorted(self.nuevas.items()),
+        )
+        return hashlib.sha256(pickle.dumps(contenido)).hexdigest()
+
+    def total_filas(self, base):
+        return len(base) - len(self.borradas) + len(self.nuevas)
+
+    def ids(self, base):
+        """Ids de todas las filas vigentes, en el orden original"""
+        ids = base.index
+        if self.borradas:
+            ids = ids[~ids.isin(list(self.borradas))]
+        if self.nuevas:
+            ids = ids.append(pd.Index(list(self.nuevas)))
+        return ids
+
+    def _nuevas_df(self, base, filas):
+        return pd.DataFrame.from_dict({f: self.nuevas[f] for f in filas}, orient='index', columns=base.columns)
+
+    def _aplicar_celdas(self, df, filas):
+        """Aplica sobre df las celdas editadas de las filas indicadas (reemplaza columnas, no las modifica)"""
+        por_columna = {}
+        for fila in filas:
+            for columna, valor in self.celdas.get(fila, {}).items():
+                por_columna.setdefault(columna, ([], []))
+                por_columna[columna][0].append(fila)
+                por_columna[columna][1].append(valor)
+        for columna, (filas_col, valores) in por_columna.items():
+            df[columna] = _asignar(df[columna].copy(), filas_col, valores)
+        return df
+
+    def filas(self, base, ids):
+        """Filas indicadas con los cambios aplicados: cuesta lo que la página, no lo que la tabla"""
+        existentes = [fila for fila in ids if fila not in self.nuevas]
+        df = self._aplicar_celdas(base.loc[existentes], existentes)
+        nuevas = [fila for fila in ids if fila in self.nuevas]
+        if nuevas:
+            df = pd.concat([df, self._nuevas_df(base, nuevas)]).loc[list(ids)]
+        return df
+
+    def columna(self, base, columna):
+        """Una columna completa con los cambios aplicados, para filtrar u ordenar"""
+        serie = base[columna]
+        editadas = {fila: cambios[columna] for fila, cambios in self.celdas.items() if columna in cambios}
+        if editadas:
+            serie = _asignar(serie.copy(), list(editadas), list(editadas.values()))
+        if self.borradas:
+            serie = serie.drop(list(self.borradas))
+        if self.nuevas:
+            serie = pd.concat([serie, self._nuevas_df(base, list(self.nuevas))[columna]])
+        return serie
+
+    def aplicar(self, base):
+        """Tabla completa con todos los cambios aplicados (sin cambios devuelve la base sin copiarla)"""
+        if not len(self):
+            return base
+        df = self._aplicar_celdas(base.copy(deep=False), list(self.celdas))
+        if self.borradas:
+            df = df.drop(list(self.borradas))
+        if self.nuevas:
+            df = pd.concat([df, self._nuevas_df(base, list(self.nuevas))])
+        return df.reset_index(drop=True)
+
+
+def registrar_cambios(cambios, estado, ids, devuelto):
+    """Pasa al registro los cambios que el widget de data_editor hizo sobre la página.
+
+    `estado` es el estado del widget (edited_rows, added_rows, deleted_rows, por posición
+    en la página) y `devuelto` la página editada, de donde se toman los valores ya
+    convertidos a su tipo. Devuelve True si hubo cambios.
+    """
+    editadas = estado.get('edited_rows', {})
+    agregadas = estado.get('added_rows', [])
+    borradas = {int(pos) for pos in estado.get('deleted_rows', [])}
+    if not (editadas or agregadas or borradas):
+        return False
+
+    columnas = {str(c): c for c in devuelto.columns}
+    existentes = devuelto.iloc[:len(devuelto) - len(agregadas)]
+    for pos, valores in editadas.items():
+        if int(pos) in borradas:
+            continue
+        fila = ids[int(pos)]
+        for nombre in valores:
+            if nombre in columnas:
+                cambios.editar(fila, columnas[nombre], existentes.at[fila, columnas[nombre]])
+    for pos in borradas:
+        cambios.borrar(ids[pos])
+    for _, fila in devuelto.iloc[len(devuelto) - len(agregadas):].iterrows():
+        cambios.agregar(fila.to_dict())
+    cambios.version += 1
+    return True
+
+
+def editor_paginado(base, cambios, clave):
+    """Muestra una página de la tabla en st.data_editor, con filtro, orden y paginado.
+
+    Las ediciones se guardan en `cambios` (no se devuelve la tabla editada).
+    """
+    columnas = [str(c) for c in base.columns]
+    col_filtro, col_texto, col_orden, col_sentido, col_tamaño = st.columns([2, 2, 2, 1, 1])
+    with col_filtro:
+        filtro = st.selectbox("Filtrar por", [SIN_FILTRO] + columnas, key=f"{clave}_filtro")
+    with col_texto:
+        texto = st.text_input("Contiene", key=f"{clave}_texto", disabled=filtro == SIN_FILTRO)
+    with col_orden:
+        orden = st.selectbox("Ordenar por", [SIN_ORDEN] + columnas, key=f"{clave}_orden")
+    with col_sentido:
+        descendente = st.toggle("Descendente", key=f"{clave}_descendente", disabled=orden == SIN_ORDEN)
+    with col_tamaño:
+        tamaño = st.selectbox("Filas por página", FILAS_POR_PAGINA, index=1, key=f"{clave}_tamaño")
+
+    # Sin filtro ni orden solo se calculan los ids de la página
+    ids = cambios.ids(base)
+    if filtro != SIN_FILTRO and texto:
+        valores = cambios.columna(base, base.columns[columnas.index(filtro)])
+        ids = valores.index[valores.astype(str).str.contains(texto, case=False, regex=False).to_numpy()]
+    if orden != SIN_ORDEN:
+        valores = cambios.columna(base, base.columns[columnas.index(orden)]).loc[ids]
+        ids = valores.sort_values(ascending=not descendente, kind='stable', na_position='last').index
+
+    paginas = max(1, math.ceil(len(ids) / tamaño))
+    clave_pagina = f"{clave}_pagina"
+    if st.session_state.get(clave_pagina, 1) > paginas:
+        st.session_state[clave_pagina] = paginas
+    col_pagina, col_info = st.columns([1, 3])
+    with col_pagina:
+        pagina = st.number_input(f"Página (de {paginas:,})", min_value=1, max_value=paginas, key=clave_pagina)
+    inicio = (pagina - 1) * tamaño
+    ids_pagina = ids[inicio:inicio + tamaño]
+    with col_info:
+        st.caption(f"Filas {inicio + 1 if len(ids) else 0:,}–{inicio + len(ids_pagina):,} de {len(ids):,}"
+                   f" · {len(cambios):,} cambios sin exportar")
+
+    pagina_df = cambios.filas(base, ids_pagina)
+    clave_editor = f"{clave}_editor_{cambios.version}"
+    devuelto = st.data_editor(pagina_df, use_container_width=True, num_rows="dynamic", key=clave_editor)
+    # Con cada cambio se renueva el widget, así la página se vuelve a armar con el registro actualizado
+    if registrar_cambios(cambios, st.session_state[clave_editor], list(ids_pagina), devuelto):
+        st.rerun()
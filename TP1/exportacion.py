@@ -0,0 +1,333 @@
+import gzip
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # sin pyarrow no se ofrecen Parquet ni Feather
+    pa = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # sin openpyxl no se ofrece Excel
+    Workbook = None
+
+# Límite de filas de una hoja de Excel (incluido el encabezado)
+MAX_FILAS_EXCEL = 1_048_576
+
+
+def preparar_para_json(df):
+    """Pasa las columnas float32 a float64 por su texto, para que en el JSON salga 12.34 y no 12.3400001526"""
+    columnas_float32 = [c for c, dtype in df.dtypes.items() if dtype == 'float32']
+    if not columnas_float32:
+        return df
+    df = df.copy()
+    for columna in columnas_float32:
+        df[columna] = df[columna].astype(str).astype('float64')
+    return df
+
+
+# ==============================
+# ESCRITORES POR BLOQUES
+# ==============================
+# Cada escritor recibe un archivo binario abierto y le va agregando bloques de a uno, así
+# la memoria usada depende del tamaño del bloque y no del total de filas. preparar(df) no
+# depende del estado del escritor, así que se puede ejecutar en otro proceso; el escritor
+# solo agrega al archivo lo ya preparado. `compresiones` son las opciones de compresión
+# del formato (la primera es la predeterminada); los formatos sin opciones la ignoran.
+
+class EscritorCSV:
+    extension = '.csv'
+    mime = 'text/csv'
+    compresiones = ()
+
+    def __init__(self, destino, compresion=None):
+        self.destino = destino
+        self.encabezado = True
+
+    @staticmethod
+    def preparar(df):
+        encabezado = df.iloc[:0].to_csv(index=False).encode('utf-8')
+        return encabezado, df.to_csv(index=False, header=False).encode('utf-8')
+
+    def escribir_preparado(self, datos):
+        encabezado, filas = datos
+        if self.encabezado:
+            self.destino.write(encabezado)
+            self.encabezado = False
+        self.destino.write(filas)
+
+    def escribir(self, df):
+        self.escribir_preparado(self.preparar(df))
+
+    def cerrar(self):
+        pass
+
+
+class EscritorCSVGzip(EscritorCSV):
+    """CSV comprimido con gzip a medida que llegan los bloques"""
+    extension = '.csv.gz'
+    mime = 'application/gzip'
+
+    def __init__(self, destino, compresion=None):
+        # mtime=0 y sin nombre en el encabezado: el mismo contenido da el mismo archivo en cualquier ruta
+        super().__init__(gzip.GzipFile(filename='', fileobj=destino, mode='wb', compresslevel=6, mtime=0))
+
+    def cerrar(self):
+        self.destino.close()
+
+
+class EscritorJSON(EscritorCSV):
+    """Lista JSON indentada, igual a to_json(orient='records', indent=4) pero armada bloque a bloque"""
+    extension = '.json'
+    mime = 'application/json'
+
+    def __init__(self, destino, compresion=None):
+        self.destino = destino
+        self.vacio = True
+
+    @staticmethod
+    def preparar(df):
+        if df.empty:
+            return b''
+        texto = preparar_para_json(df).to_json(orient='records', indent=4, force_ascii=False, date_format='iso')
+        # Sin el "[\n" inicial ni el "\n]" final, para unir los bloques con comas
+        return texto[2:-2].encode('utf-8')
+
+    def escribir_preparado(self, datos):
+        if not datos:
+            return
+        self.destino.write(b'[\n' if self.vacio else b',\n')
+        self.destino.write(datos)
+        self.vacio = False
+
+    def cerrar(self):
+        self.destino.write(b'[]' if self.vacio else b'\n]')
+
+
+class EscritorJSONL(EscritorCSV):
+    """JSON Lines: un objeto JSON por fila, se puede concatenar bloque a bloque"""
+    extension = '.jsonl'
+    mime = 'application/x-ndjson'
+
+    @staticmethod
+    def preparar(df):
+        if df.empty:
+            return b''
+        texto = preparar_para_json(df).to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+        return texto.rstrip('\n').encode('utf-8') + b'\n'
+
+    def escribir_preparado(self, datos):
+        self.destino.write(datos)
+
+
+class EscritorParquet(EscritorCSV):
+    """Parquet con un row group por bloque; todos los bloques usan el esquema del primero"""
+    extension = '.parquet'
+    mime = 'application/vnd.apache.parquet'
+    compresiones = ('snappy', 'zstd', 'gzip', 'none')
+
+    def __init__(self, destino, compresion=None):
+        self.destino = destino
+        self.compresion = compresion or self.compresiones[0]
+        self.escritor = None
+
+    @staticmethod
+    def preparar(df):
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def escribir_preparado(self, tabla):
+        if self.escritor is None:
+            self.escritor = pq.ParquetWriter(self.destino, tabla.schema, compression=self.compresion)
+        self.escritor.write_table(tabla.cast(self.escritor.schema))
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+class EscritorFeather(EscritorParquet):
+    """Feather v2 (formato de archivo Arrow IPC), con los bloques como record batches"""
+    extension = '.feather'
+    mime = 'application/vnd.apache.arrow.file'
+    compresiones = ('lz4', 'zstd', 'none')
+
+    def escribir_preparado(self, tabla):
+        if self.escritor is None:
+            compresion = None if self.compresion == 'none' else self.compresion
+            self.escritor = pa.ipc.new_file(self.destino, tabla.schema,
+                                            options=pa.ipc.IpcWriteOptions(compression=compresion))
+            self.esquema = tabla.schema
+        self.escritor.write_table(tabla.cast(self.esquema))
+
+    def cerrar(self):
+        if self.escritor is None:
+            # Tabla sin bloques: igual se escribe un archivo válido, vacío
+            self.escritor = pa.ipc.new_file(self.destino, pa.schema([]))
+        self.escritor.close()
+
+
+class EscritorExcel(EscritorCSV):
+    """Excel (.xlsx) con una sola hoja; openpyxl en modo write_only va escribiendo las filas"""
+    extension = '.xlsx'
+    mime = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, destino, compresion=None):
+        self.destino = destino
+        self.libro = Workbook(write_only=True)
+        self.hoja = self.libro.create_sheet('Datos')
+        self.filas = 0
+
+    @staticmethod
+    def preparar(df):
+        # Valores de Python (sin NaN ni NaT, que Excel no admite) y categorías como su valor
+        valores = df.astype(object).where(df.notna(), None)
+        return [str(columna) for columna in df.columns], list(valores.itertuples(index=False, name=None))
+
+    def escribir_preparado(self, datos):
+        encabezado, filas = datos
+        if self.filas == 0:
+            self.hoja.append(encabezado)
+            self.filas = 1
+        if self.filas + len(filas) > MAX_FILAS_EXCEL:
+            raise ValueError(f"Excel admite hasta {MAX_FILAS_EXCEL:,} filas por hoja")
+        for fila in filas:
+            self.hoja.append(fila)
+        self.filas += len(filas)
+
+    def cerrar(self):
+        self.libro.save(self.destino)
+
+
+# Formatos de salida por bloques disponibles en este entorno
+ESCRITORES = {'CSV': EscritorCSV, 'CSV (gzip)': EscritorCSVGzip, 'JSON': EscritorJSON, 'JSON Lines': EscritorJSONL}
+if pa is not None:
+    ESCRITORES['Parquet'] = EscritorParquet
+    ESCRITORES['Feather'] = EscritorFeather
+if Workbook is not None:
+    ESCRITORES['Excel'] = EscritorExcel
+
+
+def escribir_preparados(bloques, ruta, formato, al_avanzar=None, compresion=None):
+    """Escribe en orden bloques ya preparados, dados como pares (filas, datos preparados).
+
+    Se escribe en un archivo temporal que reemplaza al definitivo solo al terminar bien.
+    `al_avanzar(filas)` se llama después de cada bloque. Devuelve las filas escritas.
+    """
+    temporal = ruta + '.tmp'
+    total = 0
+    try:
+        with open(temporal, 'wb') as destino:
+            escritor = ESCRITORES[formato](destino, compresion)
+            for filas, datos in bloques:
+                escritor.escribir_preparado(datos)
+                total += filas
+                if al_avanzar is not None:
+                    al_avanzar(total)
+            escritor.cerrar()
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return total
+
+
+def escribir_archivo(bloques, ruta, formato, al_avanzar=None, compresion=None):
+    """Escribe los DataFrames de `bloques` en un archivo a medida que se generan"""
+    preparar = ESCRITORES[formato].preparar
+    return escribir_preparados(((len(df), preparar(df)) for df in bloques), ruta, formato, al_avanzar, compresion)
+
+
+# ==============================
+# EXPORTACIÓN BAJO DEMANDA
+# ==============================
+# La tabla editada se serializa recién cuando se pide la descarga, por bloques, a un archivo
+# en una carpeta temporal cuyo nombre sale de la firma del contenido: si la tabla no cambió
+# la próxima descarga en ese formato reutiliza el archivo ya escrito.
+
+FILAS_BLOQUE_EXPORTACION = 100_000
+DIRECTORIO_EXPORTACIONES = os.path.join(tempfile.gettempdir(), 'tp1_exportaciones')
+MAX_EXPORTACIONES = 20
+
+
+def firma_tabla(df):
+    """Hash del contenido de un DataFrame: columnas, tipos, índice y valores"""
+    firma = hashlib.sha256(pickle.dumps([(str(columna), str(dtype)) for columna, dtype in df.dtypes.items()]))
+    firma.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return firma.hexdigest()
+
+
+def bloques_de(df, filas=FILAS_BLOQUE_EXPORTACION):
+    """Parte un DataFrame en bloques de a lo sumo `filas` filas (una tabla vacía es un solo bloque)"""
+    for inicio in range(0, max(len(df), 1), filas):
+        yield df.iloc[inicio:inicio + filas]
+
+
+def exportar_dataframe(df, ruta, formato, al_avanzar=None, compresion=None):
+    """Escribe un DataFrame a archivo por bloques, sin armar el texto completo en memoria"""
+    return escribir_archivo(bloques_de(df), ruta, formato, al_avanzar, compresion)
+
+
+def ruta_exportacion(firma, formato, compresion=None):
+    nombre = hashlib.sha256(f"{firma}|{formato}|{compresion}".encode('utf-8')).hexdigest()[:32]
+    return os.path.join(DIRECTORIO_EXPORTACIONES, nombre + ESCRITORES[formato].extension)
+
+
+def _limpiar_exportaciones():
+    """Deja solo las MAX_EXPORTACIONES usadas más recientemente"""
+    rutas = [os.path.join(DIRECTORIO_EXPORTACIONES, nombre) for nombre in os.listdir(DIRECTORIO_EXPORTACIONES)
+             if not nombre.endswith('.tmp')]
+    for ruta in sorted(rutas, key=os.path.getmtime)[:-MAX_EXPORTACIONES]:
+        os.remove(ruta)
+
+
+# ==============================
+# ARCHIVOS GENERADOS DESDE LA APP
+# ==============================
+# El modo "Directo a archivo" escribe siempre en esta carpeta, con un nombre al azar que no
+# elige quien usa la app, y el archivo se entrega como descarga. Solo se conservan los
+# últimos MAX_GENERADOS para que la carpeta no crezca sin límite.
+
+DIRECTORIO_GENERADOS = os.path.join(tempfile.gettempdir(), 'tp1_generados')
+MAX_GENERADOS = 3
+
+
+def nueva_ruta_generada(formato):
+    os.makedirs(DIRECTORIO_GENERADOS, exist_ok=True)
+    return os.path.join(DIRECTORIO_GENERADOS, uuid.uuid4().hex + ESCRITORES[formato].extension)
+
+
+def limpiar_generados():
+    """Deja solo los MAX_GENERADOS archivos generados más recientes"""
+    rutas = [os.path.join(DIRECTORIO_GENERADOS, nombre) for nombre in os.listdir(DIRECTORIO_GENERADOS)
+             if not nombre.endswith('.tmp')]
+    for ruta in sorted(rutas, key=os.path.getmtime)[:-MAX_GENERADOS]:
+        os.remove(ruta)
+
+
+def nombre_seguro(nombre, por_defecto='datos_aleatorios'):
+    """Nombre de archivo sin carpetas ni caracteres especiales (para el archivo descargado)"""
+    nombre = re.sub(r'[^\w.-]', '_', os.path.basename(nombre.replace('\\', '/'))).lstrip('.')
+    return nombre[:100] or por_defecto
+
+
+def exportar_en_cache(obtener_df, firma, formato, compresion=None):
+    """Ruta del archivo exportado de la tabla con esa firma; se escribe solo si no existe.
+
+    `obtener_df()` arma la tabla y solo se llama cuando hay que serializarla.
+    """
+    ruta = ruta_exportacion(firma, formato, compresion)
+    if os.path.exists(ruta):
+        os.utime(ruta)
+        return ruta
+    os.makedirs(DIRECTORIO_EXPORTACIONES, exist_ok=True)
+    exportar_dataframe(obtener_df(), ruta, formato, compresion=compresion)
+    _limpiar_exportaciones()
+    return ruta
@@ -0,0 +1,593 @@
+import json
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from exportacion import ESCRITORES, escribir_preparados
+
+# ==============================
+# GENERADORES VECTORIZADOS
+# ==============================
+# Cada generador recibe la cantidad de filas y un numpy.random.Generator y arma la columna
+# completa de una vez con arrays de NumPy, sin recorrer fila por fila.
+
+NOMBRES = np.array(["Juan", "María", "Carlos", "Ana", "Pedro", "Laura", "Diego", "Sofía",
+                    "Miguel", "Lucía", "Fernando", "Valentina", "Roberto", "Camila", "Jorge",
+                    "Isabella", "Luis", "Martina", "Antonio", "Victoria"])
+APELLIDOS = np.array(["García", "Rodríguez", "Martínez", "López", "González", "Pérez",
+                      "Sánchez", "Ramírez", "Torres", "Flores", "Rivera", "Gómez", "Díaz",
+                      "Cruz", "Morales", "Reyes", "Jiménez", "Hernández", "Ruiz", "Vargas"])
+USUARIOS_EMAIL = np.array(["user", "contact", "info", "admin", "support", "juan", "maria", "carlos"])
+DOMINIOS_EMAIL = np.array(["gmail.com", "hotmail.com", "yahoo.com", "outlook.com", "empresa.com"])
+CIUDADES = np.array(["Buenos Aires", "Córdoba", "Rosario", "Mendoza", "La Plata", "San Miguel de Tucumán",
+                     "Mar del Plata", "Salta", "Santa Fe", "San Juan", "Resistencia", "Neuquén",
+                     "Posadas", "Bahía Blanca", "Paraná", "San Salvador de Jujuy"])
+PRODUCTOS = np.array(["Laptop", "Mouse", "Teclado", "Monitor", "Auriculares", "Webcam", "Micrófono",
+                      "Tablet", "Smartphone", "Impresora", "Scanner", "Router", "Disco Duro", "USB",
+                      "Cable HDMI", "Adaptador", "Cargador", "Batería", "Mousepad", "Soporte"])
+PALABRAS_LOREM = np.array(["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit",
+                           "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore", "et", "dolore",
+                           "magna", "aliqua"])
+
+# Todas las combinaciones "Nombre Apellido": elegir una es un solo índice aleatorio por fila
+NOMBRES_COMPLETOS = np.char.add(np.char.add(NOMBRES[:, None], " "), APELLIDOS[None, :]).ravel()
+# Lo mismo para los emails: usuario + número del 1 al 999 + dominio
+USUARIOS_NUMERADOS = np.char.add(USUARIOS_EMAIL[:, None], np.arange(1, 1000).astype('U3')[None, :]).ravel()
+EMAILS = np.char.add(np.char.add(USUARIOS_NUMERADOS[:, None], "@"), DOMINIOS_EMAIL[None, :]).ravel()
+# Las dos mitades de un teléfono ("+54 9 11 1234-" y "5678"): se eligen y se unen una sola vez
+CUATRO_DIGITOS = np.arange(1000, 10000).astype('U4')
+INICIOS_TELEFONO = np.char.add(np.char.add("+54 9 11 ", CUATRO_DIGITOS), "-")
+
+# Para el texto lorem: el token 0 es vacío y los demás son " palabra"; se precalculan todos
+# los tríos de tokens para armar cada oración con pocas concatenaciones
+MIN_PALABRAS_LOREM, MAX_PALABRAS_LOREM = 3, 8
+TOKENS_LOREM = np.concatenate([[""], np.char.add(" ", PALABRAS_LOREM)])
+TRIOS_LOREM = np.char.add(np.char.add(TOKENS_LOREM[:, None, None], TOKENS_LOREM[None, :, None]),
+                          TOKENS_LOREM[None, None, :]).ravel()
+FINALES_LOREM = np.char.add(TOKENS_LOREM, ".")
+
+
+def _rng(rng):
+    return np.random.default_rng() if rng is None else rng
+
+
+def elegir(valores, n, rng=None):
+    """Elige n valores al azar (con reposición) de un array de categorías"""
+    return valores[_rng(rng).integers(0, len(valores), n)]
+
+
+def generar_nombres(n, rng=None):
+    return elegir(NOMBRES_COMPLETOS, n, rng)
+
+
+def generar_emails(n, rng=None):
+    return elegir(EMAILS, n, rng)
+
+
+def generar_telefonos(n, rng=None):
+    rng = _rng(rng)
+    return np.char.add(elegir(INICIOS_TELEFONO, n, rng), elegir(CUATRO_DIGITOS, n, rng))
+
+
+def generar_fechas(n, inicio="2020-01-01", fin="2024-12-31", rng=None):
+    """Fechas uniformes entre inicio y fin (incluidos) como texto AAAA-MM-DD"""
+    # Se formatea una vez cada día del rango y después solo se eligen índices
+    dias = np.datetime_as_string(np.arange(np.datetime64(inicio, 'D'), np.datetime64(fin, 'D') + 1), unit='D')
+    return elegir(dias, n, rng)
+
+
+def generar_numeros(n, minimo=1, maximo=100, decimales=False, rng=None):
+    rng = _rng(rng)
+    if decimales:
+        return np.round(rng.uniform(minimo, maximo, n), 2)
+    return rng.integers(minimo, maximo, n, endpoint=True)
+
+
+def generar_ciudades(n, rng=None):
+    return elegir(CIUDADES, n, rng)
+
+
+def generar_productos(n, rng=None):
+    return elegir(PRODUCTOS, n, rng)
+
+
+def generar_booleanos(n, rng=None):
+    return _rng(rng).random(n) < 0.5
+
+
+def generar_lorem(n, rng=None):
+    """Oraciones de 3 a 8 palabras, con mayúscula inicial y punto final"""
+    rng = _rng(rng)
+    cantidad = rng.integers(MIN_PALABRAS_LOREM, MAX_PALABRAS_LOREM, n, endpoint=True)
+    # Token de cada posición (1 a 19) o 0 si la oración ya terminó
+    tokens = rng.integers(1, len(TOKENS_LOREM), (MAX_PALABRAS_LOREM, n))
+    tokens[np.arange(MAX_PALABRAS_LOREM)[:, None] >= cantidad] = 0
+    base = len(TOKENS_LOREM)
+    trio_1 = (tokens[1] * base + tokens[2]) * base + tokens[3]
+    trio_2 = (tokens[4] * base + tokens[5]) * base + tokens[6]
+    texto = np.char.capitalize(PALABRAS_LOREM)[tokens[0] - 1]
+    texto = np.char.add(texto, TRIOS_LOREM[trio_1])
+    texto = np.char.add(texto, TRIOS_LOREM[trio_2])
+    return np.char.add(texto, FINALES_LOREM[tokens[7]])
+
+
+def con_prefijo(valores, prefijo):
+    """Antepone un prefijo de texto a valores enteros (sin prefijo quedan como números)"""
+    return np.char.add(prefijo, valores.astype(str)) if prefijo else valores
+
+
+def leer_pesos(texto):
+    """Convierte "a:3, b:1, c" en los valores y sus probabilidades (sin peso, el peso es 1)"""
+    error = ValueError(f"Valores con pesos inválidos: {texto!r} (formato: valor:peso, valor:peso)")
+    valores, pesos = [], []
+    for parte in filter(None, (parte.strip() for parte in texto.split(','))):
+        valor, _, peso = parte.rpartition(':') if ':' in parte else (parte, '', '1')
+        valores.append(valor.strip())
+        try:
+            pesos.append(float(peso))
+        except ValueError:
+            raise error from None
+    pesos = np.array(pesos)
+    if not valores or (pesos < 0).any() or pesos.sum() <= 0:
+        raise error
+    return np.array(valores), pesos / pesos.sum()
+
+
+def generar_categorias(n, valores, probabilidades, rng=None):
+    """Valores de una lista con la probabilidad indicada para cada uno"""
+    return _rng(rng).choice(valores, n, p=probabilidades)
+
+
+def generar_zipf(n, claves=1000, exponente=1.1, rng=None):
+    """Claves 1..claves con frecuencia proporcional a 1/k^exponente: la 1 es la más frecuente.
+
+    A diferencia de rng.zipf el rango está acotado y el exponente puede ser menor que 1.
+    """
+    if claves < 1:
+        raise ValueError("La cantidad de claves tiene que ser al menos 1")
+    return np.searchsorted(_zipf_acumulado(claves, exponente), _rng(rng).random(n), side='right') + 1
+
+
+@lru_cache(maxsize=4)
+def _zipf_acumulado(claves, exponente):
+    """Distribución acumulada de Zipf; se reutiliza entre bloques (puede tener millones de claves)"""
+    acumulado = np.cumsum(np.arange(1, claves + 1, dtype=np.float64) ** -exponente)
+    acumulado /= acumulado[-1]
+    return acumulado
+
+
+def generar_normal(n, media=0.0, desvio=1.0, rng=None):
+    return np.round(_rng(rng).normal(media, desvio, n), 2)
+
+
+def generar_lognormal(n, media=0.0, sigma=1.0, rng=None):
+    """Log-normal: el logaritmo de cada valor tiene distribución normal(media, sigma)"""
+    return np.round(_rng(rng).lognormal(media, sigma, n), 2)
+
+
+# Dominio de una columna: sus `tamaño` valores posibles en un orden fijo, y
+# valores(posiciones) que devuelve los valores en esas posiciones (0 es el primero)
+Dominio = namedtuple('Dominio', ['tamaño', 'valores'])
+
+
+def dominio_de_valores(valores):
+    """Dominio con los valores distintos de un array, en el orden en que aparecen"""
+    distintos = pd.unique(np.asarray(valores))
+    return Dominio(len(distintos), lambda posiciones: distintos[posiciones])
+
+
+def generar_referencias(n, dominio, exponente=0.0, rng=None):
+    """Valores tomados del dominio de otra columna, como una clave foránea.
+
+    Con exponente 0 todos los valores del dominio tienen la misma probabilidad; con exponente
+    mayor a 0 se reparten con Zipf y el primero del dominio es el más referenciado. Como el
+    dominio es el mismo en todos los bloques, las claves más referenciadas también lo son.
+    """
+    if dominio.tamaño < 1:
+        raise ValueError("La columna de referencia no tiene valores")
+    if exponente > 0:
+        posiciones = generar_zipf(n, dominio.tamaño, exponente, rng) - 1
+    else:
+        posiciones = _rng(rng).integers(0, dominio.tamaño, n)
+    return dominio.valores(posiciones)
+
+
+def generar_ids(n, inicio=1, paso=1, fila_inicial=0):
+    """IDs únicos y consecutivos: la fila i (contando desde el principio del dataset) recibe inicio + i * paso"""
+    return inicio + paso * (fila_inicial + np.arange(n, dtype=np.int64))
+
+
+# ==============================
+# REGISTRO DE TIPOS DE DATO
+# ==============================
+# Cada tipo de columna es una clase registrada en TIPOS_DATO con su nombre (el que se ve en la
+# interfaz), las opciones que acepta y generar(n, rng, **opciones), que arma la columna
+# completa de una vez. La interfaz dibuja los controles a partir de `opciones`, así que para
+# agregar un tipo alcanza con registrar una clase nueva.
+
+# control: 'entero', 'decimal', 'texto', 'fecha' (AAAA-MM-DD) o 'columna' (el nombre de una
+# columna anterior; generar recibe el Dominio de esa columna en todo el dataset)
+Opcion = namedtuple('Opcion', ['nombre', 'etiqueta', 'control', 'valor'])
+
+TIPOS_DATO = {}
+
+
+def registrar_tipo(clase):
+    """Decorador de clase: agrega el tipo de dato al registro con su nombre"""
+    TIPOS_DATO[clase.nombre] = clase
+    return clase
+
+
+class TipoDato:
+    nombre = None
+    ayuda = ""
+    opciones = ()
+    # Datos del bloque que generar necesita además de las opciones (por ahora solo 'fila_inicial')
+    contexto = ()
+
+    @staticmethod
+    def generar(n, rng, **opciones):
+        raise NotImplementedError
+
+    # Los tipos que saben calcular el valor de cualquier fila del dataset lo declaran con
+    # valores_en(posiciones, **opciones); para el resto el dominio se arma generando valores
+    valores_en = None
+
+
+@registrar_tipo
+class Nombres(TipoDato):
+    nombre = "Nombres"
+    generar = staticmethod(generar_nombres)
+
+
+@registrar_tipo
+class Emails(TipoDato):
+    nombre = "Emails"
+    generar = staticmethod(generar_emails)
+
+
+@registrar_tipo
+class Telefonos(TipoDato):
+    nombre = "Teléfonos"
+    generar = staticmethod(generar_telefonos)
+
+
+@registrar_tipo
+class Fechas(TipoDato):
+    nombre = "Fechas"
+    opciones = (Opcion('inicio', "Fecha inicio", 'fecha', "2020-01-01"),
+                Opcion('fin', "Fecha fin", 'fecha', "2024-12-31"))
+
+    @staticmethod
+    def generar(n, rng, inicio, fin):
+        return generar_fechas(n, inicio, fin, rng)
+
+
+@registrar_tipo
+class NumerosEnteros(TipoDato):
+    nombre = "Números Enteros"
+    opciones = (Opcion('minimo', "Mínimo", 'entero', 1), Opcion('maximo', "Máximo", 'entero', 100))
+
+    @staticmethod
+    def generar(n, rng, minimo, maximo):
+        return generar_numeros(n, minimo, maximo, rng=rng)
+
+
+@registrar_tipo
+class NumerosDecimales(NumerosEnteros):
+    nombre = "Números Decimales"
+
+    @staticmethod
+    def generar(n, rng, minimo, maximo):
+        return generar_numeros(n, minimo, maximo, True, rng)
+
+
+@registrar_tipo
+class Ciudades(TipoDato):
+    nombre = "Ciudades"
+    generar = staticmethod(generar_ciudades)
+
+
+@registrar_tipo
+class Productos(TipoDato):
+    nombre = "Productos"
+    generar = staticmethod(generar_productos)
+
+
+@registrar_tipo
+class Booleanos(TipoDato):
+    nombre = "Booleanos"
+    generar = staticmethod(generar_booleanos)
+
+
+@registrar_tipo
+class TextoLorem(TipoDato):
+    nombre = "Texto Lorem"
+    generar = staticmethod(generar_lorem)
+
+
+@registrar_tipo
+class CategoriasPonderadas(TipoDato):
+    nombre = "Categorías con Pesos"
+    ayuda = "Cada valor sale con probabilidad proporcional a su peso"
+    opciones = (Opcion('valores', "Valores (valor:peso, ...)", 'texto', "Efectivo:5, Tarjeta:3, Transferencia:1"),)
+
+    @staticmethod
+    def generar(n, rng, valores):
+        return generar_categorias(n, *leer_pesos(valores), rng)
+
+
+@registrar_tipo
+class ClavesZipf(TipoDato):
+    nombre = "Claves Zipf"
+    ayuda = "Pocas claves concentran la mayoría de las filas (claves calientes); más exponente, más concentración"
+    opciones = (Opcion('claves', "Cantidad de claves", 'entero', 1000),
+                Opcion('exponente', "Exponente", 'decimal', 1.1),
+                Opcion('prefijo', "Prefijo", 'texto', ""))
+
+    @staticmethod
+    def generar(n, rng, claves, exponente, prefijo):
+        return con_prefijo(generar_zipf(n, claves, exponente, rng), prefijo)
+
+
+@registrar_tipo
+class Normal(TipoDato):
+    nombre = "Normal"
+    opciones = (Opcion('media', "Media", 'decimal', 0.0), Opcion('desvio', "Desvío estándar", 'decimal', 1.0))
+
+    @staticmethod
+    def generar(n, rng, media, desvio):
+        return generar_normal(n, media, desvio, rng)
+
+
+@registrar_tipo
+class LogNormal(TipoDato):
+    nombre = "Log-normal"
+    ayuda = "Valores positivos con cola larga, como montos o tiempos de respuesta"
+    opciones = (Opcion('media', "Media del logaritmo", 'decimal', 0.0),
+                Opcion('sigma', "Desvío del logaritmo", 'decimal', 1.0))
+
+    @staticmethod
+    def generar(n, rng, media, sigma):
+        return generar_lognormal(n, media, sigma, rng)
+
+
+@registrar_tipo
+class Referencia(TipoDato):
+    nombre = "Referencia a Columna"
+    ayuda = ("Valores de una columna anterior, como una clave foránea (de un ID Único, cualquier ID del "
+             "dataset); con exponente mayor a 0 los primeros valores se repiten mucho más")
+    opciones = (Opcion('columna', "Columna de referencia", 'columna', None),
+                Opcion('exponente', "Exponente", 'decimal', 0.0))
+
+    @staticmethod
+    def generar(n, rng, columna, exponente):
+        return generar_referencias(n, columna, exponente, rng)
+
+
+@registrar_tipo
+class IdUnico(TipoDato):
+    nombre = "ID Único"
+    ayuda = "Secuencia sin repetidos en todo el dataset, también al generar por bloques o en paralelo"
+    opciones = (Opcion('inicio', "Inicio", 'entero', 1), Opcion('paso', "Paso", 'entero', 1),
+                Opcion('prefijo', "Prefijo", 'texto', ""))
+    contexto = ('fila_inicial',)
+
+    @staticmethod
+    def generar(n, rng, inicio, paso, prefijo, fila_inicial):
+        return con_prefijo(generar_ids(n, inicio, paso, fila_inicial), prefijo)
+
+    @staticmethod
+    def valores_en(posiciones, inicio, paso, prefijo):
+        return con_prefijo(inicio + paso * np.asarray(posiciones, dtype=np.int64), prefijo)
+
+
+def _opciones_completas(clase, opciones):
+    argumentos = {opcion.nombre: opcion.valor for opcion in clase.opciones}
+    argumentos.update(opciones)
+    return argumentos
+
+
+def columnas_referidas(tipo, opciones):
+    """Nombres de las columnas que usan las opciones de control 'columna' del tipo"""
+    if tipo not in TIPOS_DATO:
+        raise ValueError(f"Tipo de dato desconocido: {tipo}")
+    clase = TIPOS_DATO[tipo]
+    argumentos = _opciones_completas(clase, opciones)
+    return [argumentos[opcion.nombre] for opcion in clase.opciones if opcion.control == 'columna']
+
+
+def generar_columna(tipo, n, opciones, rng=None, dominios=None, fila_inicial=0):
+    """Genera una columna completa del tipo indicado.
+
+    Las opciones que falten toman su valor predeterminado. `dominios` tiene el Dominio de
+    las columnas anteriores (para las opciones de control 'columna', ver dominio_columna) y
+    `fila_inicial` es la posición de la primera fila del bloque en el dataset.
+    """
+    if tipo not in TIPOS_DATO:
+        raise ValueError(f"Tipo de dato desconocido: {tipo}")
+    clase = TIPOS_DATO[tipo]
+    argumentos = _opciones_completas(clase, opciones)
+    for opcion in clase.opciones:
+        if opcion.control == 'columna':
+            referida = argumentos[opcion.nombre]
+            if referida not in (dominios or {}):
+                raise ValueError(f"{tipo}: la columna '{referida}' no existe o no está antes que esta")
+            argumentos[opcion.nombre] = dominios[referida]
+    if 'fila_inicial' in clase.contexto:
+        argumentos['fila_inicial'] = fila_inicial
+    return clase.generar(n, _rng(rng), **argumentos)
+
+
+# Filas por bloque: cada bloque se genera por separado (y puede ir a otro proceso)
+TAMAÑO_BLOQUE = 200_000
+
+
+def nueva_semilla():
+    """Semilla al azar, para poder informarla y repetir una generación sin semilla fija"""
+    return int(np.random.SeedSequence().entropy)
+
+
+def rng_columna(semilla, bloque, columna):
+    """Generador independiente para una columna de un bloque.
+
+    Cada par (bloque, columna) tiene su propio substream derivado de la semilla con
+    spawn_key, así el resultado no depende del orden ni del proceso en que se genere.
+    """
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(bloque, columna)))
+
+
+# ==============================
+# DOMINIOS DE LAS COLUMNAS REFERIDAS
+# ==============================
+# Una referencia no toma valores del bloque sino del dominio de la columna referida en todo
+# el dataset, igual en todos los bloques. Para un ID Único el dominio son los IDs de todas
+# las filas del dataset, así las claves más referenciadas no dependen del tamaño de bloque.
+# Para los demás tipos se vuelven a generar, con los mismos substreams (bloque, columna), los
+# valores de la columna en sus primeras MAX_FILAS_DOMINIO filas y se toman los distintos: toda
+# referencia es un valor que está en la columna referida.
+
+MAX_FILAS_DOMINIO = 1_000_000
+
+
+@lru_cache(maxsize=16)
+def _dominio(config_json, total, semilla, tamaño_bloque):
+    columnas_config = json.loads(config_json)
+    j = len(columnas_config) - 1
+    config = columnas_config[j]
+    clase = TIPOS_DATO[config['tipo']]
+    if clase.valores_en is not None:
+        argumentos = _opciones_completas(clase, config['opciones'])
+        return Dominio(total, lambda posiciones: clase.valores_en(posiciones, **argumentos))
+    filas = min(total, MAX_FILAS_DOMINIO)
+    dominios = _dominios_referidos(columnas_config, j, total, semilla, tamaño_bloque)
+    # Cada bloque se genera completo, como en el dataset, aunque del último se usen menos filas
+    valores = [
+        generar_columna(config['tipo'], min(tamaño_bloque, total - inicio), config['opciones'],
+                        rng_columna(semilla, bloque, j), dominios, inicio)
+        for bloque, inicio in enumerate(range(0, filas, tamaño_bloque))
+    ]
+    return dominio_de_valores(np.concatenate(valores)[:filas] if valores else [])
+
+
+def dominio_columna(columnas_config, j, total, semilla, tamaño_bloque=TAMAÑO_BLOQUE):
+    """Dominio de la columna j en un dataset de `total` filas (se calcula una vez por proceso)"""
+    config_json = json.dumps(columnas_config[:j + 1], sort_keys=True, default=str)
+    return _dominio(config_json, total, semilla, tamaño_bloque)
+
+
+def _dominios_referidos(columnas_config, j, total, semilla, tamaño_bloque):
+    """Dominios de las columnas anteriores a j a las que refiere la columna j"""
+    posiciones = {config['nombre']: i for i, config in enumerate(columnas_config[:j])}
+    config = columnas_config[j]
+    return {
+        nombre: dominio_columna(columnas_config, posiciones[nombre], total, semilla, tamaño_bloque)
+        for nombre in columnas_referidas(config['tipo'], config['opciones']) if nombre in posiciones
+    }
+
+
+def generar_bloque(columnas_config, bloque, n, semilla, fila_inicial=0, total=None, tamaño_bloque=None):
+    """Genera el bloque número `bloque` (n filas desde fila_inicial) con los substreams de la semilla.
+
+    `total` es la cantidad de filas del dataset (por defecto, hasta el final de este bloque) y
+    `tamaño_bloque` el de los bloques del dataset (por defecto, n); definen el dominio de las
+    columnas referidas.
+    """
+    total = fila_inicial + n if total is None else total
+    tamaño_bloque = tamaño_bloque or n
+    columnas = {}
+    for j, config in enumerate(columnas_config):
+        dominios = _dominios_referidos(columnas_config, j, total, semilla, tamaño_bloque)
+        columnas[config['nombre']] = generar_columna(config['tipo'], n, config['opciones'],
+                                                     rng_columna(semilla, bloque, j), dominios, fila_inicial)
+    return pd.DataFrame(columnas)
+
+
+def _generar_bloque(argumentos):
+    return generar_bloque(*argumentos)
+
+
+def _generar_y_preparar(argumentos):
+    preparar, *bloque = argumentos
+    df = generar_bloque(*bloque)
+    return len(df), preparar(df)
+
+
+def _tareas(columnas_config, n, semilla, tamaño_bloque):
+    return (
+        (columnas_config, bloque, min(tamaño_bloque, n - inicio), semilla, inicio, n, tamaño_bloque)
+        for bloque, inicio in enumerate(range(0, n, tamaño_bloque))
+    )
+
+
+def _en_servidor_streamlit():
+    if 'streamlit' not in sys.modules:
+        return False
+    from streamlit import runtime
+    return runtime.exists()
+
+
+def _mapear_en_orden(funcion, tareas, procesos):
+    """Aplica funcion a cada tarea y devuelve los resultados en orden, en paralelo si procesos > 1.
+
+    Se mantienen a lo sumo 2 tareas por trabajador por delante de la que se está consumiendo,
+    para que la memoria siga acotada aunque quien consume sea más lento.
+
+    Desde la CLI o el benchmark los trabajadores son procesos. Dentro de la app son hilos:
+    hacer fork del servidor de Streamlit (que tiene otros hilos con locks tomados) puede
+    dejar procesos bloqueados, y con spawn cada proceso volvería a ejecutar el script de la
+    app. numpy y pyarrow liberan el GIL en la mayor parte del trabajo de cada bloque.
+    """
+    if procesos <= 1:
+        yield from map(funcion, tareas)
+        return
+
+    ejecutor = ThreadPoolExecutor if _en_servidor_streamlit() else ProcessPoolExecutor
+    with ejecutor(max_workers=procesos) as pool:
+        pendientes = deque(pool.submit(funcion, t) for t in islice(tareas, 2 * procesos))
+        while pendientes:
+            resultado = pendientes.popleft().result()
+            pendientes.extend(pool.submit(funcion, t) for t in islice(tareas, 1))
+            yield resultado
+
+
+def generar_bloques(columnas_config, n, semilla=None, tamaño_bloque=TAMAÑO_BLOQUE, procesos=1):
+    """Genera los n registros como una secuencia de DataFrames de a lo sumo tamaño_bloque filas.
+
+    Con la misma semilla y tamaño de bloque el resultado es idéntico con cualquier cantidad
+    de procesos.
+    """
+    semilla = nueva_semilla() if semilla is None else semilla
+    return _mapear_en_orden(_generar_bloque, _tareas(columnas_config, n, semilla, tamaño_bloque), procesos)
+
+
+def generar_archivo(columnas_config, n, ruta, formato, semilla=None, tamaño_bloque=TAMAÑO_BLOQUE, procesos=1,
+                    al_avanzar=None, compresion=None):
+    """Genera n registros directo a un archivo en cualquiera de los formatos de ESCRITORES, por bloques.
+
+    Cada proceso genera y además serializa sus bloques; el proceso principal solo los
+    escribe en orden, así que el archivo es el mismo byte a byte con cualquier cantidad
+    de procesos. Devuelve las filas escritas.
+    """
+    semilla = nueva_semilla() if semilla is None else semilla
+    preparar = ESCRITORES[formato].preparar
+    tareas = ((preparar,) + t for t in _tareas(columnas_config, n, semilla, tamaño_bloque))
+    return escribir_preparados(_mapear_en_orden(_generar_y_preparar, tareas, procesos), ruta, formato, al_avanzar,
+                               compresion)
+
+
+def generar_datos(columnas_config, n, semilla=None, procesos=1):
+    """Arma un DataFrame de n filas a partir de la configuración de columnas de la interfaz.
+
+    Se genera por bloques igual que al escribir a archivo, así la misma semilla da los
+    mismos datos en memoria y en archivo.
+    """
+    bloques = list(generar_bloques(columnas_config, n, semilla, procesos=procesos))
+    if not bloques:
+        return pd.DataFrame(columns=[config['nombre'] for config in columnas_config])
+    return bloques[0] if len(bloques) == 1 else pd.concat(bloques, ignore_index=True)
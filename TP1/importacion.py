@@ -0,0 +1,368 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # sin pyarrow se lee siempre con el motor de pandas y solo CSV o Excel
+    pa = None
+
+try:
+    import openpyxl
+except ImportError:  # sin openpyxl no se importa Excel
+    openpyxl = None
+
+# ==============================
+# IMPORTACIÓN OPTIMIZADA
+# ==============================
+# Los tipos se deciden con una muestra del principio del archivo y después se aplican a
+# cada bloque a medida que se lee, así nunca está todo el archivo cargado con tipos pesados.
+# Parquet y Feather ya traen sus tipos, pero igual se compactan (enteros, categorías).
+
+FILAS_MUESTRA = 10_000
+# Filas por bloque con el motor de pandas y bytes por bloque con el de pyarrow
+FILAS_BLOQUE = 200_000
+BYTES_BLOQUE = 16 * 1024 ** 2
+
+# Una columna de texto pasa a categoría si tiene pocos valores distintos
+MAX_CATEGORIAS = 1_000
+MAX_PROPORCION_CATEGORIAS = 0.5
+
+# Formatos de fecha que se reconocen (se prueba en este orden)
+FORMATOS_FECHA = ['ISO8601', '%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S']
+
+MOTORES = ['pandas'] + (['pyarrow'] if pa is not None else [])
+
+# Formato de cada extensión que se puede importar en este entorno
+FORMATOS_IMPORTACION = {'.csv': 'CSV', '.json': 'JSON', '.jsonl': 'JSON Lines'}
+if pa is not None:
+    FORMATOS_IMPORTACION.update({'.parquet': 'Parquet', '.feather': 'Feather', '.arrow': 'Feather'})
+if openpyxl is not None:
+    FORMATOS_IMPORTACION['.xlsx'] = 'Excel'
+
+
+def _a_fecha(serie):
+    """Convierte una columna de texto a fechas con el primer formato que sirva para todos los valores"""
+    for formato in FORMATOS_FECHA:
+        try:
+            return pd.to_datetime(serie, format=formato)
+        except (ValueError, TypeError):
+            continue
+    raise ValueError("La columna no tiene fechas en un formato conocido")
+
+
+def inferir_tipos(muestra):
+    """Tipo compacto de cada columna de la muestra: entero, decimal, booleano, fecha, categoria o texto"""
+    tipos = {}
+    for columna in muestra.columns:
+        serie = muestra[columna]
+        if pd.api.types.is_bool_dtype(serie):
+            tipos[columna] = 'booleano'
+        elif pd.api.types.is_integer_dtype(serie):
+            tipos[columna] = 'entero'
+        elif pd.api.types.is_float_dtype(serie):
+            tipos[columna] = 'decimal'
+        else:
+            valores = serie.dropna()
+            try:
+                _a_fecha(valores)
+                tipos[columna] = 'fecha' if len(valores) else 'texto'
+            except ValueError:
+                limite = min(MAX_CATEGORIAS, MAX_PROPORCION_CATEGORIAS * len(valores))
+                tipos[columna] = 'categoria' if valores.nunique() <= limite else 'texto'
+    return tipos
+
+
+def compactar(df, tipos):
+    """Aplica a un bloque los tipos inferidos: enteros y decimales reducidos, fechas y categorías.
+
+    Si un bloque no respeta el tipo de la muestra (por ejemplo, aparece texto en una columna
+    numérica), esa columna queda como se leyó en ese bloque.
+    """
+    for columna, tipo in tipos.items():
+        serie = df[columna]
+        try:
+            if tipo == 'entero':
+                df[columna] = pd.to_numeric(serie, downcast='integer')
+            elif tipo == 'decimal':
+                df[columna] = pd.to_numeric(serie, downcast='float')
+            elif tipo == 'fecha':
+                df[columna] = _a_fecha(serie)
+            elif tipo == 'categoria':
+                df[columna] = serie.astype('category')
+        except (ValueError, TypeError):
+            continue
+    return df
+
+
+def unir_bloques(bloques):
+    """Une los bloques leídos; las columnas categóricas se unen sin pasar por texto"""
+    if len(bloques) == 1:
+        return bloques[0]
+    columnas = {}
+    for columna in bloques[0].columns:
+        partes = [bloque[columna] for bloque in bloques]
+        if all(isinstance(parte.dtype, pd.CategoricalDtype) for parte in partes):
+            columnas[columna] = pd.Series(union_categoricals(partes), name=columna)
+        else:
+            columnas[columna] = pd.concat(partes, ignore_index=True)
+    return pd.DataFrame(columnas)
+
+
+def _tipo_arrow(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(dtype):
+        return pa.int64()
+    if pd.api.types.is_float_dtype(dtype):
+        return pa.float64()
+    return pa.string()
+
+
+def _bloques_pyarrow(archivo, muestra):
+    """Lee el CSV en bloques con el lector en streaming de pyarrow (multihilo).
+
+    Los tipos de las columnas se fijan con la muestra para que todos los bloques coincidan,
+    y solo se leen las columnas de la muestra.
+    """
+    opciones = pa_csv.ConvertOptions(
+        column_types={columna: _tipo_arrow(dtype) for columna, dtype in muestra.dtypes.items()},
+        include_columns=list(muestra.columns),
+        strings_can_be_null=True
+    )
+    lector = pa_csv.open_csv(archivo, read_options=pa_csv.ReadOptions(block_size=BYTES_BLOQUE),
+                             convert_options=opciones)
+    for lote in lector:
+        yield lote.to_pandas()
+
+
+# Nombre con el que pandas guarda en Parquet/Feather un índice sin nombre
+COLUMNA_INDICE = re.compile(r'__index_level_\d+__')
+
+
+def _indices_guardados(esquema):
+    """Índices con nombre que pandas guardó en un Parquet o Feather, en orden.
+
+    Devuelve {nombre: None} para los guardados como columna y {nombre: (inicio, paso)} para
+    los rangos, que solo están en los metadatos. Los índices sin nombre no se cuentan.
+    """
+    indices = {}
+    for indice in (esquema.pandas_metadata or {}).get('index_columns', []):
+        if isinstance(indice, dict):
+            if indice.get('kind') == 'range' and indice.get('name') is not None:
+                indices[indice['name']] = (indice['start'], indice['step'])
+        elif not COLUMNA_INDICE.fullmatch(indice):
+            indices[indice] = None
+    return indices
+
+
+def _columnas_esquema(esquema):
+    """Columnas de un Parquet o Feather: los índices con nombre primero, como con reset_index"""
+    indices = _indices_guardados(esquema)
+    return list(indices) + [columna for columna in esquema.names
+                            if columna not in indices and not COLUMNA_INDICE.fullmatch(columna)]
+
+
+def _columnas_fisicas(esquema, columnas):
+    """Las columnas pedidas que están guardadas en el archivo (un índice rango no lo está)"""
+    return None if columnas is None else [columna for columna in columnas if columna in esquema.names]
+
+
+def _a_pandas(tabla, indices, columnas=None, fila_inicial=0):
+    """Tabla o lote de Arrow a DataFrame con índice 0..n-1.
+
+    Los índices con nombre guardados en el archivo (`indices`, ver _indices_guardados)
+    vuelven a ser columnas, así se ven en el editor y se exportan; los sin nombre se
+    descartan. `fila_inicial` es la posición del lote en el archivo, para los rangos.
+    """
+    df = tabla.to_pandas()
+    niveles = {nombre: df.index.get_level_values(nombre) for nombre in df.index.names if nombre in indices}
+    df = df.reset_index(drop=True)
+    pedidos = [nombre for nombre in indices if columnas is None or nombre in columnas]
+    for posicion, nombre in enumerate(pedidos):
+        if nombre in niveles:
+            df.insert(posicion, nombre, niveles[nombre])
+        elif indices[nombre] is not None and nombre not in df.columns:
+            inicio, paso = indices[nombre]
+            df.insert(posicion, nombre, inicio + paso * (fila_inicial + np.arange(len(df), dtype=np.int64)))
+    return df
+
+
+def _leer_partes(bloques, tipos, al_avanzar):
+    """Compacta cada bloque a medida que llega; `bloques` da pares (DataFrame, fracción leída)"""
+    partes = []
+    for bloque, fraccion in bloques:
+        partes.append(compactar(bloque, tipos))
+        if al_avanzar is not None:
+            al_avanzar(min(fraccion, 1.0))
+    return partes
+
+
+def _resultado(partes, muestra):
+    """Une los bloques y calcula la memoria estimada sin optimizar y la memoria final, en bytes"""
+    df = unir_bloques(partes) if partes else muestra
+    # La memoria sin optimizar se estima con la muestra leída con los tipos por defecto
+    memoria_por_fila = muestra.memory_usage(deep=True, index=False).sum() / max(len(muestra), 1)
+    memoria = {
+        'sin_optimizar': float(memoria_por_fila * len(df)),
+        'final': float(df.memory_usage(deep=True, index=False).sum()),
+    }
+    return df, memoria
+
+
+def leer_csv(archivo, optimizar=True, motor='pandas', al_avanzar=None, columnas=None):
+    """Lee un CSV (archivo binario con seek) en bloques, compactando los tipos de cada bloque.
+
+    `columnas` limita la lectura a esas columnas (None lee todas). `al_avanzar(fraccion)`
+    recibe la fracción del archivo leída. Devuelve el DataFrame y un dict con la memoria
+    estimada sin optimizar y la memoria final, en bytes.
+    """
+    archivo.seek(0, 2)
+    tamaño = archivo.tell() or 1
+    archivo.seek(0)
+    muestra = pd.read_csv(archivo, nrows=FILAS_MUESTRA, usecols=columnas)
+    archivo.seek(0)
+    tipos = inferir_tipos(muestra) if optimizar else {}
+
+    def con_avance(bloques):
+        return ((bloque, archivo.tell() / tamaño) for bloque in bloques)
+
+    partes = None
+    if motor == 'pyarrow' and pa is not None:
+        try:
+            partes = _leer_partes(con_avance(_bloques_pyarrow(archivo, muestra)), tipos, al_avanzar)
+        except pa.ArrowInvalid:
+            # Más adelante en el archivo hay valores que no respetan los tipos de la muestra
+            archivo.seek(0)
+    if partes is None:
+        bloques = pd.read_csv(archivo, chunksize=FILAS_BLOQUE, usecols=columnas)
+        partes = _leer_partes(con_avance(bloques), tipos, al_avanzar)
+    return _resultado(partes, muestra)
+
+
+def leer_parquet(archivo, optimizar=True, al_avanzar=None, columnas=None):
+    """Lee un Parquet por lotes, solo con las columnas pedidas (no lee las demás del disco)"""
+    parquet = pq.ParquetFile(archivo)
+    total = parquet.metadata.num_rows or 1
+    esquema = parquet.schema_arrow
+    indices = _indices_guardados(esquema)
+    fisicas = _columnas_fisicas(esquema, columnas)
+    muestra = next(parquet.iter_batches(batch_size=FILAS_MUESTRA, columns=fisicas), None)
+    if muestra is None:
+        muestra = esquema.empty_table().select(esquema.names if fisicas is None else fisicas)
+    muestra = _a_pandas(muestra, indices, columnas)
+    tipos = inferir_tipos(muestra) if optimizar else {}
+
+    def bloques():
+        leidas = 0
+        for lote in parquet.iter_batches(batch_size=FILAS_BLOQUE, columns=fisicas):
+            yield _a_pandas(lote, indices, columnas, leidas), (leidas + lote.num_rows) / total
+            leidas += lote.num_rows
+
+    return _resultado(_leer_partes(bloques(), tipos, al_avanzar), muestra)
+
+
+def leer_feather(archivo, optimizar=True, al_avanzar=None, columnas=None):
+    """Lee un Feather v2 / Arrow IPC por record batches, solo con las columnas pedidas"""
+    lector = pa.ipc.open_file(archivo)
+    indices = _indices_guardados(lector.schema)
+    fisicas = _columnas_fisicas(lector.schema, columnas)
+
+    def lote(i):
+        lote = lector.get_batch(i)
+        return lote.select(fisicas) if fisicas is not None else lote
+
+    cantidad = lector.num_record_batches
+    if cantidad:
+        muestra = _a_pandas(lote(0).slice(0, FILAS_MUESTRA), indices, columnas)
+    else:
+        muestra = lector.schema.empty_table().select(lector.schema.names if fisicas is None else fisicas)
+        muestra = _a_pandas(muestra, indices, columnas)
+    tipos = inferir_tipos(muestra) if optimizar else {}
+
+    def bloques():
+        leidas = 0
+        for i in range(cantidad):
+            actual = lote(i)
+            yield _a_pandas(actual, indices, columnas, leidas), (i + 1) / cantidad
+            leidas += actual.num_rows
+
+    return _resultado(_leer_partes(bloques(), tipos, al_avanzar), muestra)
+
+
+def leer_json(archivo, optimizar=True, al_avanzar=None, columnas=None, lineas=True):
+    """Lee JSON Lines por bloques de filas, o una lista JSON de registros de una vez"""
+    archivo.seek(0, 2)
+    tamaño = archivo.tell() or 1
+    archivo.seek(0)
+    if lineas:
+        muestra = pd.read_json(archivo, lines=True, nrows=FILAS_MUESTRA, precise_float=True)
+        archivo.seek(0)
+        bloques = pd.read_json(archivo, lines=True, chunksize=FILAS_BLOQUE, precise_float=True)
+    else:
+        df = pd.read_json(archivo, orient='records', precise_float=True)
+        muestra, bloques = df.head(FILAS_MUESTRA), [df]
+    if columnas is not None:
+        muestra = muestra[columnas]
+        bloques = (bloque[columnas] for bloque in bloques)
+    tipos = inferir_tipos(muestra) if optimizar else {}
+    bloques = ((bloque, archivo.tell() / tamaño) for bloque in bloques)
+    return _resultado(_leer_partes(bloques, tipos, al_avanzar), muestra)
+
+
+def leer_excel(archivo, optimizar=True, al_avanzar=None, columnas=None):
+    """Lee la primera hoja de un .xlsx (openpyxl no permite leerla por bloques)"""
+    df = pd.read_excel(archivo, usecols=columnas, engine='openpyxl')
+    muestra = df.head(FILAS_MUESTRA)
+    tipos = inferir_tipos(muestra) if optimizar else {}
+    return _resultado(_leer_partes([(df, 1.0)], tipos, al_avanzar), muestra)
+
+
+def formato_archivo(nombre):
+    """Formato de importación según la extensión del nombre del archivo"""
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension not in FORMATOS_IMPORTACION:
+        raise ValueError(f"Formato no soportado: {extension or nombre}")
+    return FORMATOS_IMPORTACION[extension]
+
+
+def columnas_archivo(archivo, formato):
+    """Nombres de las columnas del archivo, leyendo solo el encabezado o el esquema.
+
+    En Parquet y Feather un índice guardado con nombre es una columna más.
+    """
+    archivo.seek(0)
+    if formato == 'Parquet':
+        columnas = _columnas_esquema(pq.read_schema(archivo))
+    elif formato == 'Feather':
+        columnas = _columnas_esquema(pa.ipc.open_file(archivo).schema)
+    elif formato == 'Excel':
+        columnas = list(pd.read_excel(archivo, nrows=0, engine='openpyxl').columns)
+    elif formato == 'JSON Lines':
+        columnas = list(pd.read_json(archivo, lines=True, nrows=1).columns)
+    elif formato == 'JSON':
+        # Una lista JSON no se puede leer a medias: se lee entera
+        columnas = list(pd.read_json(archivo, orient='records').columns)
+    else:
+        columnas = list(pd.read_csv(archivo, nrows=0).columns)
+    archivo.seek(0)
+    return columnas
+
+
+def leer_archivo(archivo, formato, columnas=None, optimizar=True, motor='pandas', al_avanzar=None):
+    """Lee un archivo CSV, JSON, JSON Lines, Parquet, Feather o Excel con las columnas pedidas (None: todas).
+
+    El motor solo se usa para CSV. Devuelve lo mismo que leer_csv.
+    """
+    archivo.seek(0)
+    if formato == 'CSV':
+        return leer_csv(archivo, optimizar, motor, al_avanzar, columnas)
+    if formato in ('JSON', 'JSON Lines'):
+        return leer_json(archivo, optimizar, al_avanzar, columnas, lineas=formato == 'JSON Lines')
+    lectores = {'Parquet': leer_parquet, 'Feather': leer_feather, 'Excel': leer_excel}
+    return lectores[formato](archivo, optimizar, al_avanzar, columnas)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de la app se importan como en app.py, desde el directorio de TP1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
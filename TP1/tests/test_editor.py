@@ -0,0 +1,19 @@
+import pandas as pd
+
+from editor import CambiosTabla
+
+
+def test_filas_nuevas_con_indice_que_no_empieza_en_cero():
+    base = pd.DataFrame({'x': [0, 1, 2, 3, 4]}, index=range(3, 8))
+    cambios = CambiosTabla(base)
+    nueva = cambios.agregar({'x': 99})
+    assert nueva not in base.index
+
+    ids = cambios.ids(base)
+    assert list(ids) == [3, 4, 5, 6, 7, nueva]
+    assert cambios.filas(base, ids)['x'].tolist() == [0, 1, 2, 3, 4, 99]
+
+    cambios.editar(5, 'x', 20)
+    cambios.editar(nueva, 'x', 100)
+    assert cambios.filas(base, [5, nueva])['x'].tolist() == [20, 100]
+    assert cambios.aplicar(base)['x'].tolist() == [0, 1, 20, 3, 4, 100]
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from generadores import TIPOS_DATO, generar_bloques
+
+REFERENCIABLES = [tipo for tipo in TIPOS_DATO if tipo != "Referencia a Columna"]
+
+
+def _generar(columnas_config, filas, tamaño_bloque):
+    return pd.concat(generar_bloques(columnas_config, filas, 7, tamaño_bloque=tamaño_bloque), ignore_index=True)
+
+
+@pytest.mark.parametrize('tipo', REFERENCIABLES)
+@pytest.mark.parametrize('filas', [1, 50, 5_000, 12_345])
+@pytest.mark.parametrize('exponente', [0.0, 1.1])
+def test_referencias_existen_en_la_columna_referida(tipo, filas, exponente):
+    columnas_config = [
+        {'nombre': 'base', 'tipo': tipo, 'opciones': {}},
+        {'nombre': 'ref', 'tipo': "Referencia a Columna", 'opciones': {'columna': 'base', 'exponente': exponente}},
+    ]
+    df = _generar(columnas_config, filas, 4_000)
+    assert df['ref'].isin(df['base']).all()
+
+
+def test_referencias_encadenadas():
+    columnas_config = [
+        {'nombre': 'base', 'tipo': "Nombres", 'opciones': {}},
+        {'nombre': 'ref', 'tipo': "Referencia a Columna", 'opciones': {'columna': 'base', 'exponente': 1.1}},
+        {'nombre': 'ref2', 'tipo': "Referencia a Columna", 'opciones': {'columna': 'ref'}},
+    ]
+    df = _generar(columnas_config, 9_000, 2_000)
+    assert df['ref'].isin(df['base']).all()
+    assert df['ref2'].isin(df['ref']).all()
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import importacion
+from exportacion import exportar_dataframe
+from importacion import columnas_archivo, leer_archivo
+
+ESCRITORES = [
+    ('Parquet', lambda df, ruta: df.to_parquet(ruta)),
+    ('Feather', lambda df, ruta: df.to_feather(ruta)),
+]
+ORIGINAL = {'id': [10, 20, 30, 40, 50], 'x': [1, 2, 3, 4, 5], 'y': ['a', 'b', 'c', 'd', 'e']}
+
+
+def _leer(ruta, formato, columnas=None):
+    with open(ruta, 'rb') as archivo:
+        return columnas_archivo(archivo, formato), leer_archivo(archivo, formato, columnas)[0]
+
+
+@pytest.mark.parametrize('formato, escribir', ESCRITORES)
+@pytest.mark.parametrize('indice', [ORIGINAL['id'], [50, 10, 40, 20, 30]], ids=['rango', 'columna'])
+def test_indice_con_nombre_vuelve_como_columna(tmp_path, monkeypatch, formato, escribir, indice):
+    # Bloques chicos: los valores de un índice rango dependen de la posición de cada lote
+    monkeypatch.setattr(importacion, 'FILAS_BLOQUE', 2)
+    original = pd.DataFrame({**ORIGINAL, 'id': indice})
+    ruta = tmp_path / 'indexado'
+    escribir(original.set_index('id'), ruta)
+
+    columnas, df = _leer(ruta, formato)
+    assert columnas == ['id', 'x', 'y']
+    assert list(df.index) == [0, 1, 2, 3, 4]
+
+    salida = tmp_path / 'salida.csv'
+    exportar_dataframe(df, str(salida), 'CSV')
+    assert pd.read_csv(salida).to_dict('list') == original.to_dict('list')
+
+
+@pytest.mark.parametrize('formato, escribir', ESCRITORES)
+def test_columnas_pedidas_con_indice(tmp_path, formato, escribir):
+    ruta = tmp_path / 'indexado'
+    escribir(pd.DataFrame(ORIGINAL).set_index('id'), ruta)
+    assert list(_leer(ruta, formato, ['x'])[1].columns) == ['x']
+    assert _leer(ruta, formato, ['y', 'id'])[1].to_dict('list') == {'id': ORIGINAL['id'], 'y': ORIGINAL['y']}
+
+
+def test_indice_sin_nombre_se_descarta(tmp_path):
+    ruta = tmp_path / 'filtrado.parquet'
+    pd.DataFrame(ORIGINAL).iloc[[4, 0]].to_parquet(ruta)
+    columnas, df = _leer(ruta, 'Parquet')
+    assert columnas == ['id', 'x', 'y']
+    assert list(df.columns) == ['id', 'x', 'y']
+    assert list(df.index) == [0, 1]
@@ -1,12 +1,50 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.metrics import confusion_matrix, accuracy_score, precision_score, recall_score
 import io
+import os
 import seaborn as sns
+import sklearn
+from busqueda import ESTIMADORES, FOLDS, METODOS, buscar_mejor_modelo
+from datos import FORMATOS, formato_archivo, leer_clientes
+from modelo import HIPERPARAMETROS, entrenar, hash_bytes, preprocesar
+from puntuacion import FORMATOS_SALIDA, primeras_filas_parquet, puntuar_en_cache, ruta_puntuacion
+from registro import cargar_modelo, fijar_modelo, guardar_modelo, listar_modelos, mapeos_distintos, modelo_fijado
+
+# ==============================
+# CACHÉ DEL PIPELINE
+# ==============================
+# La lectura del archivo, el preprocesamiento y el entrenamiento se hacen una vez por archivo
+# (según el hash de su contenido) e hiperparámetros, no en cada interacción con la página.
+
+@st.cache_data(max_entries=10, show_spinner="Leyendo y preparando los datos...")
+def cargar_datos(hash_archivo, formato, _archivo):
+    """Lee y preprocesa el archivo subido; se cachea por el hash de su contenido.
+
+    Un Excel además se guarda como Parquet en disco (ver datos.leer_clientes), así después
+    de reiniciar la app o vaciar esta caché no se vuelve a leer con openpyxl.
+    """
+    return preprocesar(leer_clientes(_archivo, formato, hash_archivo))
+
+
+# cache_resource: el modelo se comparte entre reruns y sesiones sin copiarlo
+@st.cache_resource(max_entries=20, show_spinner="Entrenando el modelo...")
+def obtener_modelo(hash_archivo, hiperparametros, _df):
+    """Modelo entrenado y sus métricas para un archivo e hiperparámetros"""
+    return entrenar(_df, dict(hiperparametros))
+
+
+@st.cache_resource(max_entries=10, show_spinner="Buscando el mejor modelo con validación cruzada...")
+def obtener_mejor_modelo(hash_archivo, modelos, metodo, folds, _df):
+    """Resultado de la búsqueda de hiperparámetros para un archivo y configuración de búsqueda"""
+    return buscar_mejor_modelo(_df, list(modelos), metodo, folds)
+
+
+@st.cache_resource(max_entries=10, show_spinner="Cargando el modelo guardado...")
+def cargar_del_registro(id_modelo):
+    """Modelo guardado en el registro; un id nunca cambia de contenido"""
+    return cargar_modelo(id_modelo)
+
 
 # Configuración de página
 st.set_page_config(
@@ -105,63 +143,107 @@ with st.sidebar:
     st.markdown("---")
     
     uploaded_file = st.file_uploader(
-        "📁 Sube tu archivo Excel", 
-        type=['xlsx', 'xls'],
-        help="Archivo con datos de clientes y promociones"
+        "📁 Sube tu archivo de clientes",
+        type=[extension.lstrip('.') for extension in FORMATOS],
+        help="Excel, CSV o Parquet con datos de clientes y promociones"
     )
     
     if uploaded_file is not None:
         st.success("✅ Archivo cargado correctamente")
     
+    st.markdown("---")
+    st.markdown("### 💾 Modelos Guardados")
+    if 'modelo_guardado' in st.session_state:
+        st.success(f"✅ Modelo guardado: {st.session_state.pop('modelo_guardado')}")
+    modelos_guardados = {m['id']: m for m in listar_modelos()}
+    fijado = modelo_fijado()
+    usar_registro = st.checkbox(
+        "Usar un modelo guardado",
+        disabled=not modelos_guardados,
+        help="Carga un modelo del registro en lugar de entrenar: por defecto el fijado o, si no hay, el más reciente"
+    )
+    if usar_registro:
+        ids = list(modelos_guardados)
+        id_registro = st.selectbox(
+            "Modelo",
+            ids,
+            index=ids.index(fijado) if fijado in ids else 0,
+            format_func=lambda i: (f"{'📌 ' if i == fijado else ''}{i} · {modelos_guardados[i]['nombre_modelo']} · "
+                                   f"{modelos_guardados[i]['metricas']['accuracy']*100:.1f}%")
+        )
+        if id_registro == fijado:
+            if st.button("Desfijar modelo"):
+                fijar_modelo(None)
+                st.rerun()
+        elif st.button("📌 Fijar este modelo"):
+            fijar_modelo(id_registro)
+            st.rerun()
+
+    st.markdown("---")
+    st.markdown("### ⚙️ Hiperparámetros")
+    buscar = st.checkbox(
+        "🔬 Buscar el mejor modelo",
+        disabled=usar_registro,
+        help="Validación cruzada estratificada sobre varios modelos e hiperparámetros, en paralelo "
+             "con todos los núcleos. Puede tardar varios minutos con archivos grandes."
+    )
+    max_depth = st.slider("Profundidad máxima del árbol", min_value=1, max_value=20,
+                          value=HIPERPARAMETROS['max_depth'], disabled=buscar or usar_registro)
+    if buscar and not usar_registro:
+        modelos_busqueda = st.multiselect("Modelos a comparar", list(ESTIMADORES), default=list(ESTIMADORES))
+        metodo_busqueda = st.radio("Método de búsqueda", list(METODOS))
+        folds = st.slider("Folds de validación cruzada", min_value=3, max_value=10, value=FOLDS)
+        if not modelos_busqueda:
+            st.warning("⚠️ Elige al menos un modelo; se usa el árbol por defecto.")
+            buscar = False
+
     st.markdown("---")
     st.markdown("### 📈 Métricas del Modelo")
 
 # Verificar si hay archivo
 if uploaded_file is None:
-    st.info("👆 Por favor, sube un archivo Excel desde el panel lateral para comenzar el análisis.")
+    st.info("👆 Por favor, sube un archivo Excel, CSV o Parquet desde el panel lateral para comenzar el análisis.")
     st.stop()
 
 # =======================
 # Preprocesamiento
 # =======================
-df = pd.read_excel(uploaded_file)
-
-for col in ['Genero','Recibio_Promo','Monto_Promo','Edad','Ingreso']:
-    if col not in df.columns:
-        df[col] = np.nan
+# El hash del archivo se calcula una sola vez por archivo subido
+if st.session_state.get('archivo_id') != uploaded_file.file_id:
+    st.session_state['archivo_id'] = uploaded_file.file_id
+    st.session_state['archivo_hash'] = hash_bytes(uploaded_file.getvalue())
+hash_archivo = st.session_state['archivo_hash']
 
-# Mapear categorías
-df['Genero'] = df['Genero'].map({'F':0,'M':1,'Femenino':0,'Masculino':1})
-col_name = 'Recibio_Promo' if 'Recibio_Promo' in df.columns else 'Recibió_Promo'
-df['Recibio_Promo'] = df[col_name].map({'Si':1,'No':0,'Sí':1})
-df['Recompra'] = df['Recompra'].map({'Si':1,'No':0,'Sí':1})
-
-# Variables predictoras
-X = df.drop(['Cliente_ID','Recompra'], axis=1)
-y = df['Recompra']
-X = X.fillna(0)
+try:
+    df = cargar_datos(hash_archivo, formato_archivo(uploaded_file.name), uploaded_file)
+except (ValueError, KeyError) as e:
+    st.error(f"❌ No se pudo leer el archivo: {str(e)}")
+    st.stop()
 
 # =======================
 # Entrenamiento del modelo
 # =======================
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-modelo = DecisionTreeClassifier(random_state=42, max_depth=5)
-modelo.fit(X_train, y_train)
-y_pred = modelo.predict(X_test)
+if usar_registro:
+    # Modelo guardado: no se entrena nada
+    resultado = cargar_del_registro(id_registro)
+    clave_modelo = f"registro|{id_registro}"
+elif buscar:
+    # El mejor modelo de la búsqueda reemplaza al árbol por defecto en toda la app
+    busqueda = (tuple(modelos_busqueda), METODOS[metodo_busqueda], folds)
+    resultado = obtener_mejor_modelo(hash_archivo, *busqueda, df)
+    clave_modelo = f"busqueda|{busqueda}"
+else:
+    hiperparametros = {'max_depth': max_depth}
+    resultado = obtener_modelo(hash_archivo, tuple(sorted(hiperparametros.items())), df)
+    clave_modelo = str(sorted(hiperparametros.items()))
+modelo = resultado['modelo']
 
 # Métricas
-accuracy = accuracy_score(y_test, y_pred)
-precision = precision_score(y_test, y_pred)
-recall = recall_score(y_test, y_pred)
-
-conf_matrix = pd.DataFrame(
-    confusion_matrix(y_test, y_pred),
-    index=['No Recompra','Recompra'],
-    columns=['Pred No','Pred Sí']
-)
-importancias = pd.Series(modelo.feature_importances_, index=X.columns).sort_values(ascending=False)
+accuracy = resultado['accuracy']
+precision = resultado['precision']
+recall = resultado['recall']
+conf_matrix = resultado['conf_matrix']
+importancias = resultado['importancias']
 
 # Mostrar métricas en sidebar
 with st.sidebar:
@@ -169,10 +251,25 @@ with st.sidebar:
     st.metric("📊 Exactitud", f"{precision*100:.1f}%")
     st.metric("🔍 Recall", f"{recall*100:.1f}%")
 
+    if usar_registro:
+        metadatos = resultado['metadatos']
+        if metadatos['hash_datos'] != hash_archivo:
+            st.caption("ℹ️ Métricas del entrenamiento guardado, con otro archivo de datos")
+        if mapeos_distintos(resultado):
+            st.caption("ℹ️ El modelo se entrenó con otros mapeos de categorías; se usan esos al puntuar")
+        if metadatos['sklearn'] != sklearn.__version__:
+            st.warning(f"⚠️ Modelo guardado con scikit-learn {metadatos['sklearn']} "
+                       f"(instalado: {sklearn.__version__})")
+    elif st.button("💾 Guardar modelo", help="Lo guarda en el registro para usarlo después sin reentrenar"):
+        # Se vuelve a dibujar la página para que el modelo aparezca en el registro
+        st.session_state['modelo_guardado'] = guardar_modelo(resultado, hash_archivo)
+        st.rerun()
+
 # =======================
 # Tabs principales
 # =======================
-tab1, tab2, tab3 = st.tabs(["📋 Exploración de Datos", "🤖 Modelo Predictivo", "💡 Insights y Recomendaciones"])
+tab1, tab2, tab3, tab4 = st.tabs(["📋 Exploración de Datos", "🤖 Modelo Predictivo", "💡 Insights y Recomendaciones",
+                                  "🎯 Puntuar Clientes"])
 
 # --- Tab 1: Exploración ---
 with tab1:
@@ -235,6 +332,18 @@ with tab1:
 # --- Tab 2: Modelo ---
 with tab2:
     st.subheader("🎯 Rendimiento del Modelo")
+
+    if 'candidatos' in resultado:
+        st.info(
+            f"🔬 Mejor modelo: **{resultado['nombre_modelo']}** "
+            f"({', '.join(f'{k}={v}' for k, v in resultado['hiperparametros'].items())}) · "
+            f"accuracy en validación cruzada {resultado['cv_media']*100:.1f}% ± {resultado['cv_std']*100:.1f}%"
+        )
+        with st.expander("📋 Todos los candidatos de la búsqueda"):
+            st.dataframe(
+                resultado['candidatos'].style.format({'Accuracy CV': '{:.1%}', 'Desvío CV': '{:.1%}'}),
+                use_container_width=True
+            )
     
     col1, col2 = st.columns([1, 1])
     
@@ -403,6 +512,50 @@ with tab3:
     st.markdown("---")
     st.success("✅ Análisis completado. Los insights generados pueden ser utilizados para optimizar estrategias de marketing y aumentar la retención de clientes.")
 
+# --- Tab 4: Puntuación en lote ---
+with tab4:
+    st.subheader("🎯 Probabilidad de Recompra de Nuevos Clientes")
+    st.markdown("Sube una lista de clientes (sin la columna `Recompra`) para ordenarlos según su "
+                "probabilidad de recompra con el modelo actual. El archivo se puntúa por bloques.")
+
+    archivo_clientes = st.file_uploader(
+        "📁 Clientes a puntuar",
+        type=[extension.lstrip('.') for extension in FORMATOS],
+        key="archivo_puntuar"
+    )
+    formato_ranking = st.radio("Formato del ranking", list(FORMATOS_SALIDA.values()), horizontal=True)
+
+    if archivo_clientes is not None:
+        if st.session_state.get('puntuar_id') != archivo_clientes.file_id:
+            st.session_state['puntuar_id'] = archivo_clientes.file_id
+            st.session_state['puntuar_hash'] = hash_bytes(archivo_clientes.getvalue())
+        clave = f"{st.session_state['puntuar_hash']}|{hash_archivo}|{clave_modelo}"
+
+        if st.button("🎯 Puntuar clientes", type="primary"):
+            try:
+                with st.spinner("Puntuando clientes..."):
+                    st.session_state['ranking'] = puntuar_en_cache(
+                        modelo, resultado['columnas'], archivo_clientes,
+                        formato_archivo(archivo_clientes.name), formato_ranking, clave, resultado['mapeos']
+                    )
+            except (ValueError, KeyError) as e:
+                st.error(f"❌ No se pudo puntuar el archivo: {str(e)}")
+
+        ruta_ranking = st.session_state.get('ranking')
+        # Solo se muestra el ranking del archivo, modelo y formato actuales
+        if ruta_ranking and os.path.exists(ruta_ranking) and ruta_ranking == ruta_puntuacion(clave, formato_ranking):
+            vista = (pd.read_csv(ruta_ranking, nrows=10) if formato_ranking == 'CSV'
+                     else primeras_filas_parquet(ruta_ranking, 10))
+            st.markdown("##### 🏆 Clientes con mayor probabilidad de recompra")
+            st.dataframe(vista.style.format({'Probabilidad_Recompra': '{:.1%}'}), use_container_width=True)
+            with open(ruta_ranking, 'rb') as archivo:
+                st.download_button(
+                    label=f"⬇️ Descargar ranking ({formato_ranking})",
+                    data=archivo,
+                    file_name="ranking_recompra" + os.path.splitext(ruta_ranking)[1],
+                    type="primary"
+                )
+
 # Footer
 st.markdown("---")
 st.markdown("""
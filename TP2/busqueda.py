@@ -0,0 +1,93 @@
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (habilita HalvingGridSearchCV)
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+
+from modelo import MAPEOS, evaluar, particion
+
+# ==============================
+# BÚSQUEDA DE HIPERPARÁMETROS
+# ==============================
+# Validación cruzada estratificada sobre la parte de entrenamiento (la prueba del 80/20 queda
+# fuera de la búsqueda), con los folds y candidatos repartidos entre todos los núcleos. El
+# mejor modelo se reentrena con todo el entrenamiento y se evalúa en la prueba como el árbol
+# por defecto, así sus métricas son comparables.
+
+# Estimador y grilla de cada modelo candidato
+ESTIMADORES = {
+    'Árbol de decisión': (
+        lambda: DecisionTreeClassifier(random_state=42),
+        {'max_depth': [3, 5, 8, 12, None], 'min_samples_leaf': [1, 20, 100]},
+    ),
+    'Random Forest': (
+        # n_jobs=1: el paralelismo lo pone la búsqueda, no cada bosque
+        lambda: RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1),
+        {'max_depth': [8, 12, None], 'min_samples_leaf': [1, 20, 100]},
+    ),
+    'Gradient Boosting': (
+        lambda: HistGradientBoostingClassifier(random_state=42),
+        {'learning_rate': [0.05, 0.1], 'max_depth': [3, None], 'min_samples_leaf': [20, 100]},
+    ),
+}
+
+METODOS = {'Grilla completa': 'grilla', 'Successive halving': 'halving'}
+FOLDS = 5
+
+
+def _buscador(estimador, grilla, metodo, folds, n_jobs):
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    if metodo == 'halving':
+        # Descarta candidatos con pocas filas y solo evalúa los mejores con todas
+        return HalvingGridSearchCV(estimador, grilla, cv=cv, scoring='accuracy', factor=3,
+                                   random_state=42, n_jobs=n_jobs)
+    return GridSearchCV(estimador, grilla, cv=cv, scoring='accuracy', n_jobs=n_jobs)
+
+
+def _resultados(nombre, buscador):
+    """Tabla de candidatos de una búsqueda.
+
+    Con halving solo quedan los que llegaron a la última ronda: los descartados antes se
+    evaluaron con menos filas y sus resultados no son comparables.
+    """
+    cv = pd.DataFrame(buscador.cv_results_)
+    if 'iter' in cv.columns:
+        cv = cv[cv['iter'] == cv['iter'].max()]
+    return pd.DataFrame({
+        'Modelo': nombre,
+        'Hiperparámetros': cv['params'].map(lambda p: ', '.join(f"{k}={v}" for k, v in p.items())),
+        'Accuracy CV': cv['mean_test_score'],
+        'Desvío CV': cv['std_test_score'],
+    })
+
+
+def buscar_mejor_modelo(df, modelos=None, metodo='grilla', folds=FOLDS, n_jobs=-1):
+    """Busca el mejor modelo e hiperparámetros por validación cruzada.
+
+    Devuelve lo mismo que modelo.entrenar para el mejor candidato, más el nombre del modelo,
+    su accuracy media y desvío en la validación cruzada y la tabla de todos los candidatos.
+    """
+    modelos = list(ESTIMADORES) if modelos is None else list(modelos)
+    if not modelos:
+        raise ValueError("Elige al menos un modelo para la búsqueda")
+    X_train, X_test, y_train, y_test = particion(df)
+
+    tablas, mejor = [], None
+    for nombre in modelos:
+        crear, grilla = ESTIMADORES[nombre]
+        buscador = _buscador(crear(), grilla, metodo, folds, n_jobs).fit(X_train, y_train)
+        tablas.append(_resultados(nombre, buscador))
+        if mejor is None or buscador.best_score_ > mejor[1].best_score_:
+            mejor = (nombre, buscador)
+
+    nombre, buscador = mejor
+    candidatos = pd.concat(tablas, ignore_index=True).sort_values('Accuracy CV', ascending=False)
+    return {
+        **evaluar(buscador.best_estimator_, X_test, y_test),
+        'hiperparametros': buscador.best_params_,
+        'mapeos': MAPEOS,
+        'nombre_modelo': nombre,
+        'cv_media': buscador.best_score_,
+        'cv_std': buscador.cv_results_['std_test_score'][buscador.best_index_],
+        'candidatos': candidatos.reset_index(drop=True),
+    }
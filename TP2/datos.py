@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+import pandas as pd
+
+# ==============================
+# LECTURA DE ARCHIVOS DE CLIENTES
+# ==============================
+# Leer un Excel con openpyxl es lo más lento de la app. Un Excel se lee una sola vez y se
+# guarda como Parquet (con los tipos de las columnas fijados) en un directorio de caché;
+# las lecturas siguientes del mismo archivo, en esta sesión o en otras, leen el Parquet.
+
+FORMATOS = {'.xlsx': 'Excel', '.xls': 'Excel', '.csv': 'CSV', '.parquet': 'Parquet'}
+
+# Tipos de las columnas conocidas (antes del preprocesamiento); las numéricas que no se
+# puedan convertir quedan como NaN
+TIPOS_COLUMNAS = {
+    'Genero': 'str',
+    'Recibio_Promo': 'str',
+    'Monto_Promo': 'float64',
+    'Edad': 'float64',
+    'Ingreso': 'float64',
+    'Recompra': 'str',
+}
+
+DIRECTORIO_SNAPSHOTS = os.path.join(tempfile.gettempdir(), 'tp2_snapshots')
+MAX_SNAPSHOTS = 20
+
+
+def formato_archivo(nombre):
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {extension or nombre} (se aceptan {', '.join(FORMATOS)})")
+    return FORMATOS[extension]
+
+
+def fijar_tipos(df):
+    """Unifica el nombre de Recibió_Promo y convierte las columnas conocidas a su tipo"""
+    if 'Recibio_Promo' not in df.columns and 'Recibió_Promo' in df.columns:
+        df = df.rename(columns={'Recibió_Promo': 'Recibio_Promo'})
+    for col, tipo in TIPOS_COLUMNAS.items():
+        if col not in df.columns:
+            continue
+        if tipo == 'str':
+            df[col] = df[col].astype('str').where(df[col].notna())
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(tipo)
+    return df
+
+
+def ruta_snapshot(hash_archivo):
+    return os.path.join(DIRECTORIO_SNAPSHOTS, hash_archivo + '.parquet')
+
+
+def _limpiar_snapshots():
+    """Deja solo los MAX_SNAPSHOTS usados más recientemente"""
+    rutas = [os.path.join(DIRECTORIO_SNAPSHOTS, nombre) for nombre in os.listdir(DIRECTORIO_SNAPSHOTS)
+             if nombre.endswith('.parquet')]
+    for ruta in sorted(rutas, key=os.path.getmtime)[:-MAX_SNAPSHOTS]:
+        os.remove(ruta)
+
+
+def _leer_excel(archivo, hash_archivo):
+    """Lee el Excel desde su snapshot Parquet; si no existe, lo lee y lo guarda"""
+    ruta = ruta_snapshot(hash_archivo)
+    if os.path.exists(ruta):
+        os.utime(ruta)
+        return pd.read_parquet(ruta)
+
+    df = fijar_tipos(pd.read_excel(archivo))
+    try:
+        os.makedirs(DIRECTORIO_SNAPSHOTS, exist_ok=True)
+        # Se escribe en un temporal y se renombra: otra sesión nunca ve un Parquet a medias
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        df.to_parquet(temporal, index=False)
+        os.replace(temporal, ruta)
+        _limpiar_snapshots()
+    except (ImportError, OSError):
+        # Sin pyarrow o sin permisos de escritura se sigue sin snapshot
+        pass
+    return df
+
+
+def leer_clientes(archivo, formato, hash_archivo=None):
+    """Lee un archivo de clientes (Excel, CSV o Parquet) con los tipos de TIPOS_COLUMNAS.
+
+    Con `hash_archivo` (ver modelo.hash_bytes) un Excel se guarda como snapshot Parquet.
+    """
+    if formato == 'Excel':
+        if hash_archivo is None:
+            return fijar_tipos(pd.read_excel(archivo))
+        return _leer_excel(archivo, hash_archivo)
+    if formato == 'CSV':
+        try:
+            df = pd.read_csv(archivo, engine='pyarrow')
+        except ImportError:
+            df = pd.read_csv(archivo)
+        return fijar_tipos(df)
+    if formato == 'Parquet':
+        return fijar_tipos(pd.read_parquet(archivo))
+    raise ValueError(f"Formato no soportado: {formato}")
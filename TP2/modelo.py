@@ -0,0 +1,96 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeClassifier
+
+# Columnas que el modelo espera (si faltan se completan con NaN)
+COLUMNAS_ESPERADAS = ['Genero', 'Recibio_Promo', 'Monto_Promo', 'Edad', 'Ingreso']
+
+MAPEO_GENERO = {'F': 0, 'M': 1, 'Femenino': 0, 'Masculino': 1}
+MAPEO_SI_NO = {'Si': 1, 'No': 0, 'Sí': 1}
+# Mapeos con los que se entrena; se guardan con cada modelo para puntuar con los mismos
+MAPEOS = {'Genero': MAPEO_GENERO, 'Si_No': MAPEO_SI_NO}
+
+# Hiperparámetros del árbol por defecto
+HIPERPARAMETROS = {'max_depth': 5}
+
+
+def hash_bytes(datos):
+    """Hash del contenido de un archivo: identifica los datos en las cachés"""
+    return hashlib.sha256(datos).hexdigest()
+
+
+def preprocesar(df, mapeos=None):
+    """Mapea las categorías a 0/1 y agrega las columnas esperadas que falten.
+
+    `mapeos` son los de un modelo guardado (ver registro.py); por defecto, MAPEOS.
+    """
+    mapeos = MAPEOS if mapeos is None else mapeos
+    df = df.copy()
+    for col in COLUMNAS_ESPERADAS:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    df['Genero'] = df['Genero'].map(mapeos['Genero'])
+    col_name = 'Recibio_Promo' if 'Recibio_Promo' in df.columns else 'Recibió_Promo'
+    df['Recibio_Promo'] = df[col_name].map(mapeos['Si_No'])
+    # Un archivo a puntuar no tiene la columna objetivo
+    if 'Recompra' in df.columns:
+        df['Recompra'] = df['Recompra'].map(mapeos['Si_No'])
+    return df
+
+
+def variables_predictoras(df):
+    """Matriz X del modelo: todas las columnas menos el ID y el objetivo, sin nulos"""
+    return df.drop(['Cliente_ID', 'Recompra'], axis=1).fillna(0)
+
+
+def particion(df):
+    """Separa entrenamiento y prueba (80/20 estratificado, siempre la misma partición)"""
+    X = variables_predictoras(df)
+    y = df['Recompra']
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def evaluar(modelo, X_test, y_test):
+    """Métricas, matriz de confusión e importancias de un modelo ya entrenado, sobre la prueba.
+
+    Los modelos sin `feature_importances_` (gradient boosting por histogramas) usan la
+    importancia por permutación.
+    """
+    y_pred = modelo.predict(X_test)
+    conf_matrix = pd.DataFrame(
+        confusion_matrix(y_test, y_pred),
+        index=['No Recompra', 'Recompra'],
+        columns=['Pred No', 'Pred Sí']
+    )
+    if hasattr(modelo, 'feature_importances_'):
+        importancias = modelo.feature_importances_
+    else:
+        importancias = permutation_importance(modelo, X_test, y_test, n_repeats=5, random_state=42).importances_mean
+    return {
+        'modelo': modelo,
+        'columnas': list(X_test.columns),
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'conf_matrix': conf_matrix,
+        'importancias': pd.Series(importancias, index=X_test.columns).sort_values(ascending=False),
+    }
+
+
+def entrenar(df, hiperparametros=None):
+    """Entrena el árbol de decisión con un 80/20 estratificado y calcula sus métricas.
+
+    Devuelve un dict con el modelo, las columnas usadas, las métricas, la matriz de
+    confusión y las importancias de las variables.
+    """
+    hiperparametros = {**HIPERPARAMETROS, **(hiperparametros or {})}
+    X_train, X_test, y_train, y_test = particion(df)
+    modelo = DecisionTreeClassifier(random_state=42, **hiperparametros)
+    modelo.fit(X_train, y_train)
+    return {**evaluar(modelo, X_test, y_test), 'hiperparametros': hiperparametros, 'mapeos': MAPEOS}
@@ -0,0 +1,208 @@
+"""Puntuación en lote: probabilidad de recompra de una lista de clientes, ordenada de mayor a menor.
+
+El archivo de clientes se lee y se puntúa por bloques; de cada bloque solo se guardan el ID
+y la probabilidad, así que se pueden puntuar millones de clientes sin tenerlos en memoria.
+
+Uso como programa (entrena con el archivo histórico y puntúa la lista nueva):
+    python puntuacion.py historico.xlsx clientes.csv ranking.parquet [--max-depth 5] [--bloque 100000] [--guardar]
+o con un modelo del registro, sin entrenar (el fijado o, si no hay, el último; o un id):
+    python puntuacion.py clientes.csv ranking.parquet --modelo [ID]
+
+Uso desde Python:
+    from puntuacion import puntuar_archivo
+    puntuar_archivo(resultado['modelo'], resultado['columnas'], 'clientes.csv', 'ranking.csv',
+                    mapeos=resultado['mapeos'])
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datos import fijar_tipos, formato_archivo, leer_clientes
+from modelo import HIPERPARAMETROS, entrenar, hash_bytes, preprocesar
+from registro import cargar_modelo, guardar_modelo
+
+FILAS_BLOQUE = 100_000
+COLUMNA_ID = 'Cliente_ID'
+FORMATOS_SALIDA = {'.csv': 'CSV', '.parquet': 'Parquet'}
+
+# Rankings ya calculados en la app, para no volver a puntuar en cada rerun
+DIRECTORIO_PUNTUACIONES = os.path.join(tempfile.gettempdir(), 'tp2_puntuaciones')
+MAX_PUNTUACIONES = 20
+
+
+def formato_salida(nombre):
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension not in FORMATOS_SALIDA:
+        raise ValueError(f"Formato de salida no soportado: {extension or nombre} (se aceptan .csv y .parquet)")
+    return FORMATOS_SALIDA[extension]
+
+
+def bloques_clientes(archivo, formato, filas=FILAS_BLOQUE):
+    """Lee un archivo de clientes por bloques de a lo sumo `filas` filas, con los tipos fijados"""
+    if formato == 'CSV':
+        for bloque in pd.read_csv(archivo, chunksize=filas):
+            yield fijar_tipos(bloque)
+    elif formato == 'Parquet':
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(archivo).iter_batches(batch_size=filas):
+            yield fijar_tipos(lote.to_pandas())
+    else:
+        # openpyxl no permite leer por partes: el Excel se lee completo y se recorre por bloques
+        df = leer_clientes(archivo, formato)
+        for inicio in range(0, len(df), filas):
+            yield df.iloc[inicio:inicio + filas]
+
+
+def probabilidades(modelo, columnas, df, mapeos=None):
+    """Probabilidad de recompra de cada fila de un bloque ya leído (sin preprocesar).
+
+    `mapeos` son los que se usaron al entrenar el modelo (por defecto, los actuales).
+    """
+    X = preprocesar(df, mapeos).reindex(columns=columnas).fillna(0)
+    clase_positiva = list(modelo.classes_).index(1)
+    return modelo.predict_proba(X)[:, clase_positiva]
+
+
+def puntuar(modelo, columnas, bloques, mapeos=None):
+    """Puntúa los bloques y devuelve la tabla (ID, probabilidad, ranking) ordenada por probabilidad.
+
+    Si los clientes no tienen columna Cliente_ID se usa su número de fila.
+    """
+    ids, probas = [], []
+    filas = 0
+    for bloque in bloques:
+        if COLUMNA_ID in bloque.columns:
+            ids.append(bloque[COLUMNA_ID].to_numpy())
+        else:
+            ids.append(np.arange(filas, filas + len(bloque)))
+        probas.append(probabilidades(modelo, columnas, bloque, mapeos))
+        filas += len(bloque)
+
+    ids = np.concatenate(ids) if ids else np.array([], dtype='int64')
+    probas = np.concatenate(probas) if probas else np.array([], dtype='float64')
+    # Orden estable: a igual probabilidad se respeta el orden del archivo
+    orden = np.argsort(-probas, kind='stable')
+    return pd.DataFrame({
+        COLUMNA_ID: ids[orden],
+        'Probabilidad_Recompra': probas[orden],
+        'Ranking': np.arange(1, len(orden) + 1),
+    })
+
+
+def escribir_ranking(ranking, destino, formato, filas=FILAS_BLOQUE):
+    """Escribe el ranking por bloques en CSV o Parquet (`destino` es una ruta o un archivo binario)"""
+    if formato == 'Parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tabla = pa.Table.from_pandas(ranking, preserve_index=False)
+        with pq.ParquetWriter(destino, tabla.schema) as escritor:
+            for lote in tabla.to_batches(max_chunksize=filas):
+                escritor.write_batch(lote)
+        return
+    archivo = open(destino, 'wb') if isinstance(destino, str) else destino
+    try:
+        for inicio in range(0, max(len(ranking), 1), filas):
+            texto = ranking.iloc[inicio:inicio + filas].to_csv(index=False, header=inicio == 0)
+            archivo.write(texto.encode('utf-8'))
+    finally:
+        if archivo is not destino:
+            archivo.close()
+
+
+def primeras_filas_parquet(ruta, filas):
+    """Primeras filas de un Parquet, leyendo solo el primer lote (el ranking puede tener millones)"""
+    import pyarrow.parquet as pq
+    archivo = pq.ParquetFile(ruta)
+    lote = next(archivo.iter_batches(batch_size=filas), None)
+    return (lote if lote is not None else archivo.schema_arrow.empty_table()).to_pandas()
+
+
+def puntuar_archivo(modelo, columnas, entrada, salida, formato_entrada=None, formato=None, filas=FILAS_BLOQUE,
+                    mapeos=None):
+    """Puntúa un archivo de clientes y escribe el ranking en `salida`. Devuelve los clientes puntuados.
+
+    `entrada` y `salida` pueden ser rutas o archivos abiertos; con rutas, los formatos que no
+    se indiquen se deducen de la extensión.
+    """
+    formato_entrada = formato_entrada or formato_archivo(entrada)
+    formato = formato or formato_salida(salida)
+    ranking = puntuar(modelo, columnas, bloques_clientes(entrada, formato_entrada, filas), mapeos)
+    escribir_ranking(ranking, salida, formato, filas)
+    return len(ranking)
+
+
+def ruta_puntuacion(clave, formato):
+    nombre = hashlib.sha256(f"{clave}|{formato}".encode('utf-8')).hexdigest()[:32]
+    extension = next(ext for ext, nombre_formato in FORMATOS_SALIDA.items() if nombre_formato == formato)
+    return os.path.join(DIRECTORIO_PUNTUACIONES, nombre + extension)
+
+
+def _limpiar_puntuaciones():
+    """Deja solo los MAX_PUNTUACIONES rankings usados más recientemente"""
+    rutas = [os.path.join(DIRECTORIO_PUNTUACIONES, nombre) for nombre in os.listdir(DIRECTORIO_PUNTUACIONES)
+             if not nombre.endswith('.tmp')]
+    for ruta in sorted(rutas, key=os.path.getmtime)[:-MAX_PUNTUACIONES]:
+        os.remove(ruta)
+
+
+def puntuar_en_cache(modelo, columnas, archivo, formato_entrada, formato, clave, mapeos=None):
+    """Ruta del ranking de `archivo`; se calcula solo si no existe.
+
+    `clave` identifica el archivo y el modelo (por ejemplo, sus hashes e hiperparámetros).
+    """
+    ruta = ruta_puntuacion(clave, formato)
+    if os.path.exists(ruta):
+        os.utime(ruta)
+        return ruta
+    os.makedirs(DIRECTORIO_PUNTUACIONES, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    puntuar_archivo(modelo, columnas, archivo, temporal, formato_entrada, formato, mapeos=mapeos)
+    os.replace(temporal, ruta)
+    _limpiar_puntuaciones()
+    return ruta
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Puntúa una lista de clientes con el modelo de recompra")
+    parser.add_argument('historico', nargs='?',
+                        help="archivo con la columna Recompra para entrenar el modelo (no va con --modelo)")
+    parser.add_argument('clientes', help="archivo de clientes a puntuar (Excel, CSV o Parquet)")
+    parser.add_argument('salida', help="ranking de salida (.csv o .parquet)")
+    parser.add_argument('--max-depth', type=int, default=HIPERPARAMETROS['max_depth'])
+    parser.add_argument('--bloque', type=int, default=FILAS_BLOQUE, help="filas por bloque")
+    parser.add_argument('--modelo', nargs='?', const='', metavar='ID',
+                        help="usar un modelo del registro en lugar de entrenar (sin ID: el fijado o el último)")
+    parser.add_argument('--guardar', action='store_true', help="guardar el modelo entrenado en el registro")
+    args = parser.parse_args(argumentos)
+    if (args.historico is None) == (args.modelo is None):
+        parser.error("indica un archivo histórico para entrenar o --modelo, no ambos")
+
+    inicio = time.perf_counter()
+    try:
+        if args.modelo is not None:
+            resultado = cargar_modelo(args.modelo or None)
+        else:
+            with open(args.historico, 'rb') as f:
+                hash_datos = hash_bytes(f.read())
+            df = preprocesar(leer_clientes(args.historico, formato_archivo(args.historico)))
+            resultado = entrenar(df, {'max_depth': args.max_depth})
+            if args.guardar:
+                print(f"💾 Modelo guardado en el registro: {guardar_modelo(resultado, hash_datos)}")
+        filas = puntuar_archivo(resultado['modelo'], resultado['columnas'], args.clientes, args.salida,
+                                filas=args.bloque, mapeos=resultado['mapeos'])
+    except (ValueError, KeyError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"✅ {filas:,} clientes puntuados → {args.salida} en {time.perf_counter() - inicio:.1f} s "
+          f"(accuracy del modelo {resultado['accuracy'] * 100:.1f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import json
+import os
+import secrets
+from datetime import datetime
+
+import joblib
+import sklearn
+
+from modelo import MAPEOS
+
+# ==============================
+# REGISTRO DE MODELOS
+# ==============================
+# Cada modelo guardado son dos archivos en el directorio del registro:
+#   <id>.joblib  el resultado completo del entrenamiento (modelo, métricas, importancias...)
+#   <id>.json    sus metadatos, para listar el registro sin cargar ningún modelo
+# y `fijado.json` indica el modelo fijado, si lo hay. Sin fijado se usa el más reciente.
+
+DIRECTORIO_REGISTRO = os.environ.get('TP2_MODELOS_DIR',
+                                     os.path.join(os.path.dirname(os.path.abspath(__file__)), '.modelos_recompra'))
+METRICAS = ['accuracy', 'precision', 'recall']
+
+
+def _escribir(ruta, escribir):
+    """Escribe en un temporal y lo renombra: nunca queda un archivo a medias en el registro"""
+    temporal = ruta + '.tmp'
+    escribir(temporal)
+    os.replace(temporal, ruta)
+
+
+def _escribir_json(ruta, datos):
+    def escribir(temporal):
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+    _escribir(ruta, escribir)
+
+
+def guardar_modelo(resultado, hash_datos, directorio=DIRECTORIO_REGISTRO):
+    """Guarda un resultado de modelo.entrenar (o de la búsqueda) y devuelve su id"""
+    os.makedirs(directorio, exist_ok=True)
+    fecha = datetime.now()
+    # El sufijo al azar evita que dos modelos guardados en el mismo segundo se pisen
+    id_modelo = f"{fecha:%Y%m%d_%H%M%S}_{hash_datos[:8]}_{secrets.token_hex(3)}"
+    while os.path.exists(os.path.join(directorio, id_modelo + '.joblib')):
+        id_modelo = f"{fecha:%Y%m%d_%H%M%S}_{hash_datos[:8]}_{secrets.token_hex(3)}"
+    metadatos = {
+        'id': id_modelo,
+        'fecha': fecha.isoformat(timespec='seconds'),
+        'nombre_modelo': resultado.get('nombre_modelo', 'Árbol de decisión'),
+        'hiperparametros': dict(resultado['hiperparametros']),
+        'columnas': resultado['columnas'],
+        'mapeos': resultado.get('mapeos', MAPEOS),
+        'metricas': {metrica: float(resultado[metrica]) for metrica in METRICAS},
+        'hash_datos': hash_datos,
+        'sklearn': sklearn.__version__,
+    }
+    # Primero el modelo: un .json en el registro siempre tiene su .joblib
+    _escribir(os.path.join(directorio, id_modelo + '.joblib'),
+              lambda temporal: joblib.dump({**resultado, 'metadatos': metadatos}, temporal))
+    _escribir_json(os.path.join(directorio, id_modelo + '.json'), metadatos)
+    return id_modelo
+
+
+def listar_modelos(directorio=DIRECTORIO_REGISTRO):
+    """Metadatos de los modelos guardados, del más reciente al más antiguo"""
+    if not os.path.isdir(directorio):
+        return []
+    modelos = []
+    for nombre in os.listdir(directorio):
+        if nombre.endswith('.json') and nombre != 'fijado.json':
+            with open(os.path.join(directorio, nombre), encoding='utf-8') as f:
+                modelos.append(json.load(f))
+    return sorted(modelos, key=lambda m: m['id'], reverse=True)
+
+
+def modelo_fijado(directorio=DIRECTORIO_REGISTRO):
+    """Id del modelo fijado, o None"""
+    ruta = os.path.join(directorio, 'fijado.json')
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        id_modelo = json.load(f)['id']
+    return id_modelo if os.path.exists(os.path.join(directorio, id_modelo + '.joblib')) else None
+
+
+def fijar_modelo(id_modelo, directorio=DIRECTORIO_REGISTRO):
+    """Fija un modelo para que se use en lugar del más reciente (None lo desfija)"""
+    ruta = os.path.join(directorio, 'fijado.json')
+    if id_modelo is None:
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return
+    if not os.path.exists(os.path.join(directorio, id_modelo + '.joblib')):
+        raise ValueError(f"No existe el modelo {id_modelo} en el registro")
+    _escribir_json(ruta, {'id': id_modelo})
+
+
+def resolver_id(id_modelo=None, directorio=DIRECTORIO_REGISTRO):
+    """Id concreto para `id_modelo`: un id, 'fijado', 'ultimo' o None (el fijado o, si no hay, el último)"""
+    if id_modelo in (None, 'fijado'):
+        fijado = modelo_fijado(directorio)
+        if fijado is not None:
+            return fijado
+        if id_modelo == 'fijado':
+            raise ValueError("No hay ningún modelo fijado en el registro")
+        id_modelo = 'ultimo'
+    if id_modelo == 'ultimo':
+        modelos = listar_modelos(directorio)
+        if not modelos:
+            raise ValueError(f"El registro de modelos está vacío ({directorio})")
+        return modelos[0]['id']
+    return id_modelo
+
+
+def cargar_modelo(id_modelo=None, directorio=DIRECTORIO_REGISTRO):
+    """Carga un modelo del registro (ver resolver_id). Devuelve el mismo dict que se guardó.
+
+    Los mapeos de categorías son siempre los guardados con el modelo, aunque los actuales
+    hayan cambiado: así se puntúa con las mismas codificaciones con las que se entrenó.
+    """
+    id_modelo = resolver_id(id_modelo, directorio)
+    ruta = os.path.join(directorio, id_modelo + '.joblib')
+    if not os.path.exists(ruta):
+        raise ValueError(f"No existe el modelo {id_modelo} en el registro")
+    resultado = joblib.load(ruta)
+    # Los modelos guardados antes de registrar los mapeos se entrenaron con los de entonces
+    return {**resultado, 'mapeos': resultado['metadatos'].get('mapeos', MAPEOS)}
+
+
+def mapeos_distintos(resultado):
+    """Indica si un modelo guardado usa mapeos de categorías distintos de los actuales"""
+    return resultado['mapeos'] != MAPEOS
@@ -1,19 +1,60 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
+from bcg import calcular_matriz_bcg
+from fuentes import elegir_fuente
+from graficos import figura_heatmap_media_hora, figura_heatmap_semanas, figura_tendencia
+from ingesta import IngestaVentas
+from procesamiento import (
+    comparar_periodos, filtrar_cubo, perfil_producto, periodo_anterior, posiciones_en, rango_mes, sumar_cubo, DIAS_ORDEN,
+)
 
-# URL del CSV en GitHub
+# URL del CSV en GitHub, usada solo si no hay un archivo local de datos
 DATA_URL = "https://raw.githubusercontent.com/BayaslianSantiago/streamlit-dashboard/refs/heads/main/datos.csv"
+# Carpeta donde se buscan datos.parquet / datos.arrow / datos.csv (se puede cambiar con TP4_DATOS_DIR)
+DATA_DIR = os.environ.get('TP4_DATOS_DIR', os.path.dirname(os.path.abspath(__file__)))
+# Carpeta donde se guardan los modelos de pronóstico ya ajustados
+MODELOS_DIR = os.environ.get('TP4_MODELOS_DIR', os.path.join(DATA_DIR, '.modelos_pronostico'))
+
+# cache_resource comparte la misma ingesta entre reruns y sesiones sin copiar los datos
+@st.cache_resource
+def obtener_ingesta():
+    """Carga los datos (local o GitHub) una sola vez, con columnas temporales y cubo de ventas"""
+    return IngestaVentas(elegir_fuente(DATA_DIR, DATA_URL))
 
-@st.cache_data(ttl=3600)
 def cargar_datos():
-    """Carga los datos desde GitHub y prepara columnas temporales"""
-    df = pd.read_csv(DATA_URL)
-    df['fecha_hora'] = pd.to_datetime(df['fecha_hora'])
-    df = df.sort_values('fecha_hora').reset_index(drop=True)
-    return df
+    """Devuelve datos, cubo e índices, agregando antes las filas nuevas de la fuente (no modificarlos in situ)"""
+    ingesta = obtener_ingesta()
+    ingesta.actualizar()
+    return ingesta.datos
+
+@st.cache_data(max_entries=500)
+def obtener_perfil(producto, periodo, version, _df, _indice_productos, _filas):
+    """Perfil de ventas de un producto en un período; se calcula una vez por versión de los datos"""
+    return perfil_producto(_df, posiciones_en(_indice_productos[producto], _filas))
+
+# Gráficos que se cachean ya construidos, según el tipo
+CONSTRUCTORES_FIGURAS = {
+    'heatmap_media_hora': figura_heatmap_media_hora,
+    'heatmap_semanas': figura_heatmap_semanas,
+    'tendencia': figura_tendencia,
+}
+
+@st.cache_data(max_entries=200)
+def obtener_figura(tipo, clave, version, _datos):
+    """Figura ya construida (y reducida si es una serie larga) para un período o producto y versión de los datos"""
+    return CONSTRUCTORES_FIGURAS[tipo](_datos).to_dict()
+
+@st.cache_data(max_entries=50)
+def obtener_pronosticos(productos, horizonte, version, _df, _indice_productos):
+    """Pronósticos de demanda diaria de varios productos, ajustados en paralelo y cacheados en disco"""
+    # Se importa recién al usar la pestaña de pronóstico para no sumar tiempo al arranque
+    from pronostico import pronosticar_productos, serie_diaria
+    
+    hasta = _df['fecha_hora'].iloc[-1]
+    series = {p: serie_diaria(_df, _indice_productos[p], hasta) for p in productos}
+    return pronosticar_productos(series, horizonte, MODELOS_DIR, version), series
 
 # --- INTERFAZ STREAMLIT ---
 st.set_page_config(page_title="Análisis Fiambrería", page_icon="📊", layout="wide")
@@ -21,7 +62,8 @@ st.title("📊 Dashboard de Ventas - Fiambrería")
 
 # Cargar datos automáticamente
 try:
-    df_limpio = cargar_datos()
+    df_limpio, cubo, indice_meses, indice_productos = cargar_datos()
+    version_datos = (len(df_limpio), df_limpio['fecha_hora'].iloc[-1] if len(df_limpio) else None)
     
     # Mostrar info básica
     col1, col2, col3 = st.columns(3)
@@ -39,15 +81,8 @@ try:
     # --- SELECTOR DE MES ---
     st.subheader("🔍 Selecciona el período a analizar")
     
-    # Preparar datos temporales
-    df_temp = df_limpio.copy()
-    df_temp['hora_num'] = df_temp['fecha_hora'].dt.hour
-    df_temp['minuto'] = df_temp['fecha_hora'].dt.minute
-    df_temp['media_hora'] = df_temp['hora_num'] + (df_temp['minuto'] >= 30).astype(int) * 0.5
-    df_temp['dia_semana'] = df_temp['fecha_hora'].dt.day_name()
-    df_temp['mes_num'] = df_temp['fecha_hora'].dt.month
-    df_temp['año'] = df_temp['fecha_hora'].dt.year
-    df_temp['semana_del_mes'] = ((df_temp['fecha_hora'].dt.day - 1) // 7) + 1
+    # Las columnas temporales ya vienen calculadas desde cargar_datos()
+    df_temp = df_limpio
     
     # Diccionario de meses
     meses_español = {
@@ -61,10 +96,10 @@ try:
         'Thursday': 'Jueves', 'Friday': 'Viernes', 'Saturday': 'Sábado', 'Sunday': 'Domingo'
     }
     
-    dias_orden = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    dias_orden = DIAS_ORDEN
     
     # Obtener meses disponibles con datos
-    meses_con_datos = df_temp.groupby(['año', 'mes_num'])['cantidad'].sum()
+    meses_con_datos = sumar_cubo(cubo, ['año', 'mes_num'])
     meses_con_datos = meses_con_datos[meses_con_datos > 0].reset_index()
     
     # Crear opciones de selección
@@ -82,7 +117,9 @@ try:
     
     # Filtrar datos según selección
     if periodo_seleccionado == '📊 Todos los datos':
-        df_analisis = df_temp.copy()
+        filas_analisis = slice(0, len(df_temp))
+        df_analisis = df_temp
+        cubo_analisis = cubo
         titulo_periodo = "Todo el período"
         mes_num_sel = None
         año_sel = None
@@ -92,21 +129,24 @@ try:
         año_sel = int(partes[1])
         mes_num_sel = [k for k, v in meses_español.items() if v == mes_nombre][0]
         
-        df_analisis = df_temp[(df_temp['mes_num'] == mes_num_sel) & (df_temp['año'] == año_sel)].copy()
+        filas_analisis = indice_meses.get((año_sel, mes_num_sel), slice(0, 0))
+        df_analisis = df_temp.iloc[filas_analisis]
+        cubo_analisis = filtrar_cubo(cubo, año_sel, mes_num_sel)
         titulo_periodo = periodo_seleccionado
     
-    st.info(f"📋 Analizando **{len(df_analisis):,} registros** del período: **{titulo_periodo}**")
+    st.info(f"📋 Analizando **{int(cubo_analisis['registros'].sum()):,} registros** del período: **{titulo_periodo}**")
     
     st.divider()
     
     # --- TABS PRINCIPALES ---
-    if not df_analisis.empty:
+    if not cubo_analisis.empty:
         
-        tab1, tab2, tab3, tab4 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
             "📈 Resumen General", 
             "🔥 Análisis de Horarios", 
             "📊 Análisis de Productos",
-            "🔍 Búsqueda Detallada"
+            "🔍 Búsqueda Detallada",
+            "🔮 Pronóstico de Demanda"
         ])
         
         # ========== TAB 1: RESUMEN GENERAL ==========
@@ -114,12 +154,12 @@ try:
             st.markdown("### 📊 Métricas Principales")
             
             # Métricas clave
-            ventas_hora_dia = df_analisis.groupby(['dia_semana', 'hora_num'])['cantidad'].sum().reset_index()
+            ventas_hora_dia = sumar_cubo(cubo_analisis, ['dia_semana', 'hora_num']).reset_index()
             idx_max = ventas_hora_dia['cantidad'].idxmax()
             hora_pico = int(ventas_hora_dia.loc[idx_max, 'hora_num'])
             dia_pico = dias_español[ventas_hora_dia.loc[idx_max, 'dia_semana']]
             cantidad_pico = int(ventas_hora_dia.loc[idx_max, 'cantidad'])
-            total_vendido = df_analisis['cantidad'].sum()
+            total_vendido = cubo_analisis['cantidad'].sum()
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -135,7 +175,7 @@ try:
             
             # Gráfico de ventas por día
             st.markdown("### 📅 Ventas por Día de la Semana")
-            ventas_por_dia = df_analisis.groupby('dia_semana')['cantidad'].sum().reset_index()
+            ventas_por_dia = sumar_cubo(cubo_analisis, 'dia_semana').reset_index()
             ventas_por_dia['dia_español'] = ventas_por_dia['dia_semana'].map(dias_español)
             ventas_por_dia = ventas_por_dia.set_index('dia_semana').reindex(dias_orden).reset_index()
             
@@ -158,7 +198,7 @@ try:
             
             # Gráfico de ventas por hora
             st.markdown("### 🕐 Ventas por Hora del Día")
-            ventas_por_hora = df_analisis.groupby('hora_num')['cantidad'].sum().reset_index()
+            ventas_por_hora = sumar_cubo(cubo_analisis, 'hora_num').reset_index()
             
             fig_horas = go.Figure(data=[
                 go.Scatter(
@@ -186,34 +226,14 @@ try:
             st.caption("Intensidad de ventas por día de la semana cada 30 minutos")
             
             # Crear matriz por media hora
-            ventas_media_hora = df_analisis.groupby(['dia_semana', 'media_hora'])['cantidad'].sum().reset_index()
+            ventas_media_hora = sumar_cubo(cubo_analisis, ['dia_semana', 'media_hora']).reset_index()
             ventas_matriz_mh = ventas_media_hora.pivot(index='dia_semana', columns='media_hora', values='cantidad').fillna(0)
             
             # Reordenar y traducir
             ventas_matriz_mh = ventas_matriz_mh.reindex([d for d in dias_orden if d in ventas_matriz_mh.index])
             ventas_matriz_mh.index = [dias_español[d] for d in ventas_matriz_mh.index]
             
-            # Crear etiquetas para el eje X
-            etiquetas_horas = [f"{int(h)}:{('00' if h % 1 == 0 else '30')}" for h in ventas_matriz_mh.columns]
-            
-            fig_heatmap_mh = go.Figure(data=go.Heatmap(
-                z=ventas_matriz_mh.values,
-                x=etiquetas_horas,
-                y=ventas_matriz_mh.index,
-                colorscale='YlOrRd',
-                text=ventas_matriz_mh.values.astype(int),
-                texttemplate='%{text}',
-                textfont={"size": 9},
-                colorbar=dict(title="Unidades<br>vendidas")
-            ))
-            
-            fig_heatmap_mh.update_layout(
-                xaxis_title="Hora del Día",
-                yaxis_title="Día de la Semana",
-                height=500,
-                xaxis=dict(tickangle=-45)
-            )
-            
+            fig_heatmap_mh = obtener_figura('heatmap_media_hora', (año_sel, mes_num_sel), version_datos, ventas_matriz_mh)
             st.plotly_chart(fig_heatmap_mh, use_container_width=True)
             
             # Heatmap por semana del mes (solo si es un mes específico)
@@ -221,7 +241,7 @@ try:
                 with st.expander("📅 Ver Heatmap por Semana del Mes", expanded=False):
                     st.caption("Intensidad de ventas por semana y día de la semana")
                     
-                    ventas_semana = df_analisis.groupby(['semana_del_mes', 'dia_semana'])['cantidad'].sum().reset_index()
+                    ventas_semana = sumar_cubo(cubo_analisis, ['semana_del_mes', 'dia_semana']).reset_index()
                     ventas_matriz_sem = ventas_semana.pivot(index='semana_del_mes', columns='dia_semana', values='cantidad').fillna(0)
                     
                     # Reordenar columnas por día de la semana
@@ -232,84 +252,83 @@ try:
                     # Renombrar índice
                     ventas_matriz_sem.index = [f"Semana {int(s)}" for s in ventas_matriz_sem.index]
                     
-                    fig_heatmap_sem = go.Figure(data=go.Heatmap(
-                        z=ventas_matriz_sem.values,
-                        x=ventas_matriz_sem.columns,
-                        y=ventas_matriz_sem.index,
-                        colorscale='Viridis',
-                        text=ventas_matriz_sem.values.astype(int),
-                        texttemplate='%{text}',
-                        textfont={"size": 12},
-                        colorbar=dict(title="Unidades<br>vendidas")
-                    ))
-                    
-                    fig_heatmap_sem.update_layout(
-                        xaxis_title="Día de la Semana",
-                        yaxis_title="Semana del Mes",
-                        height=400
-                    )
-                    
+                    fig_heatmap_sem = obtener_figura('heatmap_semanas', (año_sel, mes_num_sel), version_datos,
+                                                     ventas_matriz_sem)
                     st.plotly_chart(fig_heatmap_sem, use_container_width=True)
         
         # ========== TAB 3: ANÁLISIS DE PRODUCTOS ==========
         with tab3:
             # Calcular datos BCG
-            ventas_por_producto = df_analisis.groupby('producto')['cantidad'].sum().reset_index()
-            ventas_por_producto['participacion'] = (ventas_por_producto['cantidad'] / ventas_por_producto['cantidad'].sum()) * 100
+            ventas_por_producto = sumar_cubo(cubo_analisis, 'producto')
             
-            # Calcular tasa de crecimiento
+            # Calcular tasa de crecimiento según la comparación elegida
             if periodo_seleccionado == '📊 Todos los datos':
-                fecha_mitad = df_analisis['fecha_hora'].min() + (df_analisis['fecha_hora'].max() - df_analisis['fecha_hora'].min()) / 2
-                df_periodo1 = df_analisis[df_analisis['fecha_hora'] < fecha_mitad]
-                df_periodo2 = df_analisis[df_analisis['fecha_hora'] >= fecha_mitad]
-                periodo_comparacion = "Primera mitad vs Segunda mitad"
+                opciones_comparacion = ["Primera mitad vs Segunda mitad", "Último año vs año anterior",
+                                        "Última semana vs semana anterior", "Personalizada"]
             else:
-                mes_actual = mes_num_sel
-                año_actual = año_sel
-                
-                if mes_actual == 1:
-                    mes_anterior = 12
-                    año_anterior = año_actual - 1
-                else:
-                    mes_anterior = mes_actual - 1
-                    año_anterior = año_actual
-                
-                df_periodo1 = df_temp[(df_temp['mes_num'] == mes_anterior) & (df_temp['año'] == año_anterior)]
-                df_periodo2 = df_analisis.copy()
-                mes_ant_nombre = meses_español[mes_anterior]
-                periodo_comparacion = f"{mes_ant_nombre} {año_anterior} vs {titulo_periodo}"
+                opciones_comparacion = ["Mes anterior", "Mismo mes del año anterior",
+                                        "Última semana vs semana anterior", "Personalizada"]
             
-            ventas_p1 = df_periodo1.groupby('producto')['cantidad'].sum()
-            ventas_p2 = df_periodo2.groupby('producto')['cantidad'].sum()
-            
-            crecimiento = pd.DataFrame({
-                'producto': ventas_p2.index,
-                'ventas_periodo1': ventas_p2.index.map(lambda x: ventas_p1.get(x, 0)),
-                'ventas_periodo2': ventas_p2.values
-            })
-            
-            crecimiento['tasa_crecimiento'] = crecimiento.apply(
-                lambda row: ((row['ventas_periodo2'] - row['ventas_periodo1']) / row['ventas_periodo1'] * 100) 
-                if row['ventas_periodo1'] > 0 else 100,
-                axis=1
+            modo_comparacion = st.selectbox(
+                "📐 Calcular crecimiento comparando:",
+                opciones_comparacion,
+                help="Períodos que se comparan para la tasa de crecimiento de la Matriz BCG"
             )
             
-            bcg_data = ventas_por_producto.merge(crecimiento[['producto', 'tasa_crecimiento']], on='producto')
+            fecha_min = df_analisis['fecha_hora'].iloc[0]
+            fecha_max = df_analisis['fecha_hora'].iloc[-1]
+            fin_datos = fecha_max.normalize() + pd.Timedelta(days=1)
             
-            participacion_media = bcg_data['participacion'].median()
-            crecimiento_medio = bcg_data['tasa_crecimiento'].median()
+            def formatear_rango(desde, hasta):
+                return f"{desde:%d/%m/%Y} - {hasta - pd.Timedelta(days=1):%d/%m/%Y}"
             
-            def clasificar_bcg(row):
-                if row['participacion'] >= participacion_media and row['tasa_crecimiento'] >= crecimiento_medio:
-                    return '⭐ Estrella'
-                elif row['participacion'] >= participacion_media and row['tasa_crecimiento'] < crecimiento_medio:
-                    return '🐄 Vaca Lechera'
-                elif row['participacion'] < participacion_media and row['tasa_crecimiento'] >= crecimiento_medio:
-                    return '❓ Interrogante'
+            if modo_comparacion == "Primera mitad vs Segunda mitad":
+                fecha_mitad = fecha_min + (fecha_max - fecha_min) / 2
+                ventas_p1, ventas_p2 = comparar_periodos(df_analisis, (fecha_mitad, fin_datos), (fecha_min, fecha_mitad))
+                periodo_comparacion = "Primera mitad vs Segunda mitad"
+            elif modo_comparacion in ["Mes anterior", "Mismo mes del año anterior"]:
+                modo = 'mes' if modo_comparacion == "Mes anterior" else 'año'
+                desde_anterior, _ = periodo_anterior(*rango_mes(año_sel, mes_num_sel), modo=modo)
+                año_anterior, mes_anterior = desde_anterior.year, desde_anterior.month
+                
+                ventas_p1 = sumar_cubo(filtrar_cubo(cubo, año_anterior, mes_anterior), 'producto')
+                ventas_p2 = sumar_cubo(cubo_analisis, 'producto')
+                mes_ant_nombre = meses_español[mes_anterior]
+                periodo_comparacion = f"{mes_ant_nombre} {año_anterior} vs {titulo_periodo}"
+            else:
+                if modo_comparacion == "Personalizada":
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        rango_actual = st.date_input(
+                            "Período actual:",
+                            value=(fecha_min.date(), fecha_max.date()),
+                            format="DD/MM/YYYY"
+                        )
+                    actual = (pd.Timestamp(rango_actual[0]), pd.Timestamp(rango_actual[-1]) + pd.Timedelta(days=1))
+                    with col2:
+                        sugerido = periodo_anterior(*actual)
+                        rango_anterior = st.date_input(
+                            "Comparar contra:",
+                            value=(sugerido[0].date(), (sugerido[1] - pd.Timedelta(days=1)).date()),
+                            format="DD/MM/YYYY"
+                        )
+                    anterior = (pd.Timestamp(rango_anterior[0]), pd.Timestamp(rango_anterior[-1]) + pd.Timedelta(days=1))
+                elif modo_comparacion == "Último año vs año anterior":
+                    actual = (fin_datos - pd.DateOffset(years=1), fin_datos)
+                    anterior = periodo_anterior(*actual, modo='año')
                 else:
-                    return '🐕 Perro'
+                    actual = (fin_datos - pd.Timedelta(days=7), fin_datos)
+                    anterior = periodo_anterior(*actual)
+                
+                # Las ventanas pueden salir del mes elegido, por eso se cortan sobre todos los datos
+                ventas_p1, ventas_p2 = comparar_periodos(df_temp, actual, anterior)
+                periodo_comparacion = f"{formatear_rango(*anterior)} vs {formatear_rango(*actual)}"
+                
+                if ventas_p2.empty:
+                    st.warning("⚠️ El período actual elegido no tiene ventas; se usa el período analizado completo.")
+                    ventas_p2 = ventas_por_producto
             
-            bcg_data['categoria'] = bcg_data.apply(clasificar_bcg, axis=1)
+            bcg_data, participacion_media, crecimiento_medio = calcular_matriz_bcg(ventas_por_producto, ventas_p1, ventas_p2)
             
             # Subtabs dentro de Análisis de Productos
             subtab1, subtab2, subtab3 = st.tabs(["📊 Matriz BCG", "🏆 Ranking", "📋 Resumen por Categoría"])
@@ -570,7 +589,7 @@ try:
             st.caption("Busca y analiza cualquier producto en detalle")
             
             # Selector de producto
-            productos_disponibles = sorted(df_analisis['producto'].unique())
+            productos_disponibles = sorted(cubo_analisis['producto'].unique())
             producto_seleccionado = st.selectbox(
                 "Selecciona un producto:",
                 productos_disponibles,
@@ -578,11 +597,23 @@ try:
             )
             
             if producto_seleccionado:
-                # Filtrar datos del producto
-                df_producto = df_analisis[df_analisis['producto'] == producto_seleccionado].copy()
-                
-                # Obtener información BCG del producto
-                info_bcg = bcg_data[bcg_data['producto'] == producto_seleccionado].iloc[0]
+                # Perfil del producto precalculado (se cachea por producto, período y versión de los datos)
+                perfil = obtener_perfil(producto_seleccionado, (año_sel, mes_num_sel), version_datos,
+                                        df_limpio, indice_productos, filas_analisis)
+                
+                # Obtener información BCG del producto (puede no estar si no vendió en el período comparado)
+                es_producto = bcg_data['producto'] == producto_seleccionado
+                if es_producto.any():
+                    info_bcg = bcg_data[es_producto].iloc[0]
+                    ranking = bcg_data['cantidad'].rank(ascending=False)[es_producto].values[0]
+                else:
+                    info_bcg = pd.Series({
+                        'categoria': 'Sin comparación',
+                        'cantidad': ventas_por_producto[producto_seleccionado],
+                        'participacion': ventas_por_producto[producto_seleccionado] / ventas_por_producto.sum() * 100,
+                        'tasa_crecimiento': float('nan')
+                    })
+                    ranking = ventas_por_producto.rank(ascending=False)[producto_seleccionado]
                 
                 # Métricas principales del producto
                 st.markdown(f"### 📦 {producto_seleccionado}")
@@ -598,7 +629,6 @@ try:
                 with col4:
                     st.metric("📉 Crecimiento", f"{info_bcg['tasa_crecimiento']:.1f}%")
                 with col5:
-                    ranking = bcg_data['cantidad'].rank(ascending=False)[bcg_data['producto'] == producto_seleccionado].values[0]
                     st.metric("🏆 Ranking", f"#{int(ranking)}")
                 
                 st.divider()
@@ -609,14 +639,12 @@ try:
                 with col1:
                     # Ventas por día de la semana
                     st.markdown("#### 📅 Ventas por Día de la Semana")
-                    ventas_dia = df_producto.groupby('dia_semana')['cantidad'].sum().reset_index()
-                    ventas_dia['dia_semana'] = ventas_dia['dia_semana'].map(dias_español)
-                    ventas_dia = ventas_dia.set_index('dia_semana').reindex([dias_español[d] for d in dias_orden if d in df_producto['dia_semana'].unique()])
+                    ventas_dia = perfil['por_dia']
                     
                     fig_dias = go.Figure(data=[
-                        go.Bar(x=ventas_dia.index, y=ventas_dia['cantidad'].values, 
+                        go.Bar(x=[dias_español[d] for d in ventas_dia.index], y=ventas_dia.values, 
                                marker_color='#1E90FF',
-                               text=ventas_dia['cantidad'].values,
+                               text=ventas_dia.values,
                                textposition='auto')
                     ])
                     fig_dias.update_layout(
@@ -630,10 +658,10 @@ try:
                 with col2:
                     # Ventas por hora
                     st.markdown("#### 🕐 Ventas por Hora del Día")
-                    ventas_hora = df_producto.groupby('hora_num')['cantidad'].sum().reset_index()
+                    ventas_hora = perfil['por_hora']
                     
                     fig_horas = go.Figure(data=[
-                        go.Scatter(x=ventas_hora['hora_num'], y=ventas_hora['cantidad'],
+                        go.Scatter(x=ventas_hora.index, y=ventas_hora.values,
                                   mode='lines+markers',
                                   line=dict(color='#32CD32', width=3),
                                   marker=dict(size=8),
@@ -651,24 +679,9 @@ try:
                 
                 # Tendencia temporal
                 with st.expander("📈 Ver Tendencia de Ventas en el Tiempo", expanded=True):
-                    df_producto_tiempo = df_producto.copy()
-                    df_producto_tiempo['fecha'] = df_producto_tiempo['fecha_hora'].dt.date
-                    ventas_tiempo = df_producto_tiempo.groupby('fecha')['cantidad'].sum().reset_index()
-                    
-                    fig_tendencia = go.Figure(data=[
-                        go.Scatter(x=ventas_tiempo['fecha'], y=ventas_tiempo['cantidad'],
-                                  mode='lines+markers',
-                                  line=dict(color='#FFD700', width=2),
-                                  marker=dict(size=6),
-                                  fill='tozeroy',
-                                  fillcolor='rgba(255,215,0,0.2)')
-                    ])
-                    fig_tendencia.update_layout(
-                        height=300,
-                        xaxis_title="Fecha",
-                        yaxis_title="Unidades Vendidas",
-                        showlegend=False
-                    )
+                    # La serie de todo el período se reduce al ancho del gráfico antes de enviarla
+                    fig_tendencia = obtener_figura('tendencia', (producto_seleccionado, año_sel, mes_num_sel),
+                                                   version_datos, perfil['diario'])
                     st.plotly_chart(fig_tendencia, use_container_width=True)
                 
                 # Estadísticas adicionales
@@ -677,29 +690,88 @@ try:
                     
                     with col1:
                         st.markdown("##### 📊 Estadísticas")
-                        promedio_diario = df_producto_tiempo.groupby('fecha')['cantidad'].sum().mean()
-                        st.write(f"**Promedio diario:** {promedio_diario:.1f} unidades")
-                        st.write(f"**Máximo en un día:** {df_producto_tiempo.groupby('fecha')['cantidad'].sum().max():.0f} unidades")
-                        st.write(f"**Mínimo en un día:** {df_producto_tiempo.groupby('fecha')['cantidad'].sum().min():.0f} unidades")
+                        st.write(f"**Promedio diario:** {perfil['promedio_diario']:.1f} unidades")
+                        st.write(f"**Máximo en un día:** {perfil['maximo_diario']:.0f} unidades")
+                        st.write(f"**Mínimo en un día:** {perfil['minimo_diario']:.0f} unidades")
                     
                     with col2:
                         st.markdown("##### 🕐 Hora Pico")
-                        hora_pico_prod = ventas_hora.loc[ventas_hora['cantidad'].idxmax(), 'hora_num']
-                        cantidad_hora_pico = ventas_hora['cantidad'].max()
-                        st.write(f"**Mejor hora:** {int(hora_pico_prod)}:00 hs")
-                        st.write(f"**Ventas en pico:** {int(cantidad_hora_pico)} unidades")
+                        st.write(f"**Mejor hora:** {perfil['hora_pico']}:00 hs")
+                        st.write(f"**Ventas en pico:** {int(perfil['cantidad_hora_pico'])} unidades")
                     
                     with col3:
                         st.markdown("##### 📅 Día Pico")
-                        dia_pico_prod = ventas_dia.idxmax()
-                        cantidad_dia_pico = ventas_dia.max()
-                        st.write(f"**Mejor día:** {dia_pico_prod}")
-                        st.write(f"**Ventas en pico:** {int(cantidad_dia_pico)} unidades")
+                        st.write(f"**Mejor día:** {dias_español[perfil['dia_pico']]}")
+                        st.write(f"**Ventas en pico:** {int(perfil['cantidad_dia_pico'])} unidades")
+        
+        # ========== TAB 5: PRONÓSTICO DE DEMANDA ==========
+        with tab5:
+            st.markdown("### 🔮 Pronóstico de Demanda por Producto")
+            st.caption("Usa toda la historia de ventas. Los productos con poca historia se pronostican con el promedio de las últimas semanas.")
+            
+            ranking_historico = sumar_cubo(cubo, 'producto').sort_values(ascending=False)
+            
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                productos_pronostico = st.multiselect(
+                    "Productos a pronosticar:",
+                    ranking_historico.index.tolist(),
+                    default=ranking_historico.index[:10].tolist(),
+                    help="Por defecto, los 10 productos más vendidos"
+                )
+            with col2:
+                horizonte = st.slider("Días a pronosticar:", min_value=7, max_value=90, value=30, step=7)
+            
+            pedido = (tuple(productos_pronostico), horizonte)
+            if st.button("🔮 Calcular pronósticos", type="primary", disabled=not productos_pronostico):
+                st.session_state['pronostico_pedido'] = pedido
+            
+            if productos_pronostico and st.session_state.get('pronostico_pedido') == pedido:
+                with st.spinner("Ajustando modelos..."):
+                    pronosticos, series = obtener_pronosticos(pedido[0], horizonte, str(version_datos),
+                                                              df_limpio, indice_productos)
+                
+                resumen_pronostico = pd.DataFrame({
+                    'Producto': list(pronosticos),
+                    'Modelo': [p['modelo'].iloc[0] for p in pronosticos.values()],
+                    f'Unidades próximos {horizonte} días': [int(round(p['yhat'].sum())) for p in pronosticos.values()],
+                    'Promedio diario': [round(p['yhat'].mean(), 1) for p in pronosticos.values()]
+                })
+                st.dataframe(resumen_pronostico, use_container_width=True, hide_index=True)
+                
+                producto_grafico = st.selectbox("Ver pronóstico de:", list(pronosticos))
+                historia = series[producto_grafico].iloc[-90:]
+                pronostico_prod = pronosticos[producto_grafico]
+                
+                fig_pronostico = go.Figure()
+                fig_pronostico.add_trace(go.Scatter(
+                    x=historia.index, y=historia.values, mode='lines',
+                    name='Ventas reales', line=dict(color='#1E90FF', width=2)
+                ))
+                fig_pronostico.add_trace(go.Scatter(
+                    x=pd.concat([pronostico_prod['ds'], pronostico_prod['ds'][::-1]]),
+                    y=pd.concat([pronostico_prod['yhat_upper'], pronostico_prod['yhat_lower'][::-1]]),
+                    fill='toself', fillcolor='rgba(255,165,0,0.2)', line=dict(width=0),
+                    name='Intervalo', hoverinfo='skip'
+                ))
+                fig_pronostico.add_trace(go.Scatter(
+                    x=pronostico_prod['ds'], y=pronostico_prod['yhat'], mode='lines',
+                    name='Pronóstico', line=dict(color='#FF8C00', width=2, dash='dash')
+                ))
+                fig_pronostico.update_layout(
+                    height=400,
+                    xaxis_title="Fecha",
+                    yaxis_title="Unidades",
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02)
+                )
+                st.plotly_chart(fig_pronostico, use_container_width=True)
+            else:
+                st.info("👆 Elige los productos y presiona **Calcular pronósticos**")
         
     else:
         st.warning("⚠️ No hay datos disponibles para el período seleccionado.")
 
 except Exception as e:
     st.error(f"❌ Error al cargar los datos: {e}")
-    st.info("Verifica que la URL del CSV sea correcta y que el archivo esté accesible.")
+    st.info("Verifica que exista un archivo datos.csv / datos.parquet válido o que la URL del CSV esté accesible.")
 
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Categorías BCG en el orden en que se muestran
+CATEGORIAS_BCG = ['⭐ Estrella', '🐄 Vaca Lechera', '❓ Interrogante', '🐕 Perro']
+
+
+def tasa_crecimiento(ventas_p1, ventas_p2):
+    """Crecimiento porcentual por producto entre dos períodos (100% si no vendía antes).
+
+    Ambos argumentos son Series de cantidad vendida indexadas por producto; el resultado
+    tiene el índice de ventas_p2.
+    """
+    anterior = ventas_p1.reindex(ventas_p2.index, fill_value=0).astype('float64')
+    actual = ventas_p2.astype('float64')
+    tasa = (actual - anterior) / anterior.where(anterior > 0) * 100
+    return tasa.where(anterior > 0, 100.0).rename('tasa_crecimiento')
+
+
+def clasificar_bcg(participacion, crecimiento, participacion_media, crecimiento_medio):
+    """Asigna la categoría BCG de cada producto según los cortes por mediana"""
+    alta_participacion = participacion >= participacion_media
+    alto_crecimiento = crecimiento >= crecimiento_medio
+    condiciones = [
+        alta_participacion & alto_crecimiento,
+        alta_participacion & ~alto_crecimiento,
+        ~alta_participacion & alto_crecimiento,
+    ]
+    return np.select(condiciones, CATEGORIAS_BCG[:3], default=CATEGORIAS_BCG[3])
+
+
+def calcular_matriz_bcg(ventas_periodo, ventas_p1, ventas_p2):
+    """Calcula la matriz BCG de los productos comparando dos períodos cualesquiera.
+
+    ventas_periodo define la participación de mercado; ventas_p1 y ventas_p2 son las ventas
+    del período anterior y actual usadas para el crecimiento. Todas son Series indexadas por
+    producto. Devuelve el DataFrame de la matriz y las medianas de participación y crecimiento.
+    """
+    bcg_data = ventas_periodo.rename('cantidad').rename_axis('producto').reset_index()
+    bcg_data['participacion'] = bcg_data['cantidad'] / bcg_data['cantidad'].sum() * 100
+    bcg_data = bcg_data.merge(tasa_crecimiento(ventas_p1, ventas_p2), left_on='producto', right_index=True)
+
+    participacion_media = bcg_data['participacion'].median()
+    crecimiento_medio = bcg_data['tasa_crecimiento'].median()
+    bcg_data['categoria'] = clasificar_bcg(
+        bcg_data['participacion'], bcg_data['tasa_crecimiento'], participacion_media, crecimiento_medio
+    )
+    return bcg_data.reset_index(drop=True), participacion_media, crecimiento_medio
@@ -0,0 +1,238 @@
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # sin pyarrow solo se pueden leer CSV
+    pa = None
+
+# Columnas que usa el dashboard y sus tipos
+COLUMNAS = ['fecha_hora', 'producto', 'cantidad']
+ESQUEMA = {'producto': 'string', 'cantidad': 'int32'}
+
+# Archivos locales que se buscan junto a la app, en orden de preferencia
+# ('datos' es una carpeta de particiones: un archivo por período, que no se modifica)
+ARCHIVOS_LOCALES = ['datos', 'datos.parquet', 'datos.arrow', 'datos.feather', 'datos.csv']
+
+
+def _aplicar_esquema(df):
+    """Deja solo las columnas del dashboard con sus tipos definitivos"""
+    df = df[COLUMNAS].astype(ESQUEMA)
+    df['fecha_hora'] = pd.to_datetime(df['fecha_hora']).astype('datetime64[ns]')
+    return df
+
+
+def leer_csv(ruta):
+    """Lee un CSV (local o URL) proyectando solo las columnas necesarias"""
+    motor = 'pyarrow' if pa is not None else 'c'
+    df = pd.read_csv(ruta, usecols=COLUMNAS, dtype=ESQUEMA, engine=motor)
+    return _aplicar_esquema(df)
+
+
+def leer_parquet(ruta):
+    """Lee un Parquet con memory map y proyección de columnas"""
+    return _aplicar_esquema(pd.read_parquet(ruta, columns=COLUMNAS, memory_map=True))
+
+
+def leer_arrow(ruta):
+    """Lee un archivo Arrow IPC / Feather mapeado en memoria"""
+    with pa.memory_map(ruta) as fuente:
+        tabla = pa.ipc.open_file(fuente).read_all().select(COLUMNAS)
+    return _aplicar_esquema(tabla.to_pandas())
+
+
+# Lector según la extensión del archivo; se pueden registrar formatos nuevos acá
+LECTORES = {
+    '.csv': leer_csv,
+    '.parquet': leer_parquet,
+    '.arrow': leer_arrow,
+    '.feather': leer_arrow,
+    '.ipc': leer_arrow,
+}
+
+
+def extension_archivo(ruta):
+    return os.path.splitext(ruta.split('?')[0])[1].lower()
+
+
+def _columnas_archivo(ruta):
+    """Devuelve los nombres de columna de un archivo local sin leer los datos"""
+    extension = extension_archivo(ruta)
+    if extension == '.csv':
+        with open(ruta, encoding='utf-8', errors='replace') as f:
+            return [c.strip().strip('"') for c in f.readline().split(',')]
+    if pa is None:
+        return []
+    if extension == '.parquet':
+        return pq.read_schema(ruta).names
+    with pa.memory_map(ruta) as fuente:
+        return pa.ipc.open_file(fuente).schema.names
+
+
+def es_fuente_valida(ruta):
+    """Indica si un archivo (o carpeta de particiones) local tiene las columnas del dashboard"""
+    if os.path.isdir(ruta):
+        particiones = listar_particiones(ruta)
+        return bool(particiones) and es_fuente_valida(particiones[0])
+    if not os.path.isfile(ruta) or extension_archivo(ruta) not in LECTORES:
+        return False
+    try:
+        return set(COLUMNAS) <= set(_columnas_archivo(ruta))
+    except (OSError, ValueError):
+        return False
+
+
+def elegir_fuente(directorio, respaldo):
+    """Devuelve el primer archivo local válido del directorio o la fuente de respaldo"""
+    for nombre in ARCHIVOS_LOCALES:
+        ruta = os.path.join(directorio, nombre)
+        if es_fuente_valida(ruta):
+            return ruta
+    return respaldo
+
+
+def ruta_snapshot(ruta):
+    """Ruta del snapshot Parquet asociado a un CSV local"""
+    return os.path.splitext(ruta)[0] + '.snapshot.parquet'
+
+
+# Bytes del CSV que entran en la huella: los primeros datos y los últimos antes de la posición
+BYTES_HUELLA = 4096
+
+
+def huella_csv(ruta, posicion):
+    """Hash del encabezado y de los bytes del CSV al principio y justo antes de `posicion`.
+
+    Si al archivo solo se le agregaron líneas al final la huella no cambia; si se reemplazó
+    por otro (aunque sea más largo), casi seguro que sí.
+    """
+    huella = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        encabezado = f.readline()
+        huella.update(encabezado)
+        inicio = len(encabezado)
+        huella.update(f.read(max(0, min(BYTES_HUELLA, posicion - inicio))))
+        f.seek(max(inicio, posicion - BYTES_HUELLA))
+        huella.update(f.read(max(0, posicion - f.tell())))
+    return huella.hexdigest()
+
+
+def leer_snapshot(ruta):
+    """Lee el snapshot de un CSV local y la posición en bytes del CSV que cubre"""
+    snapshot = ruta_snapshot(ruta)
+    if pa is None or not os.path.exists(snapshot):
+        return None, 0
+    metadata = pq.read_schema(snapshot).metadata or {}
+    posicion = int(metadata.get(b'tp4_posicion', -1))
+    if posicion < 0 or posicion > os.path.getsize(ruta):
+        # El CSV fue reemplazado por uno más corto: el snapshot ya no sirve
+        return None, 0
+    if metadata.get(b'tp4_huella', b'').decode() != huella_csv(ruta, posicion):
+        # El CSV fue reemplazado por otro distinto (aunque sea más largo)
+        return None, 0
+    return leer_parquet(snapshot), posicion
+
+
+def guardar_snapshot(df, ruta, posicion):
+    """Guarda un snapshot Parquet del CSV junto con la posición en bytes leída"""
+    if pa is None:
+        return
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(tabla.schema.metadata or {})
+    metadata[b'tp4_posicion'] = str(posicion).encode()
+    metadata[b'tp4_huella'] = huella_csv(ruta, posicion).encode()
+    temporal = ruta_snapshot(ruta) + '.tmp'
+    pq.write_table(tabla.replace_schema_metadata(metadata), temporal)
+    os.replace(temporal, ruta_snapshot(ruta))
+
+
+def leer_bloque_csv(ruta, inicio=0):
+    """Lee las líneas completas de un CSV local a partir del byte `inicio`.
+
+    Devuelve las filas leídas y la posición en bytes donde termina la última línea
+    completa, para poder seguir leyendo desde ahí cuando el archivo crezca.
+    """
+    with open(ruta, 'rb') as f:
+        encabezado = f.readline()
+        f.seek(max(inicio, len(encabezado)))
+        datos = f.read()
+    fin = len(datos) if inicio == 0 else datos.rfind(b'\n') + 1
+    posicion = max(inicio, len(encabezado)) + fin
+    if not datos[:fin].strip():
+        return _aplicar_esquema(pd.DataFrame(columns=COLUMNAS)), posicion
+
+    motor = 'pyarrow' if pa is not None else 'c'
+    df = pd.read_csv(io.BytesIO(encabezado + datos[:fin]), usecols=COLUMNAS, dtype=ESQUEMA, engine=motor)
+    return _aplicar_esquema(df), posicion
+
+
+def unir_ventas(df, nuevas):
+    """Agrega filas nuevas al final manteniendo el orden por fecha_hora"""
+    if nuevas.empty:
+        return df
+    if not df.empty and nuevas['fecha_hora'].min() < df['fecha_hora'].iloc[-1]:
+        nuevas = pd.concat([df, nuevas], ignore_index=True)
+        return nuevas.sort_values('fecha_hora', kind='stable').reset_index(drop=True)
+    nuevas = nuevas.sort_values('fecha_hora', kind='stable')
+    return pd.concat([df, nuevas], ignore_index=True)
+
+
+def listar_particiones(directorio):
+    """Archivos de datos de una carpeta de particiones, en orden alfabético"""
+    return sorted(
+        os.path.join(directorio, nombre)
+        for nombre in os.listdir(directorio)
+        if extension_archivo(nombre) in LECTORES and not nombre.endswith('.snapshot.parquet')
+    )
+
+
+def leer_desde(ruta, desde):
+    """Lee una fuente y devuelve solo las filas posteriores a `desde`"""
+    if desde is not None and extension_archivo(ruta) == '.parquet':
+        # En Parquet el filtro se aplica al leer y se saltean los row groups viejos
+        filtro = [('fecha_hora', '>', desde)]
+        return _aplicar_esquema(pd.read_parquet(ruta, columns=COLUMNAS, filters=filtro))
+    df = LECTORES[extension_archivo(ruta)](ruta)
+    if desde is not None:
+        df = df[df['fecha_hora'] > desde]
+    return df
+
+
+def cargar_ventas(ruta):
+    """Carga las ventas ordenadas por fecha desde un CSV, Parquet, Arrow o carpeta de particiones.
+
+    Un CSV local se convierte la primera vez a un snapshot Parquet ordenado. En los
+    siguientes arranques se lee el snapshot y solo las líneas agregadas al CSV desde
+    entonces. Devuelve el DataFrame y la posición en bytes leída del CSV (0 si no aplica).
+    """
+    if os.path.isdir(ruta):
+        partes = [LECTORES[extension_archivo(p)](p) for p in listar_particiones(ruta)]
+        df = pd.concat(partes, ignore_index=True) if partes else _aplicar_esquema(pd.DataFrame(columns=COLUMNAS))
+        return df.sort_values('fecha_hora', kind='stable').reset_index(drop=True), 0
+
+    extension = extension_archivo(ruta)
+    if extension not in LECTORES:
+        raise ValueError(f"Formato de datos no soportado: {ruta}")
+
+    if extension != '.csv' or not os.path.isfile(ruta):
+        df = LECTORES[extension](ruta)
+        return df.sort_values('fecha_hora', kind='stable').reset_index(drop=True), 0
+
+    df, posicion = leer_snapshot(ruta)
+    if df is None:
+        df, posicion = leer_bloque_csv(ruta)
+        df = df.sort_values('fecha_hora', kind='stable').reset_index(drop=True)
+        guardar_snapshot(df, ruta, posicion)
+        return df, posicion
+
+    nuevas, nueva_posicion = leer_bloque_csv(ruta, posicion)
+    df = unir_ventas(df, nuevas)
+    # Reescribir el snapshot solo cuando la cola sin snapshot ya es grande
+    if len(nuevas) * 10 >= len(df):
+        guardar_snapshot(df, ruta, nueva_posicion)
+    return df, nueva_posicion
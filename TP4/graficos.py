@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Ancho aproximado en píxeles de un gráfico a lo ancho de la página: no tiene sentido
+# mandar al navegador más de un punto por píxel
+ANCHO_OBJETIVO_PX = 1000
+
+
+def reducir_lttb(x, y, puntos):
+    """Índices de los puntos a conservar según Largest-Triangle-Three-Buckets.
+
+    Conserva siempre el primero y el último; de cada bucket intermedio elige el punto que
+    forma el triángulo de mayor área con el elegido anterior y el promedio del siguiente
+    bucket, así los picos y valles se mantienen aunque se descarten puntos.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+
+    bordes = np.append(np.linspace(1, n - 1, puntos - 1).astype(np.int64), n)
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        siguiente = slice(bordes[i + 1], bordes[i + 2])
+        x_sig, y_sig = x[siguiente].mean(), y[siguiente].mean()
+        areas = np.abs(
+            (x[anterior] - x_sig) * (y[inicio:fin] - y[anterior])
+            - (x[anterior] - x[inicio:fin]) * (y_sig - y[anterior])
+        )
+        anterior = inicio + int(areas.argmax())
+        elegidos[i + 1] = anterior
+    return elegidos
+
+
+def reducir_serie(serie, puntos=ANCHO_OBJETIVO_PX):
+    """Reduce una serie temporal a lo sumo a `puntos` valores con LTTB"""
+    if len(serie) <= puntos:
+        return serie
+    x = pd.DatetimeIndex(serie.index).asi8
+    return serie.iloc[reducir_lttb(x, serie.to_numpy(), puntos)]
+
+
+def figura_heatmap_media_hora(matriz):
+    """Heatmap de ventas por día de la semana y media hora (matriz con días en el índice)"""
+    etiquetas_horas = [f"{int(h)}:{('00' if h % 1 == 0 else '30')}" for h in matriz.columns]
+    fig = go.Figure(data=go.Heatmap(
+        z=matriz.values,
+        x=etiquetas_horas,
+        y=matriz.index,
+        colorscale='YlOrRd',
+        text=matriz.values.astype(int),
+        texttemplate='%{text}',
+        textfont={"size": 9},
+        colorbar=dict(title="Unidades<br>vendidas")
+    ))
+    fig.update_layout(
+        xaxis_title="Hora del Día",
+        yaxis_title="Día de la Semana",
+        height=500,
+        xaxis=dict(tickangle=-45)
+    )
+    return fig
+
+
+def figura_heatmap_semanas(matriz):
+    """Heatmap de ventas por semana del mes y día de la semana"""
+    fig = go.Figure(data=go.Heatmap(
+        z=matriz.values,
+        x=matriz.columns,
+        y=matriz.index,
+        colorscale='Viridis',
+        text=matriz.values.astype(int),
+        texttemplate='%{text}',
+        textfont={"size": 12},
+        colorbar=dict(title="Unidades<br>vendidas")
+    ))
+    fig.update_layout(
+        xaxis_title="Día de la Semana",
+        yaxis_title="Semana del Mes",
+        height=400
+    )
+    return fig
+
+
+def figura_tendencia(serie, puntos=ANCHO_OBJETIVO_PX):
+    """Línea de ventas diarias de un producto, reducida al ancho del gráfico"""
+    serie = reducir_serie(serie, puntos)
+    fig = go.Figure(data=[
+        go.Scatter(x=serie.index, y=serie.values,
+                   mode='lines+markers',
+                   line=dict(color='#FFD700', width=2),
+                   marker=dict(size=6),
+                   fill='tozeroy',
+                   fillcolor='rgba(255,215,0,0.2)')
+    ])
+    fig.update_layout(
+        height=300,
+        xaxis_title="Fecha",
+        yaxis_title="Unidades Vendidas",
+        showlegend=False
+    )
+    return fig
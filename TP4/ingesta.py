@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+from fuentes import (
+    LECTORES, cargar_ventas, extension_archivo, huella_csv, leer_bloque_csv, leer_desde, listar_particiones,
+    unir_ventas,
+)
+from procesamiento import combinar_cubos, construir_cubo, indexar_meses, indexar_productos, preparar_features
+
+
+class IngestaVentas:
+    """Mantiene las ventas cargadas en memoria y les agrega solo las filas nuevas.
+
+    Según la fuente, las filas nuevas se detectan por:
+    - CSV local: bytes agregados al final del archivo desde la última lectura.
+    - Carpeta de particiones: archivos que todavía no se leyeron.
+    - Parquet/Arrow o URL: filas con fecha_hora posterior a la última marca (watermark).
+    """
+
+    def __init__(self, ruta, intervalo_remoto=3600):
+        self.ruta = ruta
+        self.es_remota = not os.path.exists(ruta)
+        self.intervalo = intervalo_remoto if self.es_remota else 0
+        self._lock = threading.Lock()
+
+        df, self.posicion = cargar_ventas(ruta)
+        self.huella = self._huella()
+        self.particiones = set(listar_particiones(ruta)) if os.path.isdir(ruta) else set()
+        self.firma = self._firma()
+        self.ultima_revision = time.monotonic()
+        self._reemplazar(preparar_features(df), None)
+
+    def _firma(self):
+        """Tamaño y fecha de modificación del archivo, para detectar cambios sin leerlo"""
+        if self.es_remota or os.path.isdir(self.ruta):
+            return None
+        estado = os.stat(self.ruta)
+        return estado.st_size, estado.st_mtime_ns
+
+    def _es_csv_local(self):
+        return extension_archivo(self.ruta) == '.csv' and not self.es_remota
+
+    def _huella(self):
+        """Huella del CSV hasta la posición leída (ver fuentes.huella_csv)"""
+        return huella_csv(self.ruta, self.posicion) if self._es_csv_local() else None
+
+    def _reemplazar(self, df, cubo):
+        # Se reemplaza la tupla completa de una vez para que otras sesiones nunca vean
+        # un DataFrame, un cubo y unos índices de cargas distintas
+        cubo = construir_cubo(df) if cubo is None else cubo
+        self.datos = (df, cubo, indexar_meses(df), indexar_productos(df))
+        self.watermark = df['fecha_hora'].iloc[-1] if not df.empty else None
+
+    def _leer_nuevas(self):
+        """Lee solo las filas que no estaban en la última carga"""
+        if os.path.isdir(self.ruta):
+            nuevas = [p for p in listar_particiones(self.ruta) if p not in self.particiones]
+            self.particiones.update(nuevas)
+            return [LECTORES[extension_archivo(p)](p) for p in nuevas]
+
+        firma = self._firma()
+        if firma is not None and firma == self.firma:
+            return []
+        self.firma = firma
+
+        if self._es_csv_local():
+            if os.path.getsize(self.ruta) < self.posicion or huella_csv(self.ruta, self.posicion) != self.huella:
+                # El archivo se reescribió o se reemplazó por otro: se vuelve a cargar completo
+                df, self.posicion = cargar_ventas(self.ruta)
+                self.huella = self._huella()
+                self._reemplazar(preparar_features(df), None)
+                return []
+            nuevas, self.posicion = leer_bloque_csv(self.ruta, self.posicion)
+            self.huella = self._huella()
+            return [nuevas]
+        return [leer_desde(self.ruta, self.watermark)]
+
+    def actualizar(self):
+        """Incorpora las filas nuevas de la fuente y devuelve cuántas se agregaron"""
+        if time.monotonic() - self.ultima_revision < self.intervalo:
+            return 0
+        with self._lock:
+            self.ultima_revision = time.monotonic()
+            agregadas = 0
+            for nuevas in self._leer_nuevas():
+                if nuevas.empty:
+                    continue
+                df, cubo = self.datos[:2]
+                nuevas = preparar_features(nuevas)
+                self._reemplazar(unir_ventas(df, nuevas), combinar_cubos(cubo, construir_cubo(nuevas)))
+                agregadas += len(nuevas)
+            return agregadas
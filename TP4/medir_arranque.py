@@ -0,0 +1,81 @@
+"""Mide el tiempo de importación del dashboard y falla si supera el presupuesto.
+
+Importa, en un intérprete nuevo, los mismos módulos que app.py importa al arrancar y
+verifica que no se carguen módulos pesados que solo usan algunas pestañas.
+
+Uso: python medir_arranque.py [segundos]
+(el presupuesto también se puede fijar con TP4_PRESUPUESTO_ARRANQUE)
+"""
+import ast
+import json
+import os
+import subprocess
+import sys
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+PRESUPUESTO_SEGUNDOS = 2.0
+REPETICIONES = 3
+
+# Módulos que no deben importarse al arrancar (se cargan solo en la pestaña que los usa)
+MODULOS_PESADOS = ['prophet', 'cmdstanpy', 'plotly.express', 'pronostico']
+
+CODIGO_MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+for modulo in {modulos!r}:
+    __import__(modulo)
+segundos = time.perf_counter() - inicio
+print(json.dumps({{'segundos': segundos, 'pesados': [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def modulos_de_arranque(ruta_app):
+    """Módulos que app.py importa a nivel de módulo"""
+    with open(ruta_app, encoding='utf-8') as f:
+        arbol = ast.parse(f.read())
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            modulos.extend(alias.name for alias in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module:
+            modulos.append(nodo.module)
+    return modulos
+
+
+def medir(modulos):
+    """Mejor tiempo de importación en varios intérpretes nuevos y módulos pesados cargados"""
+    codigo = CODIGO_MEDICION.format(modulos=modulos, pesados=MODULOS_PESADOS)
+    mediciones = []
+    for _ in range(REPETICIONES):
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo], cwd=DIRECTORIO, capture_output=True, text=True, check=True
+        )
+        mediciones.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+    return min(m['segundos'] for m in mediciones), mediciones[0]['pesados']
+
+
+def main():
+    if len(sys.argv) > 1:
+        presupuesto = float(sys.argv[1])
+    else:
+        presupuesto = float(os.environ.get('TP4_PRESUPUESTO_ARRANQUE', PRESUPUESTO_SEGUNDOS))
+
+    modulos = modulos_de_arranque(os.path.join(DIRECTORIO, 'app.py'))
+    segundos, pesados = medir(modulos)
+
+    print(f"Módulos de arranque: {', '.join(modulos)}")
+    print(f"Tiempo de importación: {segundos:.3f} s (presupuesto {presupuesto:.3f} s)")
+    errores = []
+    if segundos > presupuesto:
+        errores.append(f"el arranque tarda {segundos:.3f} s y supera el presupuesto de {presupuesto:.3f} s")
+    if pesados:
+        errores.append(f"se importan al arrancar módulos que deberían cargarse después: {', '.join(pesados)}")
+    for error in errores:
+        print(f"❌ {error}")
+    if not errores:
+        print("✅ Arranque dentro del presupuesto")
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+DIAS_ORDEN = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def preparar_features(df):
+    """Agrega las columnas temporales derivadas de fecha_hora con tipos compactos"""
+    fecha = df['fecha_hora'].dt
+    hora = fecha.hour.astype('int8')
+    minuto = fecha.minute.astype('int8')
+
+    df = df.assign(
+        hora_num=hora,
+        minuto=minuto,
+        media_hora=(hora + (minuto >= 30) * 0.5).astype('float32'),
+        dia_semana=pd.Categorical(fecha.day_name(), categories=DIAS_ORDEN, ordered=True),
+        mes_num=fecha.month.astype('int8'),
+        año=fecha.year.astype('int16'),
+        semana_del_mes=((fecha.day - 1) // 7 + 1).astype('int8'),
+    )
+    return df
+
+
+CLAVES_CUBO = ['año', 'mes_num', 'semana_del_mes', 'dia_semana', 'media_hora', 'producto']
+
+
+def construir_cubo(df):
+    """Pre-agrega las ventas por año, mes, semana del mes, día, media hora y producto"""
+    cubo = (
+        df.groupby(CLAVES_CUBO, observed=True)['cantidad']
+        .agg(cantidad='sum', registros='size')
+        .reset_index()
+    )
+    cubo['hora_num'] = cubo['media_hora'].astype('int8')
+    return cubo
+
+
+def combinar_cubos(cubo, nuevo):
+    """Suma las celdas de un cubo construido con filas nuevas sobre el cubo existente"""
+    cubo = (
+        pd.concat([cubo, nuevo], ignore_index=True)
+        .groupby(CLAVES_CUBO, observed=True)[['cantidad', 'registros']]
+        .sum()
+        .reset_index()
+    )
+    cubo['hora_num'] = cubo['media_hora'].astype('int8')
+    return cubo
+
+
+def filtrar_cubo(cubo, año=None, mes_num=None):
+    """Devuelve las celdas del cubo de un mes, o el cubo completo si no se indica período"""
+    if año is None:
+        return cubo
+    return cubo[(cubo['año'] == año) & (cubo['mes_num'] == mes_num)]
+
+
+def sumar_cubo(cubo, por):
+    """Suma la cantidad vendida de las celdas del cubo agrupando por las columnas indicadas"""
+    return cubo.groupby(por, observed=True)['cantidad'].sum()
+
+
+def indexar_meses(df):
+    """Arma un índice {(año, mes): slice de filas} sobre el DataFrame ordenado por fecha_hora"""
+    if df.empty:
+        return {}
+    fechas = df['fecha_hora']
+    meses = pd.period_range(fechas.iloc[0], fechas.iloc[-1], freq='M')
+    inicios = fechas.searchsorted(meses.start_time)
+    finales = fechas.searchsorted((meses + 1).start_time)
+    return {
+        (mes.year, mes.month): slice(inicio, fin)
+        for mes, inicio, fin in zip(meses, inicios, finales)
+        if fin > inicio
+    }
+
+
+def filas_entre(df, desde, hasta):
+    """Filas con desde <= fecha_hora < hasta, cortadas por búsqueda binaria sin recorrer la tabla"""
+    inicio, fin = df['fecha_hora'].searchsorted([pd.Timestamp(desde), pd.Timestamp(hasta)])
+    return df.iloc[inicio:fin]
+
+
+def ventas_entre(df, desde, hasta):
+    """Cantidad vendida por producto entre dos fechas (hasta excluida)"""
+    return filas_entre(df, desde, hasta).groupby('producto')['cantidad'].sum()
+
+
+def rango_mes(año, mes_num):
+    """Fechas de inicio y fin (excluida) de un mes"""
+    inicio = pd.Timestamp(year=año, month=mes_num, day=1)
+    return inicio, inicio + pd.DateOffset(months=1)
+
+
+def periodo_anterior(desde, hasta, modo='inmediato'):
+    """Período con el que comparar [desde, hasta).
+
+    modo 'inmediato' devuelve la ventana de igual duración justo antes, 'mes' el mes
+    calendario anterior y 'año' la misma ventana un año antes.
+    """
+    if modo == 'año':
+        return desde - pd.DateOffset(years=1), hasta - pd.DateOffset(years=1)
+    if modo == 'mes':
+        return desde - pd.DateOffset(months=1), desde
+    return desde - (hasta - desde), desde
+
+
+def comparar_periodos(df, actual, anterior):
+    """Ventas por producto de dos períodos (desde, hasta) cualesquiera: (anterior, actual)"""
+    return ventas_entre(df, *anterior), ventas_entre(df, *actual)
+
+
+def indexar_productos(df):
+    """Arma un índice {producto: posiciones de sus filas}, en orden de fecha_hora"""
+    return df.groupby('producto', sort=False, observed=True).indices
+
+
+def posiciones_en(posiciones, filas):
+    """Recorta las posiciones ordenadas de un producto al slice de filas de un período"""
+    inicio, fin = posiciones.searchsorted([filas.start, filas.stop])
+    return posiciones[inicio:fin]
+
+
+def perfil_producto(df, posiciones):
+    """Calcula el perfil de ventas de un producto a partir de las posiciones de sus filas.
+
+    Devuelve un dict con la serie diaria, las ventas por día de la semana y por hora
+    (solo los días y horas en que hubo ventas) y las estadísticas de pico.
+    """
+    filas = df.iloc[posiciones]
+    cantidad = filas['cantidad'].to_numpy()
+
+    diario = filas['cantidad'].groupby(filas['fecha_hora'].dt.normalize()).sum()
+    diario.index = diario.index.date
+
+    codigos_dia = filas['dia_semana'].cat.codes.to_numpy()
+    registros_dia = np.bincount(codigos_dia, minlength=7)
+    por_dia = pd.Series(np.bincount(codigos_dia, weights=cantidad, minlength=7).astype('int64'), index=DIAS_ORDEN)
+    por_dia = por_dia[registros_dia > 0]
+
+    horas = filas['hora_num'].to_numpy()
+    registros_hora = np.bincount(horas, minlength=24)
+    por_hora = pd.Series(np.bincount(horas, weights=cantidad, minlength=24).astype('int64'), index=range(len(registros_hora)))
+    por_hora = por_hora[registros_hora > 0]
+
+    return {
+        'diario': diario,
+        'por_dia': por_dia,
+        'por_hora': por_hora,
+        'promedio_diario': diario.mean(),
+        'maximo_diario': diario.max(),
+        'minimo_diario': diario.min(),
+        'hora_pico': int(por_hora.idxmax()),
+        'cantidad_hora_pico': por_hora.max(),
+        'dia_pico': por_dia.idxmax(),
+        'cantidad_dia_pico': por_dia.max(),
+    }
@@ -0,0 +1,140 @@
+import hashlib
+import importlib.util
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Mínimo de días con ventas para ajustar Prophet; con menos historia se usa el modelo simple
+MIN_DIAS_PROPHET = 60
+# Semanas recientes que usa el modelo simple de promedio por día de la semana
+SEMANAS_MODELO_SIMPLE = 8
+
+
+def serie_diaria(df, posiciones, hasta=None):
+    """Demanda diaria de un producto (días sin ventas en 0) a partir de las posiciones de sus filas.
+
+    Si se indica `hasta`, la serie se completa con ceros hasta esa fecha para que todos los
+    productos se pronostiquen desde el mismo día.
+    """
+    filas = df.iloc[posiciones]
+    serie = filas['cantidad'].groupby(filas['fecha_hora'].dt.normalize()).sum()
+    fin = serie.index[-1] if hasta is None else pd.Timestamp(hasta).normalize()
+    dias = pd.date_range(serie.index[0], fin, freq='D')
+    return serie.reindex(dias, fill_value=0).astype('float64')
+
+
+def _prefijo(producto):
+    return hashlib.sha1(producto.encode('utf-8')).hexdigest()[:16]
+
+
+def ruta_modelo(directorio, producto, watermark):
+    """Archivo del modelo cacheado de un producto para una versión (watermark) de los datos"""
+    version = hashlib.sha1(str(watermark).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directorio, f"{_prefijo(producto)}_{version}.json")
+
+
+def _guardar_modelo(ruta, modelo):
+    """Guarda el modelo y borra los de versiones anteriores del mismo producto"""
+    prefijo = os.path.basename(ruta).split('_')[0]
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(modelo, f)
+    os.replace(temporal, ruta)
+    for nombre in os.listdir(os.path.dirname(ruta)):
+        if nombre.startswith(prefijo + '_') and nombre != os.path.basename(ruta):
+            os.remove(os.path.join(os.path.dirname(ruta), nombre))
+
+
+def ajustar_modelo_simple(serie):
+    """Modelo liviano: promedio y desvío de las últimas semanas para cada día de la semana"""
+    recientes = serie.iloc[-SEMANAS_MODELO_SIMPLE * 7:]
+    por_dia = recientes.groupby(recientes.index.dayofweek)
+    promedios = por_dia.mean().reindex(range(7), fill_value=recientes.mean())
+    desvios = por_dia.std().reindex(range(7)).fillna(0)
+    return {
+        'tipo': 'Promedio semanal',
+        'ultimo': serie.index[-1].strftime('%Y-%m-%d'),
+        'promedios': promedios.tolist(),
+        'desvios': desvios.tolist(),
+    }
+
+
+def ajustar_modelo_prophet(serie):
+    """Ajusta Prophet con estacionalidad semanal y anual sobre la demanda diaria"""
+    import logging
+
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    historia = pd.DataFrame({'ds': serie.index, 'y': serie.values})
+    modelo = Prophet(weekly_seasonality=True, yearly_seasonality=len(serie) >= 730, daily_seasonality=False)
+    modelo.fit(historia)
+    return {'tipo': 'Prophet', 'modelo': model_to_json(modelo)}
+
+
+def predecir(modelo, horizonte):
+    """Pronóstico de los próximos `horizonte` días con columnas ds, yhat, yhat_lower, yhat_upper"""
+    if modelo['tipo'] == 'Prophet':
+        from prophet.serialize import model_from_json
+
+        prophet = model_from_json(modelo['modelo'])
+        futuro = prophet.make_future_dataframe(periods=horizonte, include_history=False)
+        pronostico = prophet.predict(futuro)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+    else:
+        fechas = pd.date_range(pd.Timestamp(modelo['ultimo']) + pd.Timedelta(days=1), periods=horizonte, freq='D')
+        promedios = np.asarray(modelo['promedios'])[fechas.dayofweek]
+        desvios = np.asarray(modelo['desvios'])[fechas.dayofweek]
+        pronostico = pd.DataFrame({
+            'ds': fechas,
+            'yhat': promedios,
+            'yhat_lower': promedios - 1.28 * desvios,
+            'yhat_upper': promedios + 1.28 * desvios,
+        })
+    columnas = ['yhat', 'yhat_lower', 'yhat_upper']
+    pronostico[columnas] = pronostico[columnas].clip(lower=0)
+    pronostico['modelo'] = modelo['tipo']
+    return pronostico
+
+
+def _usar_prophet(serie):
+    # find_spec revisa si Prophet está instalado sin importarlo (importarlo carga cmdstanpy)
+    return (serie > 0).sum() >= MIN_DIAS_PROPHET and importlib.util.find_spec('prophet') is not None
+
+
+def pronosticar_producto(producto, serie, horizonte, directorio, watermark):
+    """Pronostica un producto reutilizando el modelo cacheado en disco si existe.
+
+    Se ejecuta en los hilos del pool: cada producto usa su propio archivo de modelo.
+    """
+    ruta = ruta_modelo(directorio, producto, watermark)
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            modelo = json.load(f)
+    else:
+        modelo = ajustar_modelo_prophet(serie) if _usar_prophet(serie) else ajustar_modelo_simple(serie)
+        _guardar_modelo(ruta, modelo)
+    return producto, predecir(modelo, horizonte)
+
+
+def pronosticar_productos(series, horizonte, directorio, watermark, hilos=None):
+    """Pronostica varios productos en paralelo con un pool de hilos.
+
+    Alcanza con hilos: Prophet ajusta cada modelo en un proceso de Stan aparte y el modelo
+    simple es numpy, y así no se hace fork del servidor de Streamlit (que tiene otros hilos
+    con locks tomados). series es un dict {producto: serie diaria}. Devuelve un dict
+    {producto: pronóstico}.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    if len(series) <= 1 or hilos == 1:
+        return dict(pronosticar_producto(p, s, horizonte, directorio, watermark) for p, s in series.items())
+
+    with ThreadPoolExecutor(max_workers=hilos or os.cpu_count()) as pool:
+        futuros = [
+            pool.submit(pronosticar_producto, producto, serie, horizonte, directorio, watermark)
+            for producto, serie in series.items()
+        ]
+        return dict(futuro.result() for futuro in futuros)